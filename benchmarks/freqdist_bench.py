@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# benchmarks.freqdist_bench
+# Benchmark the ranking and summary queries of FreqDist.
+#
+# Author:   Tribe Contributors
+# Created:  Sun Oct 18 22:48:15 2026 -0400
+#
+# Copyright (C) 2026 District Data Labs
+# For license information, see LICENSE.txt
+#
+# ID: freqdist_bench.py [] $
+
+"""
+Benchmark the ranking and summary queries of FreqDist (max, top, bottom,
+threshold and quantiles) against the equivalent queries built on
+most_common and full sorts of the counts, on distributions with power law
+distributed counts like those of the link counts.
+
+    $ python benchmarks/freqdist_bench.py -n 100000 -n 1000000
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from tribe.stats import FreqDist
+
+
+##########################################################################
+## Benchmarks
+##########################################################################
+
+def random_dist(samples):
+    """
+    Returns a FreqDist of samples with power law distributed counts.
+    """
+    dist = FreqDist()
+    dist.merge(dict((idx, int(random.paretovariate(1.2))) for idx in range(samples)))
+    return dist
+
+
+def sorted_quantiles(dist, qs):
+    """
+    Quantiles by the nearest rank of a full sort of the counts.
+    """
+    counts = sorted(dist.values())
+    return [counts[max(1, -(-int(q * 1000) * len(counts) // 1000)) - 1] for q in qs]
+
+
+QUANTILES = (0.25, 0.5, 0.75, 0.9, 0.99)
+
+# Name, the previous query and the current query of each benchmark
+QUERIES = (
+    ("max", lambda d: d.most_common(1)[0][0], lambda d: d.max()),
+    ("top 10", lambda d: d.most_common()[:10], lambda d: d.top(10)),
+    ("bottom 10", lambda d: d.most_common()[:-11:-1], lambda d: d.bottom(10)),
+    ("threshold", lambda d: FreqDist(dict((k, c) for k, c in d.items() if c >= 5)), lambda d: d.threshold(5)),
+    ("quantiles", lambda d: sorted_quantiles(d, QUANTILES), lambda d: d.quantiles(*QUANTILES)),
+)
+
+
+def timed(func, dist, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.time()
+        func(dist)
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(args):
+    print("{:>10} {:<10} {:>10} {:>10} {:>8}".format("samples", "query", "old (s)", "new (s)", "speedup"))
+    for samples in args.samples:
+        dist = random_dist(samples)
+        for name, old, new in QUERIES:
+            before = timed(old, dist, args.repeat)
+            after  = timed(new, dist, args.repeat)
+            print("{:>10,} {:<10} {:>10.4f} {:>10.4f} {:>7.2f}x".format(
+                samples, name, before, after, before / after if after else float('inf')
+            ))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark FreqDist queries")
+    parser.add_argument('-n', '--samples', type=int, action='append', help='Number of samples (repeatable)')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='Runs of each query to take the best of')
+    args = parser.parse_args()
+    args.samples = args.samples or [100000, 1000000]
+    main(args)
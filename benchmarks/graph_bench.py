@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# benchmarks.graph_bench
+# Benchmark building the email network from link counts.
+#
+# Author:   Tribe Contributors
+# Created:  Sun Oct 18 14:31:06 2026 -0400
+#
+# Copyright (C) 2026 District Data Labs
+# For license information, see LICENSE.txt
+#
+# ID: graph_bench.py [] $
+
+"""
+Benchmark building the email network from link counts, comparing the per
+edge loop of freq/norm lookups and add_edge calls with the vectorized edge
+properties and bulk add_edges_from of MBoxReader.build_graph.
+
+    $ python benchmarks/graph_bench.py -n 100000 -n 1000000
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import sys
+import time
+import random
+import argparse
+import networkx as nx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from tribe.stats import FreqDist
+from tribe.extract import MBoxReader
+from tribe.emails import AddressTable, pack_link, unpack_link
+
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'tests', 'fixtures', 'test.mbox')
+
+
+##########################################################################
+## Benchmarks
+##########################################################################
+
+def random_links(edges, nodes):
+    """
+    Generates a link counter with the given number of distinct links between
+    nodes addresses, with power law distributed counts.
+    """
+    addresses = AddressTable("user{}@example.com".format(idx) for idx in range(nodes))
+    links = FreqDist()
+
+    while len(links) < edges:
+        source, target = sorted(random.sample(range(nodes), 2))
+        links[pack_link(source, target)] += int(random.paretovariate(1.5))
+
+    return addresses, links
+
+
+def loop_graph(addresses, links):
+    """
+    The previous implementation: one freq, count and norm lookup and one
+    add_edge call per link.
+    """
+    G = nx.Graph()
+    for link in links.keys():
+        source, target = unpack_link(link)
+        link_data = {
+            "weight": links.freq(link),
+            "count":  links[link],
+            "norm":   links.norm(link),
+        }
+        G.add_edge(addresses[source], addresses[target], **link_data)
+    return G
+
+
+def vectorized_graph(reader, links):
+    """
+    The current implementation in MBoxReader.build_graph.
+    """
+    return reader.build_graph(links, 0)
+
+
+def timed(func, *args):
+    start = time.time()
+    result = func(*args)
+    return result, time.time() - start
+
+
+def main(args):
+    reader = MBoxReader(FIXTURE, persist_index=False)
+
+    print("{:>10} {:>10} {:>10} {:>8}".format("edges", "loop (s)", "bulk (s)", "speedup"))
+    for edges in args.edges:
+        addresses, links = random_links(edges, max(args.nodes, edges // 10))
+        reader.addresses = addresses
+
+        G, loop = timed(loop_graph, addresses, links)
+        H, bulk = timed(vectorized_graph, reader, links)
+
+        assert nx.number_of_edges(G) == nx.number_of_edges(H)
+        print("{:>10,} {:>10.3f} {:>10.3f} {:>7.2f}x".format(edges, loop, bulk, loop / bulk))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark building the email network")
+    parser.add_argument('-n', '--edges', type=int, action='append', help='Number of edges (repeatable)')
+    parser.add_argument('-m', '--nodes', type=int, default=1000, help='Minimum number of nodes')
+    args = parser.parse_args()
+    args.edges = args.edges or [10000, 100000, 1000000]
+    main(args)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# benchmarks.pipeline_bench
+# Benchmark the extraction pipeline on synthetic mbox files.
+#
+# Author:   Tribe Contributors
+# Created:  Sun Oct 18 21:37:52 2026 -0400
+#
+# Copyright (C) 2026 District Data Labs
+# For license information, see LICENSE.txt
+#
+# ID: pipeline_bench.py [] $
+
+"""
+Benchmark the extraction pipeline on synthetic mbox files of increasing
+size (see benchmarks/synthetic.py), timing counting the messages, the header
+analysis, extracting the meta data and extracting the graph with the
+throughput and peak memory of each. Memory is the peak Python heap of the
+benchmark process (as traced by tracemalloc), so it does not include the
+worker processes of parallel (-j) extractions. Results can be saved as JSON
+and compared against a saved baseline to catch regressions.
+
+    $ python benchmarks/pipeline_bench.py -n 1000 -n 10000 -o baseline.json
+    $ python benchmarks/pipeline_bench.py -n 1000 -n 10000 -c baseline.json
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from synthetic import generate
+from tribe.extract import MBoxReader
+
+
+##########################################################################
+## Benchmarks
+##########################################################################
+
+def count(reader, args):
+    return reader.count()
+
+
+def headers(reader, args):
+    return reader.header_analysis()
+
+
+def extract(reader, args):
+    emails = 0
+    for email in reader.extract():
+        emails += 1
+    return emails
+
+
+def extract_graph(reader, args):
+    return reader.extract_graph(workers=args.workers)
+
+
+OPERATIONS = (
+    ("count", count),
+    ("headers", headers),
+    ("extract", extract),
+    ("extract_graph", extract_graph),
+)
+
+
+def run(operation, path, args, trace=False):
+    """
+    Runs the operation with a new reader (so that the offset index is built
+    every time and nothing is cached), returning the seconds it took or the
+    peak Python heap of this (parent) process in bytes if trace is True.
+    """
+    reader = MBoxReader(
+        path, persist_index=False, cache=False, headers_only=args.headers_only
+    )
+
+    if trace:
+        tracemalloc.start()
+        operation(reader, args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak
+
+    start = time.time()
+    operation(reader, args)
+    return time.time() - start
+
+
+def benchmark(path, messages, args):
+    """
+    Yields the result of each operation on the mbox at path.
+    """
+    size = os.path.getsize(path)
+    for name, operation in OPERATIONS:
+        seconds = min(run(operation, path, args) for _ in range(args.repeat))
+        peak = run(operation, path, args, True) if args.memory else None
+
+        yield {
+            "messages": messages,
+            "bytes": size,
+            "operation": name,
+            "seconds": seconds,
+            "messages_per_sec": messages / seconds,
+            "bytes_per_sec": size / seconds,
+            "parent_heap": peak,
+        }
+
+
+def main(args):
+    tmpdir = tempfile.mkdtemp()
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            for result in json.load(f):
+                baseline[(result["messages"], result["operation"])] = result["seconds"]
+
+    print("{:>9} {:>9} {:<14} {:>9} {:>11} {:>8} {:>10} {:>9}".format(
+        "messages", "MB", "operation", "seconds", "msgs/sec", "MB/sec", "heap MiB", "baseline"
+    ))
+
+    results = []
+    try:
+        for messages in args.messages:
+            path = os.path.join(tmpdir, "synthetic-{}.mbox".format(messages))
+            generate(
+                path, messages, people=args.people, activity=args.activity,
+                recipients=args.recipients, max_recipients=args.max_recipients,
+                broadcast=args.broadcast, attachments=args.attachments,
+                attachment_size=args.attachment_size, malformed=args.malformed,
+                seed=args.seed,
+            )
+
+            for result in benchmark(path, messages, args):
+                results.append(result)
+
+                peak = result["parent_heap"]
+                before = baseline.get((messages, result["operation"]))
+                print("{:>9,} {:>9.1f} {:<14} {:>9.3f} {:>11,.1f} {:>8.1f} {:>10} {:>9}".format(
+                    messages, result["bytes"] / 1e6, result["operation"],
+                    result["seconds"], result["messages_per_sec"],
+                    result["bytes_per_sec"] / 1e6,
+                    "-" if peak is None else "{:.1f}".format(peak / 1048576.0),
+                    "-" if before is None else "{:.2f}x".format(before / result["seconds"]),
+                ))
+    finally:
+        shutil.rmtree(tmpdir)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the extraction pipeline")
+    parser.add_argument('-n', '--messages', type=int, action='append', help='Number of messages (repeatable)')
+    parser.add_argument('-p', '--people', type=int, default=1000, help='Size of the address population')
+    parser.add_argument('-a', '--activity', type=float, default=1.2, help='Power law exponent of activity')
+    parser.add_argument('-R', '--recipients', type=float, default=2.0, help='Pareto shape of the number of recipients')
+    parser.add_argument('-m', '--max-recipients', type=int, default=50, help='Most recipients of a message (and of broadcasts)')
+    parser.add_argument('-b', '--broadcast', type=float, default=0.01, help='Fraction of messages that are broadcasts')
+    parser.add_argument('-t', '--attachments', type=float, default=0.1, help='Fraction of messages with attachments')
+    parser.add_argument('-z', '--attachment-size', type=int, default=32768, help='Mean attachment size in bytes')
+    parser.add_argument('-x', '--malformed', type=float, default=0.01, help='Fraction of messages with a malformed header')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='Runs of each operation to take the best of')
+    parser.add_argument('-j', '--workers', type=int, default=1, help='Number of processes to extract the graph with')
+    parser.add_argument('-H', '--headers-only', action='store_true', default=False, help='Skip reading and parsing message bodies')
+    parser.add_argument('-M', '--no-memory', dest='memory', action='store_false', help='Do not measure the peak Python heap (of this process only)')
+    parser.add_argument('-s', '--seed', type=int, default=42, help='Random seed of the synthetic mbox')
+    parser.add_argument('-o', '--output', default=None, help='Location to write the JSON results to')
+    parser.add_argument('-c', '--compare', default=None, help='JSON results to compare against (speedup)')
+    args = parser.parse_args()
+    args.messages = args.messages or [1000, 10000]
+    main(args)
@@ -0,0 +1,310 @@
+#!/usr/bin/env python
+# benchmarks.synthetic
+# Generates synthetic mbox files for benchmarking extraction.
+#
+# Author:   Tribe Contributors
+# Created:  Sun Oct 18 21:03:27 2026 -0400
+#
+# Copyright (C) 2026 District Data Labs
+# For license information, see LICENSE.txt
+#
+# ID: synthetic.py [] $
+
+"""
+Generates synthetic mbox files for benchmarking extraction offline, rather
+than sending real mail to test accounts as tests/mailer.py does. People send
+and receive mail with power law distributed activity, recipient lists have a
+heavy tailed size (with occasional broadcasts), some messages carry base64
+attachments, and a fraction of the messages have a malformed header. The
+same seed always generates the same mbox.
+
+    $ python benchmarks/synthetic.py -n 100000 -p 5000 -w synthetic.mbox
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import time
+import base64
+import random
+import binascii
+import argparse
+
+from bisect import bisect
+from email.utils import formatdate
+
+
+##########################################################################
+## Module Constants
+##########################################################################
+
+# Ways that a header of a message is malformed (see MBoxGenerator.malform)
+MALFORMATIONS = (
+    "missing_from", "bad_date", "bad_address", "no_colon", "bad_encoding",
+)
+
+FIRST_NAMES = (
+    "Alice", "Bob", "Carol", "Dave", "Erin", "Frank", "Grace", "Heidi",
+    "Ivan", "Judy", "Mallory", "Niaj", "Olivia", "Peggy", "Rupert", "Sybil",
+    "Trent", "Victor", "Walter", "Zoe",
+)
+
+LAST_NAMES = (
+    "Smith", "Jones", "Garcia", "Miller", "Davis", "Lopez", "Wilson",
+    "Anderson", "Thomas", "Taylor", "Moore", "Martin", "Lee", "Perez",
+)
+
+DOMAINS = (
+    "example.com", "example.org", "example.net", "mail.example.com",
+    "corp.example.com", "lists.example.org",
+)
+
+WORDS = (
+    "meeting", "report", "budget", "draft", "review", "schedule", "update",
+    "question", "proposal", "notes", "follow", "up", "quarterly", "data",
+    "graph", "network", "analysis", "lunch", "friday", "project", "plan",
+)
+
+START = 1262304000  # Jan 1, 2010: the earliest message date
+SPAN  = 315360000   # Ten years of seconds over which messages are sent
+
+
+##########################################################################
+## Generator
+##########################################################################
+
+class MBoxGenerator(object):
+    """
+    Generates messages between a population of people whose activity (how
+    often they send or receive mail) follows a power law with the exponent
+    activity. Each message has a Pareto(recipients) distributed number of
+    recipients (cc'ing some with probability cc) up to max_recipients, except
+    for a broadcast fraction of messages sent to max_recipients people. Messages
+    have a base64 attachment with probability attachments whose size is
+    exponentially distributed with the mean attachment_size, and a header
+    is malformed with probability malformed.
+    """
+
+    def __init__(self, people=1000, activity=1.2, recipients=2.0, cc=0.3,
+                 max_recipients=50, broadcast=0.01, attachments=0.1,
+                 attachment_size=32768, body_size=1024, malformed=0.01,
+                 seed=42):
+        self.random = random.Random(seed)
+
+        self.people = [self.person(idx) for idx in range(people)]
+        self.weights = cumulative(1.0 / (rank ** activity) for rank in range(1, people+1))
+        self.random.shuffle(self.people)
+
+        self.recipients  = recipients
+        self.cc          = cc
+        self.max_recipients = min(max_recipients, people - 1)
+        self.broadcast   = broadcast
+        self.attachments = attachments
+        self.attachment_size = attachment_size
+        self.body_size   = body_size
+        self.malformed   = malformed
+
+    def person(self, idx):
+        """
+        Returns the (name, address) of the person numbered idx.
+        """
+        first = FIRST_NAMES[idx % len(FIRST_NAMES)]
+        last  = LAST_NAMES[(idx // len(FIRST_NAMES)) % len(LAST_NAMES)]
+        domain = DOMAINS[idx % len(DOMAINS)]
+        address = "{}.{}{}@{}".format(first, last, idx, domain).lower()
+        return "{} {}".format(first, last), address
+
+    def choose(self):
+        """
+        Returns a person chosen by their activity.
+        """
+        point = self.random.random() * self.weights[-1]
+        return self.people[bisect(self.weights, point)]
+
+    def choose_recipients(self, sender):
+        """
+        Returns the distinct recipients of a message from the sender.
+        """
+        if self.random.random() < self.broadcast:
+            count = self.max_recipients
+        else:
+            count = int(self.random.paretovariate(self.recipients))
+            count = max(1, min(count, self.max_recipients))
+
+        chosen = []
+        seen = set([sender])
+        while len(chosen) < count:
+            person = self.choose()
+            if person in seen:
+                # Fill broadcasts from the whole population to terminate
+                person = self.random.choice(self.people)
+                if person in seen: continue
+            seen.add(person)
+            chosen.append(person)
+        return chosen
+
+    def words(self, count):
+        return " ".join(self.random.choice(WORDS) for _ in range(count))
+
+    def message(self, idx):
+        """
+        Returns the bytes of the message numbered idx (including the "From "
+        envelope line and a trailing blank line).
+        """
+        sender = self.choose()
+        recipients = self.choose_recipients(sender)
+        copied = [person for person in recipients[1:] if self.random.random() < self.cc]
+        tos = [person for person in recipients if person not in copied]
+
+        timestamp = START + self.random.randrange(SPAN)
+        headers = [
+            ("From", format_address(sender)),
+            ("To", ", ".join(format_address(person) for person in tos)),
+            ("Subject", self.words(self.random.randint(1, 6)).capitalize()),
+            ("Date", formatdate(timestamp)),
+            ("Message-ID", "<{}.{}@{}>".format(idx, timestamp, DOMAINS[0])),
+            ("MIME-Version", "1.0"),
+        ]
+        if copied:
+            headers.insert(2, ("Cc", ", ".join(format_address(person) for person in copied)))
+
+        if self.random.random() < self.malformed:
+            headers = self.malform(headers)
+
+        # The envelope is always well formed so that the boundaries are found
+        lines = ["From {} {}".format(sender[1], time.asctime(time.gmtime(timestamp)))]
+        body = self.body()
+        if self.random.random() < self.attachments:
+            boundary = "==boundary{}==".format(idx)
+            headers.append(("Content-Type", 'multipart/mixed; boundary="{}"'.format(boundary)))
+            body = self.multipart(boundary, body)
+        else:
+            headers.append(("Content-Type", "text/plain; charset=us-ascii"))
+
+        lines.extend(
+            line if value is None else "{}: {}".format(line, value)
+            for line, value in headers
+        )
+        lines.append("")
+        lines.append(body)
+        lines.append("")
+        return ("\n".join(lines) + "\n").encode('utf-8')
+
+    def body(self):
+        """
+        Returns a plain text body of about body_size bytes.
+        """
+        words = max(1, self.body_size // 7)
+        text  = self.words(words)
+        return "\n".join(text[pos:pos+72] for pos in range(0, len(text), 72))
+
+    def multipart(self, boundary, body):
+        """
+        Returns a multipart body with the text and a base64 attachment.
+        """
+        size = int(self.random.expovariate(1.0 / self.attachment_size)) + 1
+        data = self.random.getrandbits(8 * size)
+        data = binascii.unhexlify("{:0{}x}".format(data, 2 * size))
+        data = base64.b64encode(data).decode('ascii')
+        return "\n".join([
+            "--" + boundary,
+            "Content-Type: text/plain; charset=us-ascii",
+            "",
+            body,
+            "--" + boundary,
+            "Content-Type: application/octet-stream",
+            "Content-Transfer-Encoding: base64",
+            'Content-Disposition: attachment; filename="data.bin"',
+            "",
+            "\n".join(data[pos:pos+76] for pos in range(0, len(data), 76)),
+            "--" + boundary + "--",
+        ])
+
+    def malform(self, headers):
+        """
+        Corrupts one of the headers of a message in one of the MALFORMATIONS.
+        """
+        kind = self.random.choice(MALFORMATIONS)
+        headers = list(headers)
+
+        if kind == "missing_from":
+            return headers[1:]
+
+        for idx, (name, value) in enumerate(headers):
+            if kind == "bad_date" and name == "Date":
+                headers[idx] = (name, "sometime last " + self.words(1))
+            if kind == "bad_address" and name == "To":
+                headers[idx] = (name, '"<<unterminated@' + value)
+            if kind == "no_colon" and name == "Subject":
+                headers[idx] = (name + " " + value, None)
+            if kind == "bad_encoding" and name == "Subject":
+                headers[idx] = (name, "=?utf-8?q?broken=ZZ" + value)
+
+        return headers
+
+    def write(self, path, messages):
+        """
+        Writes an mbox of the given number of messages to path, returning
+        the number of bytes written.
+        """
+        with open(path, 'wb') as f:
+            for idx in range(messages):
+                f.write(self.message(idx))
+            return f.tell()
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+def cumulative(values):
+    """
+    Returns the list of the running totals of the values.
+    """
+    totals, total = [], 0.0
+    for value in values:
+        total += value
+        totals.append(total)
+    return totals
+
+
+def format_address(person):
+    name, address = person
+    return '"{}" <{}>'.format(name, address)
+
+
+def generate(path, messages, **kwargs):
+    """
+    Generates an mbox of messages at path with an MBoxGenerator of kwargs.
+    """
+    return MBoxGenerator(**kwargs).write(path, messages)
+
+
+##########################################################################
+## Main Method
+##########################################################################
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate a synthetic mbox")
+    parser.add_argument('-n', '--messages', type=int, default=10000, help='Number of messages')
+    parser.add_argument('-p', '--people', type=int, default=1000, help='Size of the address population')
+    parser.add_argument('-a', '--activity', type=float, default=1.2, help='Power law exponent of activity')
+    parser.add_argument('-r', '--recipients', type=float, default=2.0, help='Pareto shape of the number of recipients')
+    parser.add_argument('-m', '--max-recipients', type=int, default=50, help='Most recipients of a message (and of broadcasts)')
+    parser.add_argument('-b', '--broadcast', type=float, default=0.01, help='Fraction of messages that are broadcasts')
+    parser.add_argument('-t', '--attachments', type=float, default=0.1, help='Fraction of messages with attachments')
+    parser.add_argument('-z', '--attachment-size', type=int, default=32768, help='Mean attachment size in bytes')
+    parser.add_argument('-x', '--malformed', type=float, default=0.01, help='Fraction of messages with a malformed header')
+    parser.add_argument('-s', '--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('-w', '--write', default='synthetic.mbox', help='Location to write the mbox to')
+    args = parser.parse_args()
+
+    size = generate(
+        args.write, args.messages, people=args.people, activity=args.activity,
+        recipients=args.recipients, max_recipients=args.max_recipients,
+        broadcast=args.broadcast, attachments=args.attachments,
+        attachment_size=args.attachment_size, malformed=args.malformed,
+        seed=args.seed,
+    )
+    print("Wrote {:,} messages ({:,} bytes) to {}".format(args.messages, size, args.write))
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# benchmarks.unquote_bench
+# Benchmark unquoting nested quotes and angle brackets.
+#
+# Author:   Tribe Contributors
+# Created:  Sun Oct 18 16:02:48 2026 -0400
+#
+# Copyright (C) 2026 District Data Labs
+# For license information, see LICENSE.txt
+#
+# ID: unquote_bench.py [] $
+
+"""
+Benchmark unquoting nested quotes and angle brackets, comparing the previous
+recursive unquote (one email.utils.unquote call and new string per layer)
+with the single scan of tribe.utils.unquote on typical and pathological
+(deeply nested) addresses.
+
+    $ python benchmarks/unquote_bench.py -d 10 -d 100 -d 10000
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import sys
+import timeit
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from tribe.utils import unquote
+from email.utils import unquote as email_unquote
+
+
+##########################################################################
+## Benchmarks
+##########################################################################
+
+def recursive_unquote(s):
+    """
+    The previous implementation: recurse until the string is unchanged.
+    """
+    new = email_unquote(s)
+    if new != s:
+        return recursive_unquote(new)
+    return new
+
+
+def fixtures(depth):
+    """
+    Returns the named addresses with the given depth of nested layers.
+    """
+    return (
+        ("quotes", '"' * depth + "jdoe@example.com" + '"' * depth),
+        ("angles", "<" * depth + "jdoe@example.com" + ">" * depth),
+        ("mixed", '"<' * depth + "jdoe@example.com" + '>"' * depth),
+        ("escaped", '"' * depth + 'John \\"Doe\\"' + '"' * depth),
+    )
+
+
+def timed(func, s, number):
+    try:
+        return timeit.timeit(lambda: func(s), number=number) / number
+    except RuntimeError:
+        # Includes RecursionError on Python 3
+        return None
+
+
+def main(args):
+    print("{:>8} {:>8} {:>14} {:>14} {:>8}".format(
+        "depth", "input", "recursive (us)", "scan (us)", "speedup"
+    ))
+
+    for depth in args.depth:
+        for name, s in fixtures(depth):
+            old = timed(recursive_unquote, s, args.number)
+            new = timed(unquote, s, args.number)
+
+            if old is None:
+                print("{:>8,} {:>8} {:>14} {:>14.2f} {:>8}".format(
+                    depth, name, "recursion", new * 1e6, "-"
+                ))
+            else:
+                assert recursive_unquote(s) == unquote(s)
+                print("{:>8,} {:>8} {:>14.2f} {:>14.2f} {:>7.2f}x".format(
+                    depth, name, old * 1e6, new * 1e6, old / new
+                ))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark unquoting nested layers")
+    parser.add_argument('-d', '--depth', type=int, action='append', help='Depth of nested layers (repeatable)')
+    parser.add_argument('-n', '--number', type=int, default=200, help='Number of calls to time')
+    args = parser.parse_args()
+    args.depth = args.depth or [1, 10, 100, 1000, 10000]
+    main(args)
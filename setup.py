@@ -52,7 +52,6 @@ CLASSIFIERS  = (
     'Natural Language :: English',
     'Operating System :: OS Independent',
     'Programming Language :: Python',
-    'Programming Language :: Python :: 2.7',
     'Programming Language :: Python :: 3.5',
     'Topic :: Communications :: Email',
     'Topic :: Scientific/Engineering :: Information Analysis',
@@ -68,7 +67,7 @@ PKG_DESCRIBE = "DESCRIPTION.txt"
 
 ## Directories to ignore in find_packages
 EXCLUDES     = (
-    "tests", "bin", "docs", "fixtures", "register", "notebooks",
+    "tests", "bin", "docs", "fixtures", "register", "notebooks", "benchmarks",
 )
 
 ##########################################################################
@@ -124,6 +123,7 @@ config = {
     "install_requires": list(get_requires()),
     "classifiers": CLASSIFIERS,
     "keywords": KEYWORDS,
+    "python_requires": ">=3.5",
     "zip_safe": False,
     "scripts": ['tribe-admin.py'],
 }
@@ -17,6 +17,7 @@ Testing for the utilities library in Tribe
 ## Imports
 ##########################################################################
 
+import pickle
 import unittest
 
 from tribe.emails import *
@@ -51,3 +52,70 @@ class EmailAddressTests(unittest.TestCase):
         self.assertEqual(email.email, "benjamin@bengfort.com")
         self.assertEqual(email.domain, "bengfort.com")
         self.assertEqual(text(email), data)
+
+    def test_interned(self):
+        """
+        Assert equal addresses are the same object
+        """
+        email = EmailAddress("Benjamin Bengfort <Benjamin@Bengfort.com>")
+        self.assertIs(email, EmailAddress("Benjamin Bengfort <benjamin@bengfort.com>"))
+        self.assertIs(email, EmailAddress(("Benjamin Bengfort", "benjamin@bengfort.com")))
+        self.assertIs(email, pickle.loads(pickle.dumps(email)))
+
+        other = EmailAddress("benjamin@bengfort.com")
+        self.assertIsNot(email, other)
+        self.assertNotEqual(email, other)
+        self.assertEqual(len(set([email, other, EmailAddress("benjamin@bengfort.com")])), 2)
+
+    def test_immutable(self):
+        """
+        Assert addresses cannot be modified
+        """
+        email = EmailAddress("benjamin@bengfort.com")
+        with self.assertRaises(AttributeError):
+            email.email = "jdoe@example.com"
+        with self.assertRaises(AttributeError):
+            del email.name
+        self.assertEqual(email.email, "benjamin@bengfort.com")
+
+
+
+##########################################################################
+## AddressTable Tests
+##########################################################################
+
+class AddressTableTests(unittest.TestCase):
+
+    def test_add(self):
+        """
+        Assert addresses are interned as dense ids in order
+        """
+        table = AddressTable()
+        self.assertEqual(table.add("a@example.com"), 0)
+        self.assertEqual(table.add("b@example.com"), 1)
+        self.assertEqual(table.add("a@example.com"), 0)
+
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table[1], "b@example.com")
+        self.assertIn("a@example.com", table)
+        self.assertNotIn("c@example.com", table)
+        self.assertEqual(list(table), ["a@example.com", "b@example.com"])
+
+    def test_pickle(self):
+        """
+        Assert the address table can be pickled
+        """
+        table = AddressTable(["a@example.com", "b@example.com"])
+        clone = pickle.loads(pickle.dumps(table))
+        self.assertEqual(list(clone), list(table))
+        self.assertEqual(clone.add("b@example.com"), 1)
+
+    def test_pack_link(self):
+        """
+        Assert links are packed into and unpacked from integers
+        """
+        for source, target in ((0, 0), (0, 1), (7, 3), (LINK_MASK, LINK_MASK)):
+            link = pack_link(source, target)
+            self.assertEqual(unpack_link(link), (source, target))
+
+        self.assertNotEqual(pack_link(1, 2), pack_link(2, 1))
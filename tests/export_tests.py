@@ -0,0 +1,258 @@
+# tests.export_tests
+# Test the streaming export of the email network
+#
+# Author:   Tribe Contributors
+# Created:  Sun Oct 18 18:40:52 2026 -0400
+#
+# Copyright (C) 2026 District Data Labs
+# For license information, see LICENSE.txt
+#
+# ID: export_tests.py [] $
+
+"""
+Test the streaming export of the email network
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import shutil
+import tempfile
+import unittest
+import networkx as nx
+
+from io import BytesIO
+from tribe.extract import MBoxReader
+from tribe.export import write_graphml, read_graph, graph_info
+from tribe.export import EdgeList, AdjacencyMatrix
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import scipy.sparse as sp
+except ImportError:
+    sp = None
+
+##########################################################################
+## Fixtures
+##########################################################################
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+MBOX     = os.path.join(FIXTURES, "test.mbox")
+
+
+def roundtrip(G):
+    """
+    Writes a graph to a buffer with networkx and reads it back.
+    """
+    stream = BytesIO()
+    nx.write_graphml(G, stream)
+    stream.seek(0)
+    return nx.read_graphml(stream)
+
+
+class GraphMLWriterTests(unittest.TestCase):
+    """
+    Testing the streaming GraphML writer.
+    """
+
+    def setUp(self):
+        self.reader = MBoxReader(MBOX, persist_index=False)
+        self.links, self.emails = self.reader.count_links()
+
+    def assertSameGraph(self, G, H):
+        """
+        Assert graphs have the same attributes, nodes and edges in order.
+        """
+        self.assertEqual(G.graph, H.graph)
+        self.assertEqual(list(G.nodes(data=True)), list(H.nodes(data=True)))
+        self.assertEqual(list(G.edges(data=True)), list(H.edges(data=True)))
+
+    def test_write_graphml(self):
+        """
+        Test the streamed GraphML reads as the networkx GraphML
+        """
+        G = self.reader.build_graph(self.links, self.emails)
+        expected = roundtrip(G)
+
+        stream = BytesIO()
+        self.reader.write_graphml(stream, self.links, self.emails)
+        stream.seek(0)
+        actual = nx.read_graphml(stream)
+
+        expected.graph['extracted'] = actual.graph['extracted']
+        self.assertSameGraph(expected, actual)
+
+    def test_write_path(self):
+        """
+        Test streaming GraphML to a path
+        """
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, "test.graphml")
+            self.reader.write_graphml(path, self.links, self.emails)
+            G = nx.read_graphml(path)
+            self.assertEqual(G.number_of_edges(), len(self.links))
+            self.assertEqual(G.graph['n_emails'], self.emails)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_escaping(self):
+        """
+        Test attributes, nodes and edges with markup are escaped
+        """
+        G = nx.Graph(name='<"Tom" & Jerry>', big=1 << 40, ratio=0.5, flag=True)
+        G.add_edge('"tom"@cat.com', '<jerry>&co@mouse.com', weight=0.25, count=3, norm=1.0)
+        G.add_edge('tab\there@example.com', 'line\nbreak@example.com', weight=0.75, count=1, norm=0.5)
+
+        stream = BytesIO()
+        write_graphml(stream, G.graph, G.nodes(), G.edges(data=True))
+        stream.seek(0)
+
+        self.assertSameGraph(roundtrip(G), nx.read_graphml(stream))
+
+
+@unittest.skipIf(np is None, "numpy is required for npz edge lists")
+class EdgeListTests(unittest.TestCase):
+    """
+    Testing the npz edge list export.
+    """
+
+    def setUp(self):
+        self.reader = MBoxReader(MBOX, persist_index=False)
+        self.links, self.emails = self.reader.count_links()
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "test.npz")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_write_npz(self):
+        """
+        Test the npz edge list loads as the built graph
+        """
+        G = self.reader.build_graph(self.links, self.emails)
+        self.reader.write_npz(self.path, self.links, self.emails)
+        H = read_graph(self.path)
+
+        self.assertEqual(G.graph, H.graph)
+        self.assertEqual(list(G.nodes()), list(H.nodes()))
+        self.assertEqual(list(G.edges(data=True)), list(H.edges(data=True)))
+
+    def test_write_stream(self):
+        """
+        Test writing and loading an npz edge list with a stream
+        """
+        stream = BytesIO()
+        self.reader.write_npz(stream, self.links, self.emails)
+        stream.seek(0)
+
+        edges = EdgeList.load(stream)
+        self.assertEqual(edges.number_of_edges(), len(self.links))
+        self.assertEqual(edges.nodes, list(self.reader.iter_nodes(self.links)))
+
+    def test_graph_info(self):
+        """
+        Test the info of an npz edge list matches its GraphML
+        """
+        graphml = os.path.join(self.tmpdir, "test.graphml")
+        self.reader.write_graphml(graphml, self.links, self.emails)
+        self.reader.write_npz(self.path, self.links, self.emails)
+
+        self.assertEqual(graph_info(self.path), graph_info(graphml))
+        self.assertIn("Number of edges: {}".format(len(self.links)), graph_info(self.path))
+
+    def test_unicode_nodes(self):
+        """
+        Test node labels with non-ASCII characters are preserved
+        """
+        nodes = [u"Jos\xe9 <jose@example.com>", u"\u738b <wang@example.com>"]
+        edges = EdgeList(
+            {"name": "Test"}, nodes, np.array([0]), np.array([1]),
+            np.array([1.0]), np.array([2]), np.array([1.0]),
+        )
+        edges.save(self.path)
+        self.assertEqual(EdgeList.load(self.path).nodes, nodes)
+
+
+@unittest.skipIf(sp is None, "scipy is required for sparse matrices")
+class AdjacencyMatrixTests(unittest.TestCase):
+    """
+    Testing the sparse adjacency matrix export.
+    """
+
+    def setUp(self):
+        self.reader = MBoxReader(MBOX, persist_index=False)
+        self.links, self.emails = self.reader.count_links()
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "test.npz")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_adjacency_matrix(self):
+        """
+        Test the adjacency matrix matches the built graph
+        """
+        G = self.reader.build_graph(self.links, self.emails)
+        matrix, nodes = self.reader.adjacency_matrix(self.links)
+
+        self.assertEqual(nodes, list(G.nodes()))
+        self.assertEqual(matrix.shape, (len(nodes), len(nodes)))
+        self.assertEqual((matrix != matrix.T).nnz, 0)
+
+        for source, target, data in G.edges(data=True):
+            row, col = nodes.index(source), nodes.index(target)
+            self.assertEqual(matrix[row, col], data["count"])
+            self.assertEqual(matrix[col, row], data["count"])
+        self.assertEqual(matrix.nnz, 2 * G.number_of_edges())
+
+    def test_adjacency_weight(self):
+        """
+        Test the adjacency matrix of the other edge properties
+        """
+        counts, _ = self.reader.adjacency_matrix(self.links)
+        weights, _ = self.reader.adjacency_matrix(self.links, "weight")
+        norms, _ = self.reader.adjacency_matrix(self.links, "norm")
+
+        self.assertTrue(np.allclose(weights.toarray(), counts.toarray() / float(self.links.N)))
+        self.assertTrue(np.allclose(norms.toarray(), counts.toarray() / float(self.links.M)))
+
+        with self.assertRaises(ValueError):
+            self.reader.adjacency_matrix(self.links, "bogus")
+
+    def test_write_sparse(self):
+        """
+        Test writing and loading a sparse adjacency matrix
+        """
+        self.reader.write_sparse(self.path, self.links, self.emails)
+        adjacency = AdjacencyMatrix.load(self.path)
+        matrix, nodes = self.reader.adjacency_matrix(self.links)
+
+        self.assertEqual(adjacency.nodes, nodes)
+        self.assertEqual((adjacency.matrix != matrix).nnz, 0)
+        self.assertEqual(adjacency.number_of_edges(), len(self.links))
+
+        # The archive is readable by scipy itself
+        self.assertEqual((sp.load_npz(self.path) != matrix).nnz, 0)
+
+    def test_read_graph(self):
+        """
+        Test a sparse adjacency matrix reads as the built graph
+        """
+        G = self.reader.build_graph(self.links, self.emails)
+        self.reader.write_sparse(self.path, self.links, self.emails)
+        H = read_graph(self.path)
+
+        self.assertEqual(G.graph, H.graph)
+        self.assertEqual(list(G.nodes()), list(H.nodes()))
+        self.assertEqual(
+            set((frozenset((u, v)), d["count"]) for u, v, d in G.edges(data=True)),
+            set((frozenset((u, v)), d["count"]) for u, v, d in H.edges(data=True)),
+        )
+        self.assertIn("Number of edges: {}".format(len(self.links)), graph_info(self.path))
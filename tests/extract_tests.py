@@ -22,9 +22,10 @@ import json
 import unittest
 import networkx as nx
 
+from mailbox import mbox
 from datetime import datetime
-from tribe.extract import MBoxReader
-from tribe.emails import EmailMeta, EmailAddress
+from tribe.extract import MBoxReader, partition
+from tribe.emails import EmailMeta, EmailAddress, unpack_link
 from six import string_types
 
 ##########################################################################
@@ -41,7 +42,7 @@ class MBoxReaderTests(unittest.TestCase):
     """
 
     def setUp(self):
-        self.reader = MBoxReader(MBOX)
+        self.reader = MBoxReader(MBOX, persist_index=False)
 
     def tearDown(self):
         self.reader = None
@@ -66,6 +67,46 @@ class MBoxReaderTests(unittest.TestCase):
         self.assertEqual(self.reader.count(), 140)
         self.assertEqual(self.reader.count(), len(self.reader))
 
+    def test_get_message(self):
+        """
+        Test random access to messages matches the stdlib mbox
+        """
+        box = mbox(MBOX)
+        for idx in (0, 42, 139):
+            self.assertEqual(self.reader[idx].as_bytes(), box[idx].as_bytes())
+            self.assertEqual(self.reader[idx].get_from(), box[idx].get_from())
+        box.close()
+
+    def test_iter_messages(self):
+        """
+        Test iterating over a range of messages
+        """
+        msgs = list(self.reader.iter_messages(10, 20))
+        self.assertEqual(len(msgs), 10)
+        self.assertEqual(msgs[0].as_bytes(), self.reader[10].as_bytes())
+        self.assertEqual(msgs[-1].as_bytes(), self.reader[19].as_bytes())
+
+    def test_headers_only(self):
+        """
+        Test that headers only messages have the same headers and no body
+        """
+        fast = MBoxReader(MBOX, persist_index=False, headers_only=True)
+        for full, msg in zip(self.reader, fast):
+            self.assertEqual(full.items(), msg.items())
+            self.assertEqual(full.get_from(), msg.get_from())
+            self.assertFalse(msg.get_payload())
+
+    def test_headers_only_analysis(self):
+        """
+        Test that headers only mode does not change the extraction
+        """
+        fast = MBoxReader(MBOX, persist_index=False, headers_only=True)
+        self.assertEqual(fast.header_analysis(), self.reader.header_analysis())
+        self.assertEqual(
+            [repr(email) for email in fast.extract()],
+            [repr(email) for email in self.reader.extract()],
+        )
+
     def test_extract(self):
         """
         Make sure that extract does not error
@@ -90,3 +131,138 @@ class MBoxReaderTests(unittest.TestCase):
         self.assertEqual(nx.number_of_nodes(G), 7)
         self.assertEqual(nx.number_of_edges(G), 6)
         self.assertFalse(nx.is_directed(G))
+
+    def test_interned_links(self):
+        """
+        Test links are keyed by the packed ids of interned addresses
+        """
+        links, emails = self.reader.extract_links()
+        self.assertEqual(emails, 140)
+        self.assertEqual(len(links), 6)
+        self.assertEqual(len(self.reader.addresses), 7)
+
+        for link in links:
+            source, target = unpack_link(link)
+            self.assertLess(self.reader.addresses[source], self.reader.addresses[target])
+
+    def test_partition(self):
+        """
+        Test the partitioning of the mbox on message boundaries
+        """
+        parts = list(partition(self.reader.index, 8))
+        self.assertEqual(len(parts), 8)
+        self.assertEqual(parts[0][0], 0)
+        self.assertEqual(parts[-1][1], 140)
+
+        for (_, stop), (start, _) in zip(parts, parts[1:]):
+            self.assertEqual(stop, start)
+
+        self.assertEqual(len(list(partition(self.reader.index, 1000))), 140)
+
+    def test_parallel_graph_extract(self):
+        """
+        Test that parallel graph extraction matches serial extraction
+        """
+        serial   = self.reader.extract_graph()
+        parallel = MBoxReader(MBOX, persist_index=False).extract_graph(workers=3)
+
+        # The extracted timestamp is the only expected difference
+        parallel.graph['extracted'] = serial.graph['extracted']
+        self.assertEqual(
+            "\n".join(nx.generate_graphml(serial)),
+            "\n".join(nx.generate_graphml(parallel)),
+        )
+
+    def test_approximate_graph_extract(self):
+        """
+        Test approximate graph extraction in fixed memory
+        """
+        exact  = self.reader.extract_graph()
+        reader = MBoxReader(MBOX, persist_index=False, approximate=3)
+        G = reader.extract_graph()
+
+        self.assertEqual(G.number_of_edges(), 3)
+        self.assertEqual(G.graph['approximate'], 'space-saving')
+        self.assertEqual(G.graph['capacity'], 3)
+        self.assertGreater(G.graph['error_bound'], 0)
+        self.assertNotIn('approximate', exact.graph)
+
+        # Approximate counts overestimate by at most the error bound
+        for source, target, data in G.edges(data=True):
+            count = exact[source][target]['count'] if exact.has_edge(source, target) else 0
+            self.assertLessEqual(count, data['count'])
+            self.assertLessEqual(data['count'] - G.graph['error_bound'], count)
+
+    def test_approximate_parallel_graph_extract(self):
+        """
+        Test that approximate extraction with enough capacity is exact
+        """
+        exact = self.reader.extract_graph()
+        reader = MBoxReader(MBOX, persist_index=False, approximate=100000)
+        G = reader.extract_graph(workers=2)
+
+        # The bound includes the error of each partition and of the merge
+        total = exact.size(weight='count')
+        self.assertAlmostEqual(G.graph['error_bound'], 2.0 * total / 100000)
+        self.assertEqual(sorted(G.edges()), sorted(exact.edges()))
+        for source, target, data in G.edges(data=True):
+            self.assertEqual(data['count'], exact[source][target]['count'])
+
+    def fanout_links(self, policy, email):
+        """
+        Returns the sorted pairs of addresses linked by an email with the
+        given fanout policy and a limit of three people per message.
+        """
+        reader = MBoxReader(MBOX, persist_index=False, fanout=policy, max_recipients=3)
+        reader.extract = lambda start, stop: iter([email])
+        links, emails = reader.extract_links()
+        return sorted(
+            tuple(reader.addresses[id] for id in unpack_link(link)) for link in links
+        )
+
+    def test_fanout(self):
+        """
+        Test the fanout policies for broadcast messages
+        """
+        email = EmailMeta(
+            EmailAddress("c@example.com"),
+            [EmailAddress(addr) for addr in ("e@example.com", "a@example.com", "d@example.com")],
+            [EmailAddress("b@example.com")], None, None,
+        )
+
+        self.assertEqual(len(self.fanout_links("all", email)), 10)
+        self.assertEqual(self.fanout_links("skip", email), [])
+        self.assertEqual(self.fanout_links("cap", email), [
+            ("a@example.com", "c@example.com"),
+            ("a@example.com", "e@example.com"),
+            ("c@example.com", "e@example.com"),
+        ])
+        self.assertEqual(self.fanout_links("star", email), [
+            ("a@example.com", "c@example.com"),
+            ("b@example.com", "c@example.com"),
+            ("c@example.com", "d@example.com"),
+            ("c@example.com", "e@example.com"),
+        ])
+
+        # Messages within the limit are linked as usual
+        email = EmailMeta(email.sender, email.recipients[:2], [], None, None)
+        self.assertEqual(len(self.fanout_links("star", email)), 3)
+
+    def test_fanout_graph_extract(self):
+        """
+        Test that the fanout policy is recorded on the graph
+        """
+        G = self.reader.extract_graph()
+        self.assertEqual(G.graph['fanout_policy'], 'all')
+        self.assertNotIn('fanout_limit', G.graph)
+
+        reader = MBoxReader(MBOX, persist_index=False, fanout='skip', max_recipients=2)
+        H = reader.extract_graph(workers=2)
+        self.assertEqual(H.graph['fanout_policy'], 'skip')
+        self.assertEqual(H.graph['fanout_limit'], 2)
+        self.assertLessEqual(H.number_of_edges(), G.number_of_edges())
+
+        with self.assertRaises(ValueError):
+            MBoxReader(MBOX, fanout='clique')
+        with self.assertRaises(ValueError):
+            MBoxReader(MBOX, fanout='cap')
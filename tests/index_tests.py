@@ -0,0 +1,122 @@
+# tests.index_tests
+# Test the mbox byte offset index
+#
+# Author:   Tribe Contributors
+# Created:  Sun Oct 18 09:48:21 2026 -0400
+#
+# Copyright (C) 2026 District Data Labs
+# For license information, see LICENSE.txt
+#
+# ID: index_tests.py [] $
+
+"""
+Test the mbox byte offset index
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from io import BytesIO
+from mailbox import mbox
+from tribe.index import MBoxIndex
+
+##########################################################################
+## Fixtures
+##########################################################################
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+MBOX     = os.path.join(FIXTURES, "test.mbox")
+
+
+class MBoxIndexTests(unittest.TestCase):
+    """
+    Testing the byte offset index of an mbox.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path   = os.path.join(self.tmpdir, "test.mbox")
+        shutil.copyfile(MBOX, self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_build(self):
+        """
+        Test the index matches the stdlib mbox table of contents
+        """
+        index = MBoxIndex.build(self.path)
+        self.assertEqual(len(index), 140)
+
+        box = mbox(self.path)
+        box._generate_toc()
+        self.assertEqual(list(index), [box._toc[key] for key in sorted(box._toc)])
+        box.close()
+
+    def test_dump_and_load(self):
+        """
+        Test the serialization of the index
+        """
+        fobj = BytesIO()
+        orig = MBoxIndex.build(self.path)
+        orig.dump(fobj)
+
+        fobj.seek(0)
+        index = MBoxIndex.load(self.path, fobj)
+
+        self.assertEqual(list(orig), list(index))
+        self.assertEqual(orig.size, index.size)
+        self.assertEqual(orig.mtime, index.mtime)
+        self.assertTrue(index.is_valid())
+
+    def test_truncated_load(self):
+        """
+        Test that a truncated index cannot be loaded
+        """
+        fobj = BytesIO()
+        MBoxIndex.build(self.path).dump(fobj)
+
+        with self.assertRaises(ValueError):
+            MBoxIndex.load(self.path, BytesIO(fobj.getvalue()[:-8]))
+
+    def test_open_persists_sidecar(self):
+        """
+        Test that opening an index writes and then reuses the sidecar
+        """
+        sidecar = MBoxIndex.sidecar(self.path)
+        self.assertFalse(os.path.exists(sidecar))
+
+        index = MBoxIndex.open(self.path)
+        self.assertTrue(os.path.exists(sidecar))
+
+        with open(sidecar, 'rb') as f:
+            loaded = MBoxIndex.load(self.path, f)
+        self.assertEqual(list(index), list(loaded))
+        self.assertEqual(list(MBoxIndex.open(self.path)), list(index))
+
+    def test_open_no_persist(self):
+        """
+        Test that an index can be opened without writing a sidecar
+        """
+        index = MBoxIndex.open(self.path, persist=False)
+        self.assertEqual(len(index), 140)
+        self.assertFalse(os.path.exists(MBoxIndex.sidecar(self.path)))
+
+    def test_invalidation(self):
+        """
+        Test that the index is rebuilt when the mbox changes
+        """
+        index = MBoxIndex.open(self.path)
+
+        with open(MBOX, 'rb') as src, open(self.path, 'ab') as dst:
+            dst.write(b"\n")
+            dst.write(src.read())
+
+        self.assertFalse(index.is_valid())
+        self.assertEqual(len(MBoxIndex.open(self.path)), 280)
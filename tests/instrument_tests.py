@@ -0,0 +1,113 @@
+# tests.instrument_tests
+# Test the instrumentation of the extraction pipeline
+#
+# Author:   Tribe Contributors
+# Created:  Sun Oct 18 20:41:09 2026 -0400
+#
+# Copyright (C) 2026 District Data Labs
+# For license information, see LICENSE.txt
+#
+# ID: instrument_tests.py [] $
+
+"""
+Test the instrumentation of the extraction pipeline
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import json
+import pickle
+import unittest
+
+from io import StringIO
+from tribe.extract import MBoxReader
+from tribe.instrument import Profiler, STAGES, READING, GRAPH, PAIRS
+
+##########################################################################
+## Fixtures
+##########################################################################
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+MBOX     = os.path.join(FIXTURES, "test.mbox")
+
+
+class ProfilerTests(unittest.TestCase):
+    """
+    Testing the Profiler of the extraction stages.
+    """
+
+    def test_timer(self):
+        """
+        Test the timer adds to the seconds of a stage
+        """
+        profiler = Profiler()
+        with profiler.timer(GRAPH):
+            sum(range(10000))
+
+        self.assertGreater(profiler.seconds[GRAPH], 0)
+        self.assertEqual(profiler.total, profiler.seconds[GRAPH])
+
+    def test_report(self):
+        """
+        Test the rates and percents of the report
+        """
+        profiler = Profiler()
+        profiler.messages, profiler.bytes = 100, 5000
+        profiler.seconds[READING] = 1.0
+        profiler.seconds[PAIRS] = 3.0
+
+        report = profiler.report()
+        self.assertEqual(list(report["stages"]), list(STAGES))
+        self.assertEqual(report["seconds"], 4.0)
+        self.assertEqual(report["messages_per_sec"], 25.0)
+        self.assertEqual(report["bytes_per_sec"], 1250.0)
+        self.assertEqual(report["stages"][READING]["percent"], 25.0)
+        self.assertEqual(report["stages"][PAIRS]["messages_per_sec"], 100 / 3.0)
+        self.assertIsNone(report["stages"][GRAPH]["bytes_per_sec"])
+
+        # The report is serializable and printable
+        stream = StringIO()
+        profiler.dump(stream)
+        self.assertEqual(json.loads(stream.getvalue())["messages"], 100)
+        self.assertIn("reading", str(profiler))
+
+    def test_update(self):
+        """
+        Test merging the profilers of workers
+        """
+        profiler, worker = Profiler(), Profiler()
+        profiler.messages, worker.messages = 10, 20
+        profiler.seconds[READING], worker.seconds[READING] = 1.0, 2.0
+        worker.dates["fast"] = 20
+
+        profiler.update(pickle.loads(pickle.dumps(worker)))
+        self.assertEqual(profiler.messages, 30)
+        self.assertEqual(profiler.seconds[READING], 3.0)
+        self.assertEqual(profiler.dates["fast"], 20)
+
+    def test_extraction(self):
+        """
+        Test the stages of an extraction are profiled
+        """
+        reader = MBoxReader(MBOX, persist_index=False, cache=False)
+        reader.extract_graph()
+
+        profiler = reader.profiler
+        self.assertEqual(profiler.messages, reader.count())
+        self.assertEqual(profiler.bytes, os.path.getsize(MBOX))
+        self.assertEqual(sum(profiler.dates.values()), reader.count())
+        for stage in STAGES:
+            self.assertGreater(profiler.seconds[stage], 0, stage)
+
+    def test_parallel_extraction(self):
+        """
+        Test the profiles of parallel workers are merged
+        """
+        reader = MBoxReader(MBOX, persist_index=False)
+        reader.count_links(workers=2)
+
+        self.assertEqual(reader.profiler.messages, reader.count())
+        self.assertEqual(reader.profiler.bytes, os.path.getsize(MBOX))
@@ -0,0 +1,153 @@
+# tests.scanner_tests
+# Test the memory mapped mbox scanner
+#
+# Author:   Tribe Contributors
+# Created:  Sun Oct 18 11:40:09 2026 -0400
+#
+# Copyright (C) 2026 District Data Labs
+# For license information, see LICENSE.txt
+#
+# ID: scanner_tests.py [] $
+
+"""
+Test the memory mapped mbox scanner
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from mailbox import mbox
+from tribe.scanner import MBoxScanner
+
+##########################################################################
+## Fixtures
+##########################################################################
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+MBOX     = os.path.join(FIXTURES, "test.mbox")
+
+# Edge cases of mbox formatting that the scanner must treat like the stdlib
+EDGE_CASES = (
+    b"",
+    b"\n\nFrom a@b Sat Nov 15 08:55:41 2014\nFrom: a@b\n\nbody\n",
+    b"From a@b Sat Nov 15 08:55:41 2014\nFrom: a@b\n\nbody",
+    b"From a@b Sat Nov 15 08:55:41 2014\nFrom: a@b\n\nbody\nFrom c@d Sat Nov 15 08:55:41 2014\nTo: c@d\n\n",
+    b"From a@b Sat Nov 15 08:55:41 2014\r\nFrom: a@b\r\n\r\nbody\r\n\r\nFrom c@d Sat Nov 15 08:55:41 2014\r\n\r\n",
+    b"From a@b Sat Nov 15 08:55:41 2014\nFrom: a@b\nTo: c@d\n\n\n\nFrom c@d Sat Nov 15 08:55:41 2014\nTo: c@d\n",
+    b"no separator at all\n",
+)
+
+
+def stdlib_toc(path):
+    """
+    Returns the table of contents computed by the stdlib mailbox.mbox.
+    """
+    box = mbox(path)
+    try:
+        box._generate_toc()
+        return [box._toc[key] for key in sorted(box._toc)]
+    finally:
+        box.close()
+
+
+class MBoxScannerTests(unittest.TestCase):
+    """
+    Testing the memory mapped mbox scanner.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write_mbox(self, data):
+        path = os.path.join(self.tmpdir, "test.mbox")
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_scan(self):
+        """
+        Test scanned boundaries match the stdlib mbox table of contents
+        """
+        with MBoxScanner(MBOX) as scanner:
+            self.assertEqual(list(scanner.scan()), stdlib_toc(MBOX))
+
+    def test_scan_edge_cases(self):
+        """
+        Test scanned boundaries of unusually formatted mboxes
+        """
+        for data in EDGE_CASES:
+            path = self.write_mbox(data)
+            with MBoxScanner(path) as scanner:
+                self.assertEqual(list(scanner.scan()), stdlib_toc(path), repr(data))
+
+    def test_message(self):
+        """
+        Test messages match those read by the stdlib mbox
+        """
+        box = mbox(MBOX)
+        with MBoxScanner(MBOX) as scanner:
+            for idx, (start, stop) in enumerate(scanner.scan()):
+                msg = scanner.message(start, stop)
+                self.assertEqual(msg.as_bytes(), box[idx].as_bytes())
+                self.assertEqual(msg.get_from(), box[idx].get_from())
+        box.close()
+
+    def test_headers(self):
+        """
+        Test header only messages match the stdlib mbox headers
+        """
+        box = mbox(MBOX)
+        with MBoxScanner(MBOX) as scanner:
+            for idx, (start, stop) in enumerate(scanner.scan()):
+                msg = scanner.headers(start, stop)
+                self.assertEqual(msg.items(), box[idx].items())
+                self.assertEqual(msg.get_from(), box[idx].get_from())
+                self.assertFalse(msg.get_payload())
+        box.close()
+
+    def test_select_headers(self):
+        """
+        Test only the selected headers are parsed
+        """
+        fields = frozenset((b'to', b'subject'))
+        box = mbox(MBOX)
+        with MBoxScanner(MBOX) as scanner:
+            for idx, (start, stop) in enumerate(scanner.scan()):
+                msg = scanner.headers(start, stop, fields)
+                self.assertEqual(msg.get_all('To'), box[idx].get_all('To'))
+                self.assertEqual(msg.get('Subject'), box[idx].get('Subject'))
+                self.assertIsNone(msg.get('From'))
+        box.close()
+
+    def test_select_folded_headers(self):
+        """
+        Test selected headers keep continuation lines and stop at non-headers
+        """
+        path = self.write_mbox(
+            b"From a@b Sat Nov 15 08:55:41 2014\n"
+            b"Received: by example.com\n"
+            b"\tfor <c@d>\n"
+            b"To: a@b,\n"
+            b"  c@d\n"
+            b"this is not a header\n"
+            b"Subject: ignored\n"
+            b"\n"
+            b"body\n"
+        )
+
+        with MBoxScanner(path) as scanner:
+            start, stop = next(scanner.scan())
+            msg = scanner.headers(start, stop, frozenset((b'to', b'subject')))
+            full = scanner.headers(start, stop)
+
+        self.assertEqual(msg.items(), [('To', full['To'])])
+        self.assertIsNone(full['Subject'])
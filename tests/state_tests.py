@@ -0,0 +1,319 @@
+# tests.state_tests
+# Test the persistent extraction state for incremental extraction
+#
+# Author:   Tribe Contributors
+# Created:  Sun Oct 18 12:58:13 2026 -0400
+#
+# Copyright (C) 2026 District Data Labs
+# For license information, see LICENSE.txt
+#
+# ID: state_tests.py [] $
+
+"""
+Test the persistent extraction state for incremental extraction
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+import warnings
+import networkx as nx
+
+from tribe.index import MBoxIndex
+from tribe.extract import MBoxReader
+from tribe.state import ExtractionState, CHECKPOINT_EXT
+
+##########################################################################
+## Fixtures
+##########################################################################
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+MBOX     = os.path.join(FIXTURES, "test.mbox")
+
+
+def graphml(G):
+    """
+    Serializes a graph without the details of the extraction for comparison.
+    """
+    for key in ('extracted', 'mbox', 'mbox_size'):
+        G.graph.pop(key, None)
+    return "\n".join(nx.generate_graphml(G))
+
+
+class InterruptedReader(MBoxReader):
+    """
+    An MBoxReader that is killed when it reaches a message.
+    """
+
+    def __init__(self, path, interrupt, **kwargs):
+        self.interrupt = interrupt
+        super(InterruptedReader, self).__init__(path, **kwargs)
+
+    def iter_messages(self, start=0, stop=None, fields=None):
+        messages = super(InterruptedReader, self).iter_messages(start, stop, fields)
+        for idx, msg in enumerate(messages, start):
+            if idx == self.interrupt:
+                raise KeyboardInterrupt("killed at message {}".format(idx))
+            yield msg
+
+
+class ExtractionStateTests(unittest.TestCase):
+    """
+    Testing incremental extraction of an append-only mbox.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path   = os.path.join(self.tmpdir, "test.mbox")
+
+        with open(MBOX, 'rb') as f:
+            self.data = f.read()
+
+        # Write the first 60 messages of the fixture
+        self.split = MBoxIndex.build(MBOX).starts[60]
+        with open(self.path, 'wb') as f:
+            f.write(self.data[:self.split])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def append(self):
+        with open(self.path, 'ab') as f:
+            f.write(self.data[self.split:])
+
+    def test_incremental_extract(self):
+        """
+        Test incremental extraction matches a full extraction
+        """
+        state = ExtractionState.open(self.path)
+        MBoxReader(self.path).extract_graph(state=state)
+        self.assertEqual(state.emails, 60)
+        self.assertEqual(state.offset, self.split)
+        state.save()
+
+        self.append()
+        state  = ExtractionState.open(self.path)
+        reader = MBoxReader(self.path)
+        self.assertTrue(state.verify())
+        self.assertEqual(state.resume(reader.index), 60)
+
+        G = reader.extract_graph(state=state)
+        self.assertEqual(state.emails, 140)
+        self.assertEqual(G.graph['n_emails'], 140)
+        self.assertEqual(graphml(G), graphml(MBoxReader(MBOX, persist_index=False).extract_graph()))
+
+    def test_incremental_no_new_messages(self):
+        """
+        Test incremental extraction without new messages
+        """
+        state = ExtractionState.open(self.path)
+        G = MBoxReader(self.path).extract_graph(state=state)
+        state.save()
+
+        state = ExtractionState.open(self.path)
+        H = MBoxReader(self.path).extract_graph(state=state)
+        self.assertEqual(state.emails, 60)
+        self.assertEqual(graphml(G), graphml(H))
+
+    def test_changed_prefix(self):
+        """
+        Test that the state is reset if the mbox is rewritten
+        """
+        state = ExtractionState.open(self.path)
+        MBoxReader(self.path).extract_graph(state=state)
+        state.save()
+
+        with open(self.path, 'wb') as f:
+            f.write(self.data.replace(b'Inbox', b'Inbax', 1))
+
+        state = ExtractionState.open(self.path)
+        self.assertFalse(state.verify())
+
+        G = MBoxReader(self.path).extract_graph(state=state)
+        self.assertEqual(state.emails, 140)
+        self.assertEqual(G.graph['n_emails'], 140)
+
+    def test_truncated_mbox(self):
+        """
+        Test that the state cannot be verified for a truncated mbox
+        """
+        state = ExtractionState.open(self.path)
+        MBoxReader(self.path).extract_graph(state=state)
+
+        with open(self.path, 'wb') as f:
+            f.write(self.data[:self.split // 2])
+
+        self.assertFalse(state.verify())
+
+    def test_approximate_state(self):
+        """
+        Test that an exact state is reset for an approximate extraction
+        """
+        state = ExtractionState.open(self.path)
+        MBoxReader(self.path).extract_graph(state=state)
+        state.save()
+
+        self.append()
+        state = ExtractionState.open(self.path)
+        G = MBoxReader(self.path, approximate=3).extract_graph(state=state)
+        self.assertEqual(state.emails, 140)
+        self.assertEqual(state.links.capacity, 3)
+        self.assertEqual(G.graph['capacity'], 3)
+
+    def test_fanout_state(self):
+        """
+        Test that the state is reset for another fanout policy or limit
+        """
+        state = ExtractionState.open(self.path)
+        MBoxReader(self.path, fanout="skip", max_recipients=5).extract_graph(state=state)
+        state.save()
+
+        self.append()
+        state = ExtractionState.open(self.path)
+        self.assertEqual((state.fanout, state.max_recipients), ("skip", 5))
+
+        G = MBoxReader(self.path, fanout="skip", max_recipients=3).extract_graph(state=state)
+        self.assertEqual(state.emails, 140)
+        self.assertEqual((state.fanout, state.max_recipients), ("skip", 3))
+
+        expected = MBoxReader(MBOX, persist_index=False, fanout="skip", max_recipients=3)
+        self.assertEqual(graphml(G), graphml(expected.extract_graph()))
+
+    def test_foreign_state(self):
+        """
+        Test that unreadable or foreign state files start a new state
+        """
+        filename = ExtractionState.sidecar(self.path)
+        for data in ([1, 2, 3], {'version': 3}, b"garbage"):
+            with open(filename, 'wb') as f:
+                if isinstance(data, bytes):
+                    f.write(data)
+                else:
+                    pickle.dump(data, f)
+
+            state = ExtractionState.open(self.path)
+            self.assertEqual(state.offset, 0)
+            self.assertEqual(state.filename, filename)
+
+    def test_dump_and_load(self):
+        """
+        Test the serialization of the extraction state
+        """
+        state = ExtractionState.open(self.path)
+        MBoxReader(self.path).extract_graph(state=state)
+        state.save()
+
+        loaded = ExtractionState.open(self.path)
+        self.assertEqual(loaded.links, state.links)
+        self.assertEqual(loaded.emails, state.emails)
+        self.assertEqual(loaded.offset, state.offset)
+        self.assertEqual(loaded.digest, state.digest)
+        self.assertEqual(list(loaded.addresses), list(state.addresses))
+        self.assertEqual((loaded.fanout, loaded.max_recipients), (state.fanout, state.max_recipients))
+
+    def test_dump_and_load_approximate(self):
+        """
+        Test the serialization of approximate link counts and their errors
+        """
+        state = ExtractionState.open(self.path)
+        MBoxReader(self.path, approximate=5).extract_graph(state=state)
+        state.links.inherited = 1.5
+        state.save()
+
+        loaded = ExtractionState.open(self.path)
+        self.assertEqual(loaded.links, state.links)
+        self.assertEqual(loaded.links.capacity, 5)
+        self.assertEqual(loaded.links.errors, state.links.errors)
+        self.assertEqual(loaded.links.error_bound, state.links.error_bound)
+
+        # Counting continues with evictions from the restored heap
+        loaded.links.update(range(100))
+        self.assertEqual(len(loaded.links), 5)
+
+
+class CheckpointTests(unittest.TestCase):
+    """
+    Testing checkpoint and resume of long running extractions.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path   = os.path.join(self.tmpdir, "test.mbox")
+        self.ckpt   = ExtractionState.sidecar(self.path, CHECKPOINT_EXT)
+        shutil.copyfile(MBOX, self.path)
+
+        self.expected = graphml(MBoxReader(MBOX, persist_index=False).extract_graph())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_resume(self):
+        """
+        Test resuming an interrupted extraction from a checkpoint
+        """
+        reader = InterruptedReader(self.path, 60)
+        state  = ExtractionState(self.path, filename=self.ckpt)
+
+        with self.assertRaises(KeyboardInterrupt):
+            reader.extract_graph(state=state, checkpoint=25)
+
+        # The last checkpoint was saved after 50 messages
+        reader = MBoxReader(self.path)
+        state  = ExtractionState.open(self.path, self.ckpt)
+        self.assertEqual(state.resume(reader.index), 50)
+        self.assertEqual(state.offset, reader.index.starts[50])
+
+        G = reader.extract_graph(state=state, checkpoint=25)
+        self.assertEqual(state.emails, 140)
+        self.assertEqual(graphml(G), self.expected)
+
+    def test_resume_parallel(self):
+        """
+        Test resuming a parallel extraction from a checkpoint
+        """
+        reader = InterruptedReader(self.path, 60)
+        state  = ExtractionState(self.path, filename=self.ckpt)
+
+        with self.assertRaises(KeyboardInterrupt):
+            reader.extract_graph(state=state, checkpoint=25)
+
+        state = ExtractionState.open(self.path, self.ckpt)
+        G = MBoxReader(self.path).extract_graph(workers=2, state=state, checkpoint=25)
+        self.assertEqual(state.emails, 140)
+        self.assertEqual(graphml(G), self.expected)
+
+        # The parallel extraction also saved checkpoints as it went
+        saved = ExtractionState.open(self.path, self.ckpt)
+        self.assertGreater(saved.offset, MBoxReader(self.path).index.starts[50])
+        self.assertGreater(saved.emails, 50)
+
+    def test_no_checkpoint(self):
+        """
+        Test that no checkpoint is saved when checkpointing is disabled
+        """
+        state = ExtractionState(self.path, filename=self.ckpt)
+        G = MBoxReader(self.path).extract_graph(state=state, checkpoint=0)
+        self.assertFalse(os.path.exists(self.ckpt))
+        self.assertEqual(graphml(G), self.expected)
+
+    def test_unwritable_checkpoint(self):
+        """
+        Test that failing to save a checkpoint does not stop the extraction
+        """
+        ckpt  = os.path.join(self.tmpdir, "missing", "test.mbox.ckpt")
+        state = ExtractionState(self.path, filename=ckpt)
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            G = MBoxReader(self.path).extract_graph(state=state, checkpoint=25)
+
+        self.assertEqual(len(caught), 1)
+        self.assertFalse(os.path.exists(ckpt))
+        self.assertEqual(state.emails, 140)
+        self.assertEqual(graphml(G), self.expected)
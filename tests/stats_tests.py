@@ -18,16 +18,25 @@ Testing for the stats library in Tribe
 ##########################################################################
 
 import os
+import pickle
 import random
 import unittest
 
-from tribe.stats import FreqDist
+from collections import Counter
+from tribe.stats import FreqDist, SpaceSaving, DenseFreqDist, stable_hash
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 try:
     from cStringIO import StringIO
 except ImportError:
     from io import StringIO
 
+from io import BytesIO
+
 
 ##########################################################################
 ## Helper Functions
@@ -69,20 +78,23 @@ class FreqDistTests(unittest.TestCase):
         dist = FreqDist(random_characters(100))
         self.assertEqual(dist.N, 100)
 
-    def test_memoized_n_samples(self):
+    def test_live_n_samples(self):
         """
-        Test the memoization of N, the number of samples
+        Test N, the number of samples, is updated as counts change
         """
         dist = FreqDist(random_characters(100))
         self.assertEqual(dist.N, 100)
 
         for letter in random_characters(100):
             dist[letter] += 1
-
-        self.assertEqual(dist.N, 100)
-        del dist.N
         self.assertEqual(dist.N, 200)
 
+        dist.subtract('abc')
+        self.assertEqual(dist.N, 197)
+
+        del dist['d']
+        self.assertEqual(dist.N, sum(dist.values()))
+
     def test_b_bins(self):
         """
         Test the computation of B, the number of bins
@@ -90,20 +102,20 @@ class FreqDistTests(unittest.TestCase):
         dist = FreqDist(random_characters(1000))
         self.assertEqual(dist.B, 26)
 
-    def test_memoized_b_bins(self):
+    def test_live_b_bins(self):
         """
-        Test the memoization of B, the number of bins
+        Test B, the number of bins, is updated as samples change
         """
         dist = FreqDist(random_characters(1000))
         self.assertEqual(dist.B, 26)
 
         for letter in random_characters(100, 'abcdef'):
             dist[letter] += 1
-
-        self.assertEqual(dist.B, 26)
-        del dist.B
         self.assertEqual(dist.B, 32)
 
+        dist.pop('a')
+        self.assertEqual(dist.B, 31)
+
     def test_m_magnitude(self):
         """
         Test the computation of M, the magnitude
@@ -111,19 +123,77 @@ class FreqDistTests(unittest.TestCase):
         dist = FreqDist('aaabbbaaabccddeeffbbccddeegjja')
         self.assertEqual(dist.M, 7)
 
-    def test_memoized_m_magnitude(self):
+    def test_live_m_magnitude(self):
         """
-        Test the memoization of M, the magnitude
+        Test M, the magnitude, is updated as counts change
         """
         dist = FreqDist('aaabbbaaabccddeeffbbccddeegjja')
         self.assertEqual(dist.M, 7)
 
         for letter in 'aaabbccc':
             dist[letter] += 1
+        self.assertEqual(dist.M, 10)
 
+        # Removing the maximum count finds the next largest count
+        dist.subtract({'a': 4})
+        self.assertEqual(dist.M, 8)
+        del dist['b']
         self.assertEqual(dist.M, 7)
+
+        dist.clear()
+        self.assertEqual(dist.M, 0)
+
+    def test_live_freq(self):
+        """
+        Test frequencies and norms are correct while counting
+        """
+        dist = FreqDist()
+        for idx, letter in enumerate('abcabca', 1):
+            dist[letter] += 1
+            self.assertAlmostEqual(dist.freq(letter), dist[letter] / float(idx))
+            self.assertAlmostEqual(dist.norm('a'), dist['a'] / float(max(dist.values())))
+
+    def test_delete_aggregates(self):
+        """
+        Test deleting the aggregates (to force a recompute) still works
+        """
+        dist = FreqDist("aabbbc")
+        dict.__setitem__(dist, 'd', 10)
+
+        del dist.N
+        del dist.B
         del dist.M
-        self.assertEqual(dist.M, 10)
+        self.assertEqual((dist.N, dist.B, dist.M), (16, 4, 10))
+
+    def test_aggregates_mutations(self):
+        """
+        Test the aggregates match a full scan after every kind of mutation
+        """
+        def check(dist):
+            self.assertEqual(dist.N, sum(dist.values()))
+            self.assertEqual(dist.B, len(dist))
+            self.assertEqual(dist.M, max(dist.values()) if dist else 0)
+
+        dist = FreqDist({'a': 3, 'b': 5})
+        check(dist)
+        dist.update({'a': 4, 'c': 1})
+        check(dist)
+        dist.update('cccccccc', d=2)
+        check(dist)
+        dist.subtract({'c': 9})
+        check(dist)
+        dist.setdefault('e', 12)
+        check(dist)
+        dist.popitem()
+        check(dist)
+        dist += FreqDist('zzz')
+        check(dist)
+        dist -= FreqDist('aaaaaaa')
+        check(dist)
+        check(dist.copy())
+        check(pickle.loads(pickle.dumps(dist)))
+        dist.clear()
+        check(dist)
 
     def test_freq(self):
         """
@@ -242,3 +312,457 @@ class FreqDistTests(unittest.TestCase):
         dist = FreqDist.load(fobj)
 
         self.assertEqual(orig, dist)
+
+    def test_binary_dump_and_load(self):
+        """
+        Test the binary serialization of string, tuple and number samples
+        """
+        orig = FreqDist(random_characters(1000))
+        orig.update({('a', 'b'): 3, (1, 2): 4, 1 << 40: 5, b'raw': 6})
+
+        for compress in (False, True):
+            fobj = BytesIO()
+            orig.dump_binary(fobj, compress=compress)
+            fobj.seek(0)
+
+            dist = FreqDist.load_binary(fobj)
+            self.assertEqual(orig, dist)
+            self.assertEqual(list(orig), list(dist))
+            self.assertEqual((dist.N, dist.B, dist.M), (orig.N, orig.B, orig.M))
+
+    def test_binary_key_kinds(self):
+        """
+        Test each kind of binary key section round trips exactly
+        """
+        dists = (
+            FreqDist({1: 2, -5: 3, (1 << 63) - 1: 4}),
+            FreqDist({"a": 1, "\u00e9t\u00e9": 2, "bad\udcff": 3, "": 4}),
+            FreqDist({
+                None: 1, True: 2, 1.5: 3, -(1 << 70): 4, (1 << 64): 5,
+                ("a", (b"b", 2, None)): 6, (): 7, "x": 8,
+            }),
+        )
+
+        for orig in dists:
+            fobj = BytesIO()
+            orig.dump_binary(fobj)
+            fobj.seek(0)
+
+            dist = FreqDist.load_binary(fobj)
+            self.assertEqual(list(dist.items()), list(orig.items()))
+            self.assertEqual([type(key) for key in dist], [type(key) for key in orig])
+
+        with self.assertRaises(TypeError):
+            FreqDist({object(): 1}).dump_binary(BytesIO())
+
+    def test_binary_float_counts(self):
+        """
+        Test the binary serialization of non-integer counts
+        """
+        orig = FreqDist({'a': 0.5, 'b': 2})
+        fobj = BytesIO()
+        orig.dump_binary(fobj)
+        fobj.seek(0)
+        self.assertEqual(FreqDist.load_binary(fobj), orig)
+
+    def test_binary_load_errors(self):
+        """
+        Test loading data that is not a binary dump raises a ValueError
+        """
+        fobj = BytesIO()
+        FreqDist('abc').dump_binary(fobj)
+        data = fobj.getvalue()
+
+        fobj = BytesIO()
+        FreqDist({(1, "a"): 1}).dump_binary(fobj)
+        tagged = fobj.getvalue()
+        tagged = tagged[:-17] + b"?" + tagged[-16:]
+
+        for bad in (b"", b"NOTAFREQDIST" * 4, data[:-1], tagged):
+            with self.assertRaises(ValueError):
+                FreqDist.load_binary(BytesIO(bad))
+
+    def test_max(self):
+        """
+        Test the max is the first most common sample
+        """
+        dist = FreqDist('abcabcbcc')
+        self.assertEqual(dist.max(), 'c')
+        dist['b'] += 1
+        self.assertEqual(dist.max(), dist.most_common(1)[0][0])
+        self.assertIsNone(FreqDist().max())
+
+    def test_top_and_bottom(self):
+        """
+        Test the top and bottom k samples match a full sort
+        """
+        dist = FreqDist(random_characters(1000))
+        ranked = dist.most_common()
+
+        for k in (0, 1, 5, 26, 50):
+            self.assertEqual(dist.top(k), ranked[:k])
+            self.assertEqual(
+                [count for _, count in dist.bottom(k)],
+                sorted(dist.values())[:k],
+            )
+
+    def test_threshold(self):
+        """
+        Test filtering samples by their counts
+        """
+        dist = FreqDist('aaaabbbccd')
+        self.assertEqual(dist.threshold(2), FreqDist('aaaabbbcc'))
+        self.assertEqual(dist.threshold(maximum=2), FreqDist('ccd'))
+        self.assertEqual(dist.threshold(2, 3), FreqDist('bbbcc'))
+
+        pruned = dist.threshold(3)
+        self.assertEqual((pruned.N, pruned.B, pruned.M), (7, 2, 4))
+
+    def test_histogram(self):
+        """
+        Test the histogram of the counts
+        """
+        dist = FreqDist('aaaabbbccdef')
+        self.assertEqual(dist.histogram(), FreqDist({4: 1, 3: 1, 2: 1, 1: 3}))
+
+    def test_quantiles(self):
+        """
+        Test the quantiles of the counts match the nearest rank of a sort
+        """
+        dist = FreqDist(random_characters(1000))
+        counts = sorted(dist.values())
+
+        for q in (0, 0.1, 0.25, 0.3, 0.5, 0.9, 1):
+            rank = max(1, -(-int(round(q * 100)) * len(counts) // 100))
+            self.assertEqual(dist.quantile(q), counts[rank - 1])
+
+        self.assertEqual(dist.quantiles(0, 1), [counts[0], counts[-1]])
+        self.assertEqual(FreqDist('aaabbbbcccccccccdd').quantile(0.5), 3)
+        self.assertEqual(FreqDist().quantiles(0.5), [None])
+
+        with self.assertRaises(ValueError):
+            dist.quantile(1.5)
+
+    def test_merge(self):
+        """
+        Test merging many partial distributions
+        """
+        parts = [FreqDist(random_characters(100)) for _ in range(5)]
+        expected = Counter()
+        for part in parts:
+            expected.update(part)
+
+        dist = FreqDist().merge(*parts)
+        self.assertEqual(dist, expected)
+        self.assertEqual(dist.N, 500)
+        self.assertEqual(dist.M, max(expected.values()))
+
+        # Merging into a non-empty dist adds to its counts
+        dist.merge({'a': 100, '!': 1})
+        self.assertEqual(dist['a'], expected['a'] + 100)
+        self.assertEqual(dist.N, 601)
+        self.assertEqual(dist.M, expected['a'] + 100)
+
+    def test_shard(self):
+        """
+        Test sharding a distribution and merging the shards
+        """
+        dist = FreqDist(random_characters(1000))
+        shards = dist.shard(4, key=ord)
+
+        self.assertEqual(len(shards), 4)
+        for idx, shard in enumerate(shards):
+            for sample in shard:
+                self.assertEqual(ord(sample) % 4, idx)
+        self.assertEqual(sum(shard.N for shard in shards), dist.N)
+        self.assertEqual(FreqDist().merge(*shards), dist)
+
+    def test_stable_shard(self):
+        """
+        Test the default shards do not depend on the hash seed
+        """
+        self.assertEqual(stable_hash("a"), 3904355907)
+        self.assertEqual(stable_hash(b"a"), 3904355907)
+        self.assertEqual(stable_hash(42), 841265288)
+        self.assertEqual(stable_hash(("a", 1)), stable_hash(("a", 1)))
+
+        dist = FreqDist(random_characters(1000))
+        for idx, shard in enumerate(dist.shard(3)):
+            for sample in shard:
+                self.assertEqual(stable_hash(sample) % 3, idx)
+
+    @unittest.skipIf(np is None, "numpy is required for vectorized frequencies")
+    def test_freqs_and_norms(self):
+        """
+        Test vectorized frequencies and norms match freq and norm
+        """
+        dist = FreqDist(random_characters(1000))
+        keys = list(dist.keys()) + ['missing']
+
+        self.assertEqual(dist.freqs(keys).tolist(), [dist.freq(key) for key in keys])
+        self.assertEqual(dist.norms(keys).tolist(), [dist.norm(key) for key in keys])
+        self.assertEqual(dist.freqs().tolist(), [dist.freq(key) for key in dist])
+        self.assertEqual(dist.norms().tolist(), [dist.norm(key) for key in dist])
+
+        self.assertEqual(FreqDist().freqs(['a']).tolist(), [0.0])
+        self.assertEqual(FreqDist().norms().tolist(), [])
+
+    @unittest.skipIf(np is None, "numpy is required to export to arrays")
+    def test_to_arrays(self):
+        """
+        Test exporting a distribution to parallel key and count arrays
+        """
+        dist = FreqDist(random.randrange(100) for _ in range(1000))
+        keys, counts = dist.to_arrays(np.uint64)
+
+        self.assertEqual(keys.dtype, np.uint64)
+        self.assertEqual(counts.dtype, np.int64)
+        self.assertEqual(list(zip(keys.tolist(), counts.tolist())), list(dist.items()))
+
+        keys, counts = FreqDist(random_characters(100)).to_arrays()
+        self.assertEqual(keys.dtype.kind, 'U')
+
+
+##########################################################################
+## Space-Saving Tests
+##########################################################################
+
+class SpaceSavingTests(unittest.TestCase):
+
+    def skewed(self, n):
+        """
+        Generates n samples with a power law distribution.
+        """
+        for _ in range(n):
+            yield int(random.paretovariate(1.2))
+
+    def test_capacity(self):
+        """
+        Test that no more than capacity samples are counted
+        """
+        dist = SpaceSaving(10, self.skewed(5000))
+        self.assertEqual(len(dist), 10)
+        self.assertEqual(dist.N, 5000)
+
+        with self.assertRaises(ValueError):
+            SpaceSaving(0)
+
+    def test_clear(self):
+        """
+        Test that clearing also discards the errors, heap and inherited bound
+        """
+        dist = SpaceSaving(100)
+        for window in range(50):
+            dist.merge(SpaceSaving(10, self.skewed(100)))
+            dist.update(range(window, window + 50))
+            dist.clear()
+
+        self.assertEqual(len(dist), 0)
+        self.assertEqual(len(dist.errors), 0)
+        self.assertEqual(len(dist._heap), 0)
+        self.assertEqual(dist.error_bound, 0)
+
+    def test_delete(self):
+        """
+        Test deleting samples including missing ones
+        """
+        dist = SpaceSaving(10, "aabbc")
+        del dist['a']
+        del dist['missing']
+        self.assertNotIn('a', dist.errors)
+
+        dist.popitem()
+        self.assertEqual(len(dist.errors), len(dist))
+
+    def test_binary_dump_and_load(self):
+        """
+        Test loading a binary dump as a SpaceSaving dist
+        """
+        dist = SpaceSaving(5, self.skewed(1000))
+        stream = BytesIO()
+        dist.dump_binary(stream)
+        stream.seek(0)
+
+        loaded = SpaceSaving.load_binary(stream, capacity=10)
+        self.assertEqual(loaded, dist)
+        self.assertEqual(loaded.capacity, 10)
+        self.assertEqual(loaded.N, dist.N)
+
+    def test_exact_under_capacity(self):
+        """
+        Test that counts are exact when the samples fit the capacity
+        """
+        data = list(random_characters(1000))
+        dist = SpaceSaving(len(LETTERS), data)
+        self.assertEqual(dist, FreqDist(data))
+        self.assertEqual(set(dist.errors.values()), {0})
+
+    def test_error_bound(self):
+        """
+        Test that counts overestimate by at most the error of the sample
+        """
+        data  = list(self.skewed(10000))
+        exact = Counter(data)
+        dist  = SpaceSaving(50, data)
+
+        for sample, count in dist.items():
+            self.assertLessEqual(exact[sample], count)
+            self.assertLessEqual(count - dist.errors[sample], exact[sample])
+            self.assertLessEqual(dist.errors[sample], dist.error_bound)
+
+        # Any sample more frequent than the error bound is retained
+        for sample, count in exact.items():
+            if count > dist.error_bound:
+                self.assertIn(sample, dist)
+
+    def test_merged_error_bound(self):
+        """
+        Test that merging approximate dists adds their error bounds
+        """
+        data  = list(self.skewed(10000))
+        left  = SpaceSaving(50, data[:5000])
+        right = SpaceSaving(50, data[5000:])
+
+        dist = SpaceSaving(50)
+        dist.update(left)
+        dist.update(right)
+
+        exact = Counter(data)
+        self.assertEqual(dist.N, 10000)
+        self.assertAlmostEqual(dist.error_bound, 10000.0 / 50 * 2)
+        for sample, count in dist.items():
+            self.assertLessEqual(count - dist.error_bound, exact[sample])
+
+    def test_pickle(self):
+        """
+        Test the serialization of the approximate dist
+        """
+        dist = SpaceSaving(20, self.skewed(1000))
+        data = pickle.loads(pickle.dumps(dist, pickle.HIGHEST_PROTOCOL))
+
+        self.assertEqual(data, dist)
+        self.assertEqual(data.capacity, 20)
+        self.assertEqual(data.errors, dist.errors)
+
+        # Counting continues with the same eviction behavior
+        for sample in self.skewed(1000):
+            data[sample] += 1
+            dist[sample] += 1
+        self.assertEqual(data, dist)
+
+
+##########################################################################
+## Dense Frequency Distribution Tests
+##########################################################################
+
+@unittest.skipIf(np is None, "numpy is required for a DenseFreqDist")
+class DenseFreqDistTests(unittest.TestCase):
+
+    def setUp(self):
+        self.samples = [random.randrange(50) for _ in range(2000)]
+        self.expected = FreqDist(self.samples)
+
+    def test_aggregates(self):
+        """
+        Test the dense aggregates match a FreqDist of the same samples
+        """
+        dist = DenseFreqDist(np.array(self.samples))
+        self.assertEqual(dist, self.expected)
+        self.assertEqual(dist.N, self.expected.N)
+        self.assertEqual(dist.B, self.expected.B)
+        self.assertEqual(dist.M, self.expected.M)
+
+        for sample in range(60):
+            self.assertEqual(dist[sample], self.expected[sample])
+            self.assertEqual(dist.freq(sample), self.expected.freq(sample))
+            self.assertEqual(dist.norm(sample), self.expected.norm(sample))
+
+    def test_update(self):
+        """
+        Test counting arrays, iterables, weights and mappings of samples
+        """
+        dist = DenseFreqDist()
+        dist.update(np.array(self.samples[:1000]))
+        dist.update(iter(self.samples[1000:]))
+        self.assertEqual(dist, self.expected)
+
+        dist.update([3, 4], weights=[10, 20])
+        dist.update({5: 30})
+        self.assertEqual(dist.N, self.expected.N + 60)
+        self.assertEqual(dist[5], self.expected[5] + 30)
+
+        dist.subtract({5: 30})
+        dist.subtract([3, 4], weights=[10, 20])
+        self.assertEqual(dist, self.expected)
+        self.assertEqual(dist.N, self.expected.N)
+
+    def test_grow(self):
+        """
+        Test the counts grow to hold larger samples
+        """
+        dist = DenseFreqDist([1, 2, 2])
+        dist[1000] += 5
+        dist.update([5000])
+
+        self.assertGreaterEqual(len(dist.counts), 5001)
+        self.assertEqual(dist.items(), [(1, 1), (2, 2), (1000, 5), (5000, 1)])
+        self.assertEqual((dist.N, dist.B, dist.M), (9, 4, 5))
+        self.assertEqual(dist.max(), 1000)
+
+        del dist[1000]
+        self.assertNotIn(1000, dist)
+        self.assertEqual((dist.N, dist.B, dist.M), (4, 3, 2))
+
+    def test_invalid_samples(self):
+        """
+        Test negative and non-integer samples are rejected
+        """
+        dist = DenseFreqDist()
+        with self.assertRaises(ValueError):
+            dist.update([1, -1])
+        with self.assertRaises(TypeError):
+            dist.update([1.5])
+        with self.assertRaises(ValueError):
+            dist[-1] = 3
+
+    def test_top(self):
+        """
+        Test the top samples are ordered by count then sample
+        """
+        dist = DenseFreqDist(np.array(self.samples))
+        ranked = sorted(self.expected.items(), key=lambda item: (-item[1], item[0]))
+
+        for k in (0, 1, 5, 49, 50, 100):
+            self.assertEqual(dist.top(k), ranked[:k])
+        self.assertEqual(dist.most_common(), ranked)
+        self.assertEqual(dist.max(), ranked[0][0])
+
+    def test_to_freqdist(self):
+        """
+        Test conversion to a FreqDist and copying
+        """
+        dist = DenseFreqDist(np.array(self.samples))
+        self.assertEqual(dist.to_freqdist(), self.expected)
+        self.assertEqual(dist.copy(), dist)
+        self.assertEqual(pickle.loads(pickle.dumps(dist)), dist)
+
+    def test_freqs_and_norms(self):
+        """
+        Test vectorized frequencies and norms of samples
+        """
+        dist = DenseFreqDist(np.array(self.samples))
+        samples = np.array([0, 10, 49, 50, 1000])
+
+        self.assertEqual(dist.freqs(samples).tolist(), [self.expected.freq(s) for s in samples.tolist()])
+        self.assertEqual(dist.norms(samples).tolist(), [self.expected.norm(s) for s in samples.tolist()])
+        self.assertEqual(dist.freqs().tolist(), [self.expected.freq(s) for s in dist])
+        self.assertEqual(dist.norms([]).tolist(), [])
+
+    def test_to_arrays(self):
+        """
+        Test exporting the samples with counts to parallel arrays
+        """
+        dist = DenseFreqDist([5, 1, 5, 9])
+        samples, counts = dist.to_arrays()
+        self.assertEqual(samples.tolist(), [1, 5, 9])
+        self.assertEqual(counts.tolist(), [1, 2, 1])
@@ -0,0 +1,298 @@
+# tests.store_tests
+# Test the columnar storage of extracted email meta data
+#
+# Author:   Tribe Contributors
+# Created:  Sun Oct 18 17:10:36 2026 -0400
+#
+# Copyright (C) 2026 District Data Labs
+# For license information, see LICENSE.txt
+#
+# ID: store_tests.py [] $
+
+"""
+Test the columnar storage of extracted email meta data
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+import networkx as nx
+
+from datetime import datetime
+from dateutil.tz import tzoffset, tzutc
+from tribe.extract import MBoxReader
+from tribe.emails import EmailMeta, EmailAddress
+from tribe.store import EmailStore, EmailCache, to_timestamp, from_timestamp, NO_DATE
+
+##########################################################################
+## Fixtures
+##########################################################################
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+MBOX     = os.path.join(FIXTURES, "test.mbox")
+
+
+class EmailStoreTests(unittest.TestCase):
+    """
+    Testing the columnar email meta data store.
+    """
+
+    def setUp(self):
+        self.emails = list(MBoxReader(MBOX, persist_index=False).extract())
+
+    def test_build(self):
+        """
+        Test the store iterates the extracted emails
+        """
+        store = EmailStore.build(self.emails)
+        self.assertEqual(len(store), len(self.emails))
+        self.assertEqual(list(store), self.emails)
+        self.assertEqual(store[-1], self.emails[-1])
+
+        with self.assertRaises(IndexError):
+            store[len(self.emails)]
+
+    def test_columns(self):
+        """
+        Test the columns of the store
+        """
+        email = EmailMeta(
+            EmailAddress("a@example.com"),
+            [EmailAddress("b@example.com"), EmailAddress("c@example.com")],
+            [EmailAddress("a@example.com")], None, None,
+        )
+        store = EmailStore.build([email, email._replace(recipients=[], subject="Hi")])
+
+        self.assertEqual(len(store.addresses), 3)
+        self.assertEqual(list(store.senders), [0, 0])
+        self.assertEqual(list(store.recipients), [1, 2])
+        self.assertEqual(list(store.rcpt_offsets), [0, 2, 2])
+        self.assertEqual(list(store.copied), [0, 0])
+        self.assertEqual(list(store.cc_offsets), [0, 1, 2])
+        self.assertEqual(list(store.subjects), [-1, 0])
+        self.assertEqual(list(store.dates), [NO_DATE, NO_DATE])
+        self.assertEqual(store[1].recipients, [])
+        self.assertEqual(store[1].subject, "Hi")
+
+    def test_timestamps(self):
+        """
+        Test dates are stored as microseconds since the epoch
+        """
+        dt = datetime(2014, 11, 15, 8, 55, 41, 12, tzinfo=tzoffset(None, -18000))
+        ts = to_timestamp(dt)
+        self.assertEqual(ts, 1416059741000012)
+        self.assertEqual(from_timestamp(ts), dt)
+        self.assertEqual(to_timestamp(datetime(1969, 12, 31, 23, 59, 59)), -1000000)
+        self.assertIsNone(from_timestamp(to_timestamp(None)))
+
+    def test_naive_dates(self):
+        """
+        Test naive dates are returned naive and aware dates aware
+        """
+        email = EmailMeta(EmailAddress("a@example.com"), [], [], None, None)
+        naive = datetime(2014, 11, 12, 10, 0, 0)
+        aware = datetime(2014, 11, 12, 10, 0, 0, tzinfo=tzoffset(None, -18000))
+        store = EmailStore.build([email._replace(date=naive), email._replace(date=aware), email])
+
+        self.assertEqual(list(store.naive), [1, 0, 0])
+        self.assertEqual(store[0].date, naive)
+        self.assertIsNone(store[0].date.tzinfo)
+        self.assertEqual(store[1].date, aware)
+        self.assertIsNotNone(store[1].date.tzinfo)
+        self.assertIsNone(store[2].date)
+        self.assertIsNone(from_timestamp(to_timestamp(naive), True).tzinfo)
+
+    def test_zoned_dates(self):
+        """
+        Test aware dates are returned in the time zone they were stored with
+        """
+        email = EmailMeta(EmailAddress("a@example.com"), [], [], None, None)
+        dates = [
+            datetime(2014, 11, 12, 21, 19, 51, tzinfo=tzoffset(None, -18000)),
+            datetime(2014, 11, 12, 21, 19, 51, tzinfo=tzoffset(None, 19800)),
+            datetime(2014, 11, 12, 21, 19, 51, tzinfo=tzutc()),
+        ]
+        store = EmailStore.build(email._replace(date=date) for date in dates)
+
+        self.assertEqual(list(store.zones), [-18000, 19800, 0])
+        for email, date in zip(store, dates):
+            self.assertEqual(email.date, date)
+            self.assertEqual(email.date.hour, 21)
+            self.assertEqual(email.date.utcoffset(), date.utcoffset())
+
+    def test_pickle(self):
+        """
+        Test the serialization of the store
+        """
+        store = EmailStore.build(self.emails)
+        data  = pickle.loads(pickle.dumps(store, pickle.HIGHEST_PROTOCOL))
+        self.assertEqual(list(data), self.emails)
+
+
+class CachedReader(MBoxReader):
+    """
+    An MBoxReader that counts the messages it parses.
+    """
+
+    parsed = 0
+
+    def iter_messages(self, start=0, stop=None, fields=None):
+        for msg in super(CachedReader, self).iter_messages(start, stop, fields):
+            self.parsed += 1
+            yield msg
+
+
+class BrokenMessage(object):
+    """
+    A message whose recipients cannot be read.
+    """
+
+    def get(self, name, default=None):
+        return "a@example.com"
+
+    def get_all(self, name, default=None):
+        raise ValueError("unreadable recipients")
+
+
+class FailingReader(MBoxReader):
+    """
+    An MBoxReader that fails to extract the tenth message.
+    """
+
+    def iter_messages(self, start=0, stop=None, fields=None):
+        messages = super(FailingReader, self).iter_messages(start, stop, fields)
+        for idx, msg in enumerate(messages, start):
+            yield BrokenMessage() if idx == 10 else msg
+
+
+class EmailCacheTests(unittest.TestCase):
+    """
+    Testing the memory mapped cache of extracted meta data.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path   = os.path.join(self.tmpdir, "test.mbox")
+        shutil.copyfile(MBOX, self.path)
+        self.emails = list(MBoxReader(MBOX, persist_index=False).extract())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_extract_cached(self):
+        """
+        Test that extraction writes and then loads the cache
+        """
+        reader = CachedReader(self.path, cache=True)
+        self.assertEqual(list(reader.extract()), self.emails)
+        self.assertEqual(reader.parsed, 140)
+        self.assertTrue(os.path.exists(EmailCache.sidecar(self.path)))
+
+        reader = CachedReader(self.path, cache=True)
+        self.assertEqual(list(reader.extract()), self.emails)
+        self.assertEqual(reader.parsed, 0)
+        self.assertEqual(reader.cursor, 140)
+        self.assertEqual(reader.profiler.cached, 140)
+
+        # Partial extractions do not use the cache
+        reader = CachedReader(self.path, cache=True)
+        self.assertEqual(list(reader.extract(100)), self.emails[100:])
+        self.assertEqual(reader.parsed, 40)
+
+    def test_cached_errors(self):
+        """
+        Test that errors are the same whether or not they were cached
+        """
+        reader = FailingReader(self.path, cache=True)
+        self.assertEqual(len(list(reader.extract())), 139)
+        self.assertEqual(reader.errors, {"unreadable recipients": 1})
+
+        reader = FailingReader(self.path, cache=True)
+        self.assertEqual(len(list(reader.extract())), 139)
+        self.assertEqual(reader.errors, {"unreadable recipients": 1})
+
+    def test_cached_dates(self):
+        """
+        Test cached naive and offset dates match those first extracted
+        """
+        with open(self.path, 'wb') as f:
+            f.write(b"From a@b Wed Nov 12 21:19:51 2014\nFrom: a@b\nTo: c@d\n"
+                    b"Date: 2014-11-12T21:19:51-05:00\n\n")
+            f.write(b"From a@b Wed Nov 12 10:00:00 2014\nFrom: a@b\nTo: c@d\n"
+                    b"Date: 2014-11-12 10:00:00\n\n")
+
+        cold = list(MBoxReader(self.path, cache=True).extract())
+        warm = CachedReader(self.path, cache=True)
+        self.assertEqual(list(warm.extract()), cold)
+        self.assertEqual(warm.parsed, 0)
+
+        dates = [email.date for email in cold]
+        self.assertEqual(dates[0].hour, 21)
+        self.assertEqual(dates[0].utcoffset().total_seconds(), -18000)
+        self.assertIsNone(dates[1].tzinfo)
+        for email, date in zip(warm.extract(), dates):
+            self.assertEqual((email.date.hour, email.date.utcoffset()), (date.hour, date.utcoffset()))
+
+    def test_cached_graph_extract(self):
+        """
+        Test that graphs extracted from the cache are identical
+        """
+        G = MBoxReader(self.path, cache=True).extract_graph()
+        H = MBoxReader(self.path, cache=True).extract_graph()
+        H.graph['extracted'] = G.graph['extracted']
+        self.assertEqual(
+            "\n".join(nx.generate_graphml(G)), "\n".join(nx.generate_graphml(H))
+        )
+
+    def test_invalid_cache(self):
+        """
+        Test that the cache is invalidated when the mbox changes
+        """
+        list(MBoxReader(self.path, cache=True).extract())
+        self.assertIsNotNone(EmailCache.open(self.path))
+
+        with open(self.path, 'ab') as f:
+            f.write(b"From a@b Sat Nov 15 08:55:41 2014\nFrom: a@b\nTo: c@d\n\n")
+        self.assertIsNone(EmailCache.open(self.path))
+
+        reader = CachedReader(self.path, cache=True)
+        self.assertEqual(len(list(reader.extract())), 141)
+        self.assertEqual(reader.parsed, 141)
+
+    def test_no_cache(self):
+        """
+        Test that the cache is not written unless caching is enabled
+        """
+        list(MBoxReader(self.path).extract())
+        self.assertFalse(os.path.exists(EmailCache.sidecar(self.path)))
+
+    def test_dump_and_load(self):
+        """
+        Test the serialization of the cache
+        """
+        stat  = os.stat(self.path)
+        cache = EmailCache(
+            self.path, EmailStore.build(self.emails), range(140), 140,
+            {ValueError("bad date"): 1}, stat.st_size, stat.st_mtime,
+        )
+        self.assertTrue(cache.save())
+
+        loaded = EmailCache.open(self.path)
+        self.assertEqual(list(loaded.store.naive), list(cache.store.naive))
+        self.assertEqual(list(loaded.store.zones), list(cache.store.zones))
+        self.assertEqual(len(loaded), 140)
+        self.assertEqual(loaded.count, 140)
+        self.assertEqual(loaded.errors, {"bad date": 1})
+        self.assertEqual([email for _, email in loaded], self.emails)
+        self.assertEqual(list(loaded.store.addresses), list(cache.store.addresses))
+
+        # Truncated caches cannot be loaded
+        with open(EmailCache.sidecar(self.path), 'r+b') as f:
+            f.truncate(200)
+        self.assertIsNone(EmailCache.open(self.path))
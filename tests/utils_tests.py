@@ -18,11 +18,15 @@ Testing for the utilities library in Tribe
 ##########################################################################
 
 import os
+import sys
+import shutil
+import tempfile
 import unittest
 
 from tribe.utils import *
 from datetime import datetime
 from dateutil import tz
+from email.utils import parsedate_tz, mktime_tz
 
 ##########################################################################
 ## Fixtures
@@ -124,6 +128,47 @@ class DateParsingTests(unittest.TestCase):
         """
         self.assertEqual(parse_date(STR_EMAIL_CASE_1), FIXTURE_UTC)
 
+    def test_fast_path(self):
+        """
+        Test the fast path matches the email utils parser
+        """
+        fixtures = (
+            STR_EMAIL_DATETIME,
+            STR_EMAIL_TZ_DATE,
+            STR_EMAIL_CASE_1,
+            '15 Nov 2014 08:55 -0500',
+            'Mon, 31 Feb 2014 25:61:61 +0530',
+        )
+
+        for fixture in fixtures:
+            dates = DateParser()
+            expected = datetime.utcfromtimestamp(mktime_tz(parsedate_tz(fixture)))
+            self.assertEqual(dates(fixture), expected.replace(tzinfo=TZ_UTC))
+            self.assertEqual(dates.counts['fast'], 1)
+
+        # The -0000 zone means local time and is left to the email parser
+        dates = DateParser()
+        dates('Sat, 15 Nov 2014 13:55:41 -0000')
+        self.assertEqual(dates.counts['email'], 1)
+
+    def test_date_counts(self):
+        """
+        Test the counts of the date parsing paths and cache
+        """
+        dates = DateParser()
+        for fixture in (STR_EMAIL_DATETIME, STR_EMAIL_DATETIME, STR_HUMAN_DATETIME, 'not a date'):
+            dates(fixture)
+
+        self.assertEqual(dates.counts['fast'], 1)
+        self.assertEqual(dates.counts['cached'], 1)
+        self.assertEqual(dates.counts['email'], 1)
+        self.assertEqual(dates.counts['dateutil'], 1)
+        self.assertEqual(dates.counts['failed'], 1)
+
+        # Failures are cached too
+        self.assertIsNone(dates('not a date'))
+        self.assertEqual(dates.counts['cached'], 2)
+
     def test_strfnow(self):
         """
         Test the strfnow function
@@ -140,8 +185,78 @@ class DateParsingTests(unittest.TestCase):
 
 class UtilityTests(unittest.TestCase):
 
+    def test_unquote(self):
+        """
+        Test unquoting nested quotes and angle brackets
+        """
+        fixtures = (
+            ('"jdoe@example.com"', 'jdoe@example.com'),
+            ('<jdoe@example.com>', 'jdoe@example.com'),
+            ('"<"jdoe@example.com">"', 'jdoe@example.com'),
+            ('"John Doe" <jdoe@example.com>', '"John Doe" <jdoe@example.com>'),
+            ('"John \\"Doe\\""', 'John "Doe"'),
+            ('"\\\\\\""', '\\"'),
+            ('"', '"'),
+            ('<>', ''),
+            ('', ''),
+        )
+
+        for fixture, expected in fixtures:
+            self.assertEqual(unquote(fixture), expected)
+
+    def test_unquote_deeply_nested(self):
+        """
+        Test unquoting more layers than the recursion limit
+        """
+        depth = sys.getrecursionlimit() * 2
+        self.assertEqual(unquote('"<' * depth + 'jdoe@example.com' + '>"' * depth), 'jdoe@example.com')
+
+    def test_lru_cache(self):
+        """
+        Test the least recently used cache
+        """
+        cache = LRUCache(2)
+        cache['a'] = 1
+        cache['b'] = 2
+        self.assertEqual(cache['a'], 1)
+
+        # The least recently used item is discarded
+        cache['c'] = 3
+        self.assertEqual(len(cache), 2)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+
+        with self.assertRaises(KeyError):
+            cache['b']
+
     def test_filesize(self):
         """
         Test the human readable filesize function
         """
         self.assertEqual(filesize(MBOX), "922.8KiB")
+
+    def test_atomic_dump(self):
+        """
+        Test a failed atomic dump leaves the previous file in place
+        """
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, "data.bin")
+            atomic_dump(path, lambda f: f.write(b"first"))
+
+            def interrupted(f):
+                f.write(b"partial")
+                raise KeyboardInterrupt("killed mid-write")
+
+            with self.assertRaises(KeyboardInterrupt):
+                atomic_dump(path, interrupted)
+
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), b"first")
+            self.assertEqual(os.listdir(tmpdir), ["data.bin"])
+
+            atomic_dump(path, lambda f: f.write(b"second"))
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), b"second")
+        finally:
+            shutil.rmtree(tmpdir)
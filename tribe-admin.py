@@ -22,12 +22,15 @@ import sys
 import json
 import tribe
 import argparse
-import networkx as nx
 
 from tribe.utils import timeit
 from tribe.utils import humanizedelta
 from tribe.viz import draw_social_network
+from tribe.config import settings
+from tribe.state import ExtractionState, CHECKPOINT_EXT
 from tribe.extract import ConsoleMBoxReader as MBoxReader
+from tribe.extract import FANOUT_POLICIES
+from tribe.export import read_graph, graph_info
 
 ##########################################################################
 ## Command Variables
@@ -36,6 +39,7 @@ from tribe.extract import ConsoleMBoxReader as MBoxReader
 DESCRIPTION = "An administrative utility for the Tribe Social Network Analysis"
 EPILOG      = "If there are any bugs or concerns, submit an issue on Github"
 VERSION     = "tribe v{}".format(tribe.__version__)
+FORMATS     = {"graphml": "GraphML", "npz": "Edge list", "csr": "Adjacency matrix"}
 
 ##########################################################################
 ## Commands
@@ -48,7 +52,7 @@ def header_analysis(args):
 
     @timeit
     def timed_inner(path):
-        reader  = MBoxReader(path)
+        reader  = MBoxReader(path, headers_only=args.headers_only)
         return reader.header_analysis()
 
     headers, seconds = timed_inner(args.mbox[0])
@@ -77,19 +81,59 @@ def count_emails(args):
 
 def extract(args):
     """
-    Extract a GraphML file from an MBox
+    Extract a GraphML (or npz edge list or adjacency matrix) file from an MBox
     """
 
     @timeit
     def timed_inner(path, outpath):
-        reader = MBoxReader(path)
-        G = reader.extract_graph()
-        nx.write_graphml(G, outpath)
-        return reader.errors
+        reader = MBoxReader(
+            path, headers_only=args.headers_only, approximate=args.approximate,
+            fanout=args.fanout, max_recipients=args.max_recipients,
+            cache=args.cache,
+        )
+
+        # Incremental extraction checkpoints to its persistent state file,
+        # other extractions only if resuming or given a checkpoint path.
+        state = None
+        checkpoint = args.checkpoint or ExtractionState.sidecar(path, CHECKPOINT_EXT)
+        if args.incremental:
+            state = ExtractionState.open(path, args.checkpoint)
+        elif args.resume:
+            state = ExtractionState.open(path, checkpoint)
+            print("Resuming extraction from byte {:,}".format(state.offset))
+        elif args.checkpoint:
+            state = ExtractionState(path, filename=checkpoint)
+
+        links, emails = reader.count_links(
+            workers=args.workers, state=state,
+            checkpoint=settings.extract.checkpoint,
+        )
+        if args.format == "npz":
+            reader.write_npz(outpath, links, emails)
+        elif args.format == "csr":
+            reader.write_sparse(outpath, links, emails)
+        else:
+            reader.write_graphml(outpath, links, emails)
+
+        # The checkpoint of a complete extraction is no longer needed
+        if args.incremental:
+            try:
+                state.save()
+            except (IOError, OSError) as e:
+                print("Could not save the extraction state: {}".format(e))
+        elif state is not None:
+            state.remove()
+        return reader
 
     print("Starting Graph extraction, a long running process")
-    errors, seconds = timed_inner(args.mbox[0], args.write)
-    print("GraphML written out to {}".format(args.write.name))
+    reader, seconds = timed_inner(args.mbox[0], args.write)
+    errors = reader.errors
+    print("{} written out to {}".format(FORMATS[args.format], args.write.name))
+
+    if args.profile:
+        reader.profiler.dump(args.profile)
+        print("\n{}\n".format(reader.profiler))
+        print("Profile written out to {}".format(args.profile.name))
 
     if errors:
         print("\nThe following errors were encountered:")
@@ -104,11 +148,10 @@ def extract(args):
 
 def info(args):
     """
-    Print information about a GraphML file
+    Print information about a GraphML or npz file
     """
     for idx, path in enumerate(args.graphml):
-        G = nx.read_graphml(path)
-        print(nx.info(G))
+        print(graph_info(path))
 
         if idx < len(args.graphml) - 1:
             print("----")
@@ -118,9 +161,9 @@ def info(args):
 
 def draw(args):
     """
-    Draw a GraphML with the tribe draw method.
+    Draw a GraphML or npz file with the tribe draw method.
     """
-    G = nx.read_graphml(args.graphml[0])
+    G = read_graph(args.graphml[0])
     draw_social_network(G, args.write)
     return ""
 
@@ -142,6 +185,7 @@ def main(*args):
     headers_parser = subparsers.add_parser('headers', help='Perform an analysis of the email headers in an MBox')
     headers_parser.add_argument('-w', '--write', type=argparse.FileType('w'), default=sys.stdout, help='Location to write data to')
     headers_parser.add_argument('-s', '--show', action='store_true', default=False, help='Show graph of key distribution')
+    headers_parser.add_argument('-H', '--headers-only', action='store_true', default=False, help='Skip reading and parsing message bodies')
     headers_parser.add_argument('mbox', type=str, nargs=1, help='Path or location to MBox for analysis')
     headers_parser.set_defaults(func=header_analysis)
 
@@ -153,18 +197,29 @@ def main(*args):
     # Extract Command
     extract_parser = subparsers.add_parser('extract', help='Extract a GraphML file from an MBox')
     extract_parser.add_argument('-w', '--write', type=argparse.FileType('wb'), default=sys.stdout, help='Location to write data to')
+    extract_parser.add_argument('-j', '--workers', type=int, default=1, help='Number of processes to extract the graph with')
+    extract_parser.add_argument('-H', '--headers-only', action='store_true', default=False, help='Skip reading and parsing message bodies')
+    extract_parser.add_argument('-i', '--incremental', action='store_true', default=False, help='Only process messages appended since the last incremental extraction')
+    extract_parser.add_argument('-a', '--approximate', type=int, default=None, metavar='K', help='Count at most K links approximately in fixed memory')
+    extract_parser.add_argument('-f', '--fanout', choices=FANOUT_POLICIES, default=settings.extract.fanout, help='How to link the people of broadcast messages')
+    extract_parser.add_argument('-m', '--max-recipients', type=int, default=settings.extract.max_recipients, metavar='N', help='Number of people that makes a message a broadcast')
+    extract_parser.add_argument('-F', '--format', choices=sorted(FORMATS), default='graphml', help='Write GraphML, an npz edge list or a sparse adjacency matrix')
+    extract_parser.add_argument('-p', '--profile', type=argparse.FileType('w'), default=None, metavar='PATH', help='Write a JSON report of the time spent in each stage')
+    extract_parser.add_argument('-r', '--resume', action='store_true', default=False, help='Resume an interrupted extraction from its last checkpoint')
+    extract_parser.add_argument('-C', '--cache', action='store_true', default=False, help='Load (or build in memory and save) the meta data cache next to the mbox')
+    extract_parser.add_argument('-c', '--checkpoint', type=str, default=None, metavar='PATH', help='Periodically save the extraction state to PATH (default next to the mbox with -r)')
     extract_parser.add_argument('mbox', type=str, nargs=1, help='Path or location to MBox for analysis')
     extract_parser.set_defaults(func=extract)
 
     # Graph Info Command
     info_parser = subparsers.add_parser('info', help='Print information about a GraphML file')
-    info_parser.add_argument('graphml', nargs="+", type=argparse.FileType('r'), help='Location of MBox(es) to get info for')
+    info_parser.add_argument('graphml', nargs="+", type=str, help='Location of GraphML or npz file(s) to get info for')
     info_parser.set_defaults(func=info)
 
     # Draw Command
     draw_parser = subparsers.add_parser('draw', help='Draw a GraphML using the tribe draw method')
     draw_parser.add_argument('-w', '--write', type=str, default=None, help='Location to draw to')
-    draw_parser.add_argument('graphml', nargs=1, type=argparse.FileType('r'), help='Location of GraphML to draw')
+    draw_parser.add_argument('graphml', nargs=1, type=str, help='Location of GraphML or npz file to draw')
     draw_parser.set_defaults(func=draw)
 
     # Handle input from the command line
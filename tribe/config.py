@@ -24,12 +24,27 @@ import confire
 ## Configuration
 ##########################################################################
 
+class ExtractConfiguration(confire.Configuration):
+    """
+    Settings for the extraction of graphs from an MBox.
+
+    checkpoint:      messages between saves of the extraction state (0 disables)
+    fanout:          how to link messages with many people (all, cap, star, skip)
+    max_recipients:  the number of people that makes a message a broadcast
+    """
+
+    checkpoint     = 10000
+    fanout         = "all"
+    max_recipients = 100
+
+
 class TribeConfiguration(confire.Configuration):
     """
     Meaningful defaults and required configurations.
 
     debug:    the app will print or log debug statements
     testing:  the app will not overwrite important resources
+    extract:  settings for the extraction of graphs from an MBox
     """
 
     CONF_PATHS = [
@@ -40,6 +55,7 @@ class TribeConfiguration(confire.Configuration):
 
     debug    = True
     testing  = True
+    extract  = ExtractConfiguration()
 
 
 ## Load settings immediately for import
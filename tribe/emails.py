@@ -17,9 +17,10 @@ Data Structures for Email and EmailAddresses
 ## Imports
 ##########################################################################
 
+from weakref import WeakValueDictionary
 from collections import namedtuple
 from email.utils import parseaddr, formataddr
-from tribe.utils import unquote
+from tribe.utils import unquote, LRUCache
 
 # 2 to 3 compatibility
 from six import string_types
@@ -42,25 +43,80 @@ EmailMeta   = namedtuple("EmailMeta", META_FIELDS)
 ## Email Parser
 ##########################################################################
 
+ADDRESS_CACHE_SIZE = 8192  # Distinct raw addresses to keep parsed results for
+
+
 class EmailAddress(object):
     """
     Implements a simple email parser for storing email data where an email
     is represented as follows: John Doe <jdoe@example.com>.
+
+    Email addresses are immutable and interned: parsing the same raw address
+    again returns the cached instance, and all addresses with an equal name
+    and email are the same object for as long as any of them is referenced.
     """
 
-    __slots__ = ('name', 'email')
+    __slots__ = ('name', 'email', '__weakref__')
 
-    def __init__(self, email):
+    # Parsed addresses keyed by the raw address, and the pool of instances
+    _cache = LRUCache(ADDRESS_CACHE_SIZE)
+    _pool  = WeakValueDictionary()
+
+    def __new__(klass, email):
         """
         The email can be either a parsed tuple of (name, addr) pairs or it
         might be a single string that requires parsing for RFC components.
         """
+        if not isinstance(email, string_types):
+            email = tuple(email)
+
+        key = (klass, email)
+        try:
+            return klass._cache[key]
+        except KeyError:
+            pass
 
         if isinstance(email, string_types):
             email = parseaddr(unquote(email))
 
-        self.name, self.email  = (unquote(part) for part in email)
-        self.email = self.email.lower() # Lowercase the email for normalization
+        name, addr = (unquote(part) for part in email)
+        addr = addr.lower() # Lowercase the email for normalization
+
+        # Return the pooled instance of an equal address if there is one
+        parts = (klass, name, addr)
+        instance = klass._pool.get(parts)
+        if instance is None:
+            instance = super(EmailAddress, klass).__new__(klass)
+            object.__setattr__(instance, 'name', name)
+            object.__setattr__(instance, 'email', addr)
+            klass._pool[parts] = instance
+
+        klass._cache[key] = instance
+        return instance
+
+    def __setattr__(self, name, value):
+        raise AttributeError("EmailAddress is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("EmailAddress is immutable")
+
+    def __reduce__(self):
+        # Unpickled addresses are interned from their parts
+        return self.__class__, ((self.name, self.email),)
+
+    def __eq__(self, other):
+        if not isinstance(other, EmailAddress):
+            return NotImplemented
+        return (self.name, self.email) == (other.name, other.email)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    def __hash__(self):
+        return hash((self.name, self.email))
 
     @property
     def domain(self):
@@ -73,3 +129,70 @@ class EmailAddress(object):
 
     def __str__(self):
         return text(formataddr((self.name, self.email)))
+
+
+##########################################################################
+## Address Interning
+##########################################################################
+
+LINK_BITS = 32                      # Bits per address id in a packed link
+LINK_MASK = (1 << LINK_BITS) - 1    # Mask of the target id in a packed link
+
+
+class AddressTable(object):
+    """
+    Interns normalized email addresses as dense integer ids (in the order
+    they are first seen) so that data structures keyed by addresses can hold
+    small integers rather than references to many copies of the strings.
+    """
+
+    def __init__(self, addresses=None):
+        self.ids = {}
+        self.addresses = []
+
+        for address in addresses or []:
+            self.add(address)
+
+    def add(self, address):
+        """
+        Returns the id of the address, assigning the next id if it is new.
+        """
+        try:
+            return self.ids[address]
+        except KeyError:
+            idx = self.ids[address] = len(self.addresses)
+            self.addresses.append(address)
+            return idx
+
+    def __getitem__(self, idx):
+        return self.addresses[idx]
+
+    def __contains__(self, address):
+        return address in self.ids
+
+    def __len__(self):
+        return len(self.addresses)
+
+    def __iter__(self):
+        return iter(self.addresses)
+
+    def __getstate__(self):
+        # The ids are rebuilt from the addresses when unpickled
+        return self.addresses
+
+    def __setstate__(self, addresses):
+        self.__init__(addresses)
+
+
+def pack_link(source, target):
+    """
+    Packs a pair of address ids into a single integer key.
+    """
+    return (source << LINK_BITS) | target
+
+
+def unpack_link(link):
+    """
+    Unpacks an integer key into the pair of address ids it was packed from.
+    """
+    return link >> LINK_BITS, link & LINK_MASK
@@ -0,0 +1,517 @@
+# tribe.export
+# Streaming export of the email network to graph file formats.
+#
+# Author:   Tribe Contributors
+# Created:  Sun Oct 18 18:05:19 2026 -0400
+#
+# Copyright (C) 2026 District Data Labs
+# For license information, see LICENSE.txt
+#
+# ID: export.py [] $
+
+"""
+Streaming export of the email network to graph file formats. Rather than
+building a networkx Graph (and an ElementTree of the whole document) before
+anything is written, the writers emit each node and edge to the output as
+they are generated from the link counts.
+
+The network can also be exported as a compact binary edge list (a NumPy npz
+archive of a node table and edge arrays) that loads far faster than GraphML,
+or as a SciPy sparse adjacency matrix for linear algebra and spectral work.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import json
+import zipfile
+import networkx as nx
+
+from six import string_types, integer_types
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import scipy.sparse as sp
+except ImportError:
+    sp = None
+
+
+##########################################################################
+## Module Constants
+##########################################################################
+
+XML_DECLARATION = "<?xml version='1.0' encoding='utf-8'?>\n"
+GRAPHML_ELEMENT = (
+    '<graphml xmlns="http://graphml.graphdrawing.org/xmlns" '
+    'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+    'xsi:schemaLocation="http://graphml.graphdrawing.org/xmlns '
+    'http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd">\n'
+)
+
+# The names and types of the properties of each edge of the email network
+EDGE_ATTRIBUTES = (("weight", float), ("count", int), ("norm", float))
+
+NPZ_VERSION = 1     # Bump when the arrays of the npz edge list change
+
+
+##########################################################################
+## GraphML Writer
+##########################################################################
+
+class GraphMLWriter(object):
+    """
+    Writes an undirected graph to a binary stream as GraphML, one element
+    at a time. The document is read by nx.read_graphml as the same graph
+    that nx.write_graphml would write. Because nothing is buffered, the
+    types of the edge attributes must be declared up front (edge_attributes
+    is a sequence of name, type pairs) and the graph attributes are written
+    before the nodes and edges.
+    """
+
+    def __init__(self, stream, edge_attributes=EDGE_ATTRIBUTES, encoding='utf-8'):
+        stream = binary_stream(stream)
+
+        self.stream   = stream
+        self.encoding = encoding
+        self.edge_attributes = edge_attributes
+        self.keys = 0
+
+    def write(self, attributes, nodes, edges):
+        """
+        Writes the graph attributes (a dict), the nodes (an iterable of ids)
+        and the edges (an iterable of source, target, data triples).
+        """
+        self.emit(XML_DECLARATION)
+        self.emit(GRAPHML_ELEMENT)
+
+        # Declare the keys of the graph and edge attributes
+        graph_keys = {}
+        for name, value in attributes.items():
+            graph_keys[name] = self.write_key("graph", name, graphml_type(type(value)))
+
+        edge_keys = []
+        for name, kind in self.edge_attributes:
+            edge_keys.append((name, self.write_key("edge", name, graphml_type(kind))))
+
+        self.emit('  <graph edgedefault="undirected">\n')
+        for name, value in attributes.items():
+            self.emit('    <data key="{}">{}</data>\n'.format(
+                graph_keys[name], escape_text(format_value(value))
+            ))
+
+        for node in nodes:
+            self.emit('    <node id={} />\n'.format(escape_attribute(node)))
+
+        for source, target, data in edges:
+            self.emit('    <edge source={} target={}>\n'.format(
+                escape_attribute(source), escape_attribute(target)
+            ))
+            for name, key in edge_keys:
+                if name in data:
+                    self.emit('      <data key="{}">{}</data>\n'.format(
+                        key, escape_text(format_value(data[name]))
+                    ))
+            self.emit('    </edge>\n')
+
+        self.emit('  </graph>\n')
+        self.emit('</graphml>\n')
+
+    def write_key(self, domain, name, kind):
+        """
+        Declares a key for an attribute and returns the id of the key.
+        """
+        key = "d{}".format(self.keys)
+        self.keys += 1
+        self.emit('  <key id="{}" for="{}" attr.name={} attr.type="{}" />\n'.format(
+            key, domain, escape_attribute(name), kind
+        ))
+        return key
+
+    def emit(self, data):
+        self.stream.write(data.encode(self.encoding))
+
+
+def write_graphml(stream, attributes, nodes, edges, edge_attributes=EDGE_ATTRIBUTES):
+    """
+    Writes a graph to the stream (or the file at the given path) as GraphML.
+    """
+    if isinstance(stream, string_types):
+        with open(stream, 'wb') as f:
+            return write_graphml(f, attributes, nodes, edges, edge_attributes)
+
+    GraphMLWriter(stream, edge_attributes).write(attributes, nodes, edges)
+
+
+##########################################################################
+## Binary Edge List
+##########################################################################
+
+class EdgeList(object):
+    """
+    The email network as a table of node labels and parallel arrays of the
+    source and target node numbers and the weight, count and norm of each
+    edge, which are saved as a (compressed) NumPy npz archive. The node
+    labels are stored as UTF-8 bytes with offsets so that the archive can be
+    loaded without pickle. Requires numpy.
+    """
+
+    @classmethod
+    def load(klass, path):
+        """
+        Loads an edge list from an npz archive at path (or a binary stream).
+        """
+        require_numpy()
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['version']) != NPZ_VERSION or 'sources' not in data:
+                raise ValueError("unknown npz edge list format")
+
+            return klass(
+                json.loads(str(data['attributes'])),
+                unpack_labels(data['node_data'], data['node_offsets']),
+                data['sources'], data['targets'],
+                data['weight'], data['count'], data['norm'],
+            )
+
+    def __init__(self, attributes, nodes, sources, targets, weights, counts, norms):
+        self.attributes = attributes
+        self.nodes   = nodes
+        self.sources = sources
+        self.targets = targets
+        self.weights = weights
+        self.counts  = counts
+        self.norms   = norms
+
+    def number_of_nodes(self):
+        return len(self.nodes)
+
+    def number_of_edges(self):
+        return len(self.sources)
+
+    def save(self, path, compressed=True):
+        """
+        Writes the edge list to an npz archive at path (or a binary stream).
+        """
+        require_numpy()
+
+        path = binary_stream(path)
+
+        labels, offsets = pack_labels(self.nodes)
+        savez = np.savez_compressed if compressed else np.savez
+        savez(
+            path,
+            version=np.array(NPZ_VERSION),
+            attributes=np.array(json.dumps(self.attributes)),
+            node_offsets=offsets, node_data=labels,
+            sources=self.sources, targets=self.targets,
+            weight=self.weights, count=self.counts, norm=self.norms,
+        )
+
+    def edges(self):
+        """
+        Yields the (source, target, data) of every edge by node label.
+        """
+        nodes = self.nodes
+        columns = (
+            self.sources.tolist(), self.targets.tolist(),
+            self.weights.tolist(), self.counts.tolist(), self.norms.tolist(),
+        )
+
+        for source, target, weight, count, norm in zip(*columns):
+            yield nodes[source], nodes[target], {
+                "weight": weight, "count": count, "norm": norm,
+            }
+
+    def to_graph(self):
+        """
+        Builds the networkx Graph of the edge list.
+        """
+        G = nx.Graph(**self.attributes)
+        G.add_nodes_from(self.nodes)
+        G.add_edges_from(self.edges())
+        return G
+
+    def info(self):
+        """
+        Returns a summary of the graph without building it.
+        """
+        return summarize(
+            self.attributes.get("name", ""), "Graph",
+            self.number_of_nodes(), self.number_of_edges(),
+        )
+
+    def __repr__(self):
+        return "<EdgeList of {} nodes and {} edges>".format(
+            self.number_of_nodes(), self.number_of_edges()
+        )
+
+
+##########################################################################
+## Sparse Adjacency Matrix
+##########################################################################
+
+class AdjacencyMatrix(object):
+    """
+    The email network as a symmetric SciPy sparse (CSR) adjacency matrix of
+    one edge property (by default the count) with the node label of every
+    row. The npz archive it is saved as can also be read by
+    scipy.sparse.load_npz, which ignores the node table. Requires scipy.
+    """
+
+    @classmethod
+    def load(klass, path):
+        """
+        Loads an adjacency matrix from an npz archive at path (or a stream).
+        """
+        require_scipy()
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['version']) != NPZ_VERSION or 'indptr' not in data:
+                raise ValueError("unknown npz adjacency matrix format")
+
+            matrix = sp.csr_matrix(
+                (data['data'], data['indices'], data['indptr']),
+                shape=tuple(data['shape']),
+            )
+
+            return klass(
+                json.loads(str(data['attributes'])),
+                unpack_labels(data['node_data'], data['node_offsets']),
+                matrix, str(data['weight']),
+            )
+
+    def __init__(self, attributes, nodes, matrix, weight="count"):
+        self.attributes = attributes
+        self.nodes  = nodes
+        self.matrix = matrix
+        self.weight = weight
+
+    def number_of_nodes(self):
+        return len(self.nodes)
+
+    def number_of_edges(self):
+        # Every edge off the diagonal is stored twice
+        loops = int(np.count_nonzero(self.matrix.diagonal()))
+        return (self.matrix.nnz - loops) // 2 + loops
+
+    def save(self, path, compressed=True):
+        """
+        Writes the adjacency matrix to an npz archive at path (or a stream).
+        """
+        require_scipy()
+
+        path = binary_stream(path)
+
+        matrix = self.matrix.tocsr()
+        labels, offsets = pack_labels(self.nodes)
+        savez = np.savez_compressed if compressed else np.savez
+        savez(
+            path,
+            version=np.array(NPZ_VERSION),
+            attributes=np.array(json.dumps(self.attributes)),
+            node_offsets=offsets, node_data=labels,
+            weight=np.array(self.weight),
+            format=np.array(b"csr"), shape=np.array(matrix.shape),
+            data=matrix.data, indices=matrix.indices, indptr=matrix.indptr,
+        )
+
+    def edges(self):
+        """
+        Yields the (source, target, data) of every edge by node label.
+        """
+        nodes  = self.nodes
+        upper  = sp.triu(self.matrix).tocoo()
+        for source, target, value in zip(upper.row.tolist(), upper.col.tolist(), upper.data.tolist()):
+            yield nodes[source], nodes[target], {self.weight: value}
+
+    def to_graph(self):
+        """
+        Builds the networkx Graph of the adjacency matrix.
+        """
+        G = nx.Graph(**self.attributes)
+        G.add_nodes_from(self.nodes)
+        G.add_edges_from(self.edges())
+        return G
+
+    def info(self):
+        """
+        Returns a summary of the graph without building it.
+        """
+        return summarize(
+            self.attributes.get("name", ""), "Graph",
+            self.number_of_nodes(), self.number_of_edges(),
+        )
+
+    def __repr__(self):
+        return "<AdjacencyMatrix of {} nodes and {} edges>".format(
+            self.number_of_nodes(), self.number_of_edges()
+        )
+
+
+##########################################################################
+## Binary Format Functions
+##########################################################################
+
+def write_npz(stream, attributes, nodes, sources, targets, weights, counts, norms):
+    """
+    Writes a graph to the stream (or the file at the given path) as an npz
+    edge list, where sources and targets are numbers of nodes in the list.
+    """
+    EdgeList(attributes, nodes, sources, targets, weights, counts, norms).save(stream)
+
+
+def write_sparse(stream, attributes, nodes, matrix, weight="count"):
+    """
+    Writes a graph to the stream (or the file at the given path) as an npz
+    sparse adjacency matrix whose rows and columns are the nodes in order.
+    """
+    AdjacencyMatrix(attributes, nodes, matrix, weight).save(stream)
+
+
+def load_archive(path):
+    """
+    Loads either an npz edge list or adjacency matrix from the path.
+    """
+    require_numpy()
+    with np.load(path, allow_pickle=False) as data:
+        sparse = 'indptr' in data
+
+    if sparse:
+        return AdjacencyMatrix.load(path)
+    return EdgeList.load(path)
+
+
+def read_graph(path):
+    """
+    Reads a graph from an npz edge list or adjacency matrix or a GraphML file.
+    """
+    if zipfile.is_zipfile(path):
+        return load_archive(path).to_graph()
+    return nx.read_graphml(path)
+
+
+def graph_info(path):
+    """
+    Returns a summary of the graph in an npz edge list or adjacency matrix or
+    a GraphML file. The npz archives are summarized from their arrays without
+    building the graph.
+    """
+    if zipfile.is_zipfile(path):
+        return load_archive(path).info()
+
+    G = nx.read_graphml(path)
+    return summarize(
+        G.graph.get("name", ""), type(G).__name__,
+        G.number_of_nodes(), G.number_of_edges(),
+    )
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+def require_numpy():
+    """
+    Raises an ImportError if numpy (required for binary formats) is missing.
+    """
+    if np is None:
+        raise ImportError("numpy is required to read or write npz edge lists")
+
+
+def require_scipy():
+    """
+    Raises an ImportError if scipy (required for sparse matrices) is missing.
+    """
+    if sp is None or np is None:
+        raise ImportError("scipy is required to read or write sparse matrices")
+
+
+def binary_stream(stream):
+    """
+    Returns the binary buffer of a text stream (e.g. sys.stdout), flushing
+    it first, so that it can be written to; other streams and paths are
+    returned as they are.
+    """
+    if hasattr(stream, 'buffer'):
+        stream.flush()
+        return stream.buffer
+    return stream
+
+
+def pack_labels(nodes):
+    """
+    Encodes node labels as a UTF-8 byte array and the offsets of each label,
+    so that they can be stored in an npz archive without pickle.
+    """
+    labels  = [node.encode('utf-8', 'surrogateescape') for node in nodes]
+    offsets = np.zeros(len(labels) + 1, dtype=np.int64)
+    np.cumsum([len(label) for label in labels], out=offsets[1:])
+    return np.frombuffer(b"".join(labels), dtype=np.uint8), offsets
+
+
+def unpack_labels(data, offsets):
+    """
+    Decodes the node labels encoded by pack_labels.
+    """
+    labels  = data.tobytes()
+    offsets = offsets.tolist()
+    return [
+        labels[offsets[idx]:offsets[idx+1]].decode('utf-8', 'surrogateescape')
+        for idx in range(len(offsets) - 1)
+    ]
+
+
+def summarize(name, kind, nodes, edges):
+    """
+    Formats a summary of an undirected graph as networkx 1.x info did.
+    """
+    lines = [
+        "Name: {}".format(name),
+        "Type: {}".format(kind),
+        "Number of nodes: {}".format(nodes),
+        "Number of edges: {}".format(edges),
+    ]
+    if nodes > 0:
+        lines.append("Average degree: {:>8.4f}".format(2.0 * edges / nodes))
+    return "\n".join(lines)
+
+
+def graphml_type(kind):
+    """
+    Returns the GraphML attribute type of a Python type as networkx would.
+    """
+    if issubclass(kind, bool):
+        return "boolean"
+    if issubclass(kind, integer_types):
+        return "long"
+    if issubclass(kind, float):
+        return "double"
+    return "string"
+
+
+def format_value(value):
+    """
+    Formats an attribute value as networkx would.
+    """
+    if isinstance(value, bool):
+        return str(value).lower()
+    return u"{}".format(value)
+
+
+def escape_text(text):
+    """
+    Escapes the text content of an element as ElementTree does.
+    """
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def escape_attribute(text):
+    """
+    Quotes and escapes an attribute value as ElementTree does.
+    """
+    text = escape_text(u"{}".format(text)).replace('"', "&quot;")
+    text = text.replace("\r", "&#13;").replace("\n", "&#10;").replace("\t", "&#09;")
+    return u'"{}"'.format(text)
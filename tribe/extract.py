@@ -20,35 +20,172 @@ file format (which is suitable to use with Gephi, Neo4j etc)
 
 import networkx as nx
 
-from mailbox import mbox
-from tribe.stats import FreqDist
-from itertools import combinations
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import scipy.sparse as sp
+except ImportError:
+    sp = None
+
+from tribe.stats import FreqDist, SpaceSaving
+from tribe.index import MBoxIndex
+from tribe.scanner import MBoxScanner
+from tribe.state import Checkpoint
+from tribe.store import EmailStore, EmailCache, OFFSET_TYPE
+from tribe.export import write_graphml, write_npz, write_sparse
+from tribe.export import require_numpy, require_scipy
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from itertools import combinations, islice
+from multiprocessing import Pool
 from email.utils import getaddresses
 from tribe.emails import EmailMeta, EmailAddress
+from tribe.emails import AddressTable, pack_link, unpack_link
+from tribe.emails import LINK_BITS, LINK_MASK
 from tribe.progress import AsyncProgress as Progress
+from tribe.instrument import Profiler, clock
+from tribe.instrument import READING, HEADERS, ADDRESSES, DATES, PAIRS, GRAPH
 from tribe.utils import parse_date, strfnow, filesize
 
 
+##########################################################################
+## Module Constants
+##########################################################################
+
+# The only headers (lowercase) that are used to extract email meta data
+EXTRACT_FIELDS = frozenset((
+    b'from', b'to', b'cc', b'resent-to', b'resent-cc', b'subject', b'date',
+))
+
+# Policies for linking the people of broadcast messages (see relationships)
+FANOUT_ALL  = "all"     # Link every pair of people on the message
+FANOUT_CAP  = "cap"     # Only link the sender and the first recipients
+FANOUT_STAR = "star"    # Only link the sender to each recipient
+FANOUT_SKIP = "skip"    # Do not link anyone on the message
+
+FANOUT_POLICIES = (FANOUT_ALL, FANOUT_CAP, FANOUT_STAR, FANOUT_SKIP)
+
+# Edges to compute the properties of at a time when generating the graph
+EDGE_CHUNK = 65536
+
+
 ##########################################################################
 ## MBoxReader
 ##########################################################################
 
 class MBoxReader(object):
 
-    def __init__(self, path):
+    def __init__(self, path, index=None, persist_index=True, headers_only=False,
+                 approximate=None, fanout=FANOUT_ALL, max_recipients=None,
+                 cache=False):
         self.path  = path
-        self.mbox  = mbox(path)
 
-        # Track errors through extraction process
+        # Only read and parse the header block of each message if specified
+        self.headers_only = headers_only
+
+        # Count at most this many links (approximately) in fixed memory
+        self.approximate = approximate
+
+        # How to link the people of messages with more than max_recipients
+        if fanout not in FANOUT_POLICIES:
+            raise ValueError("unknown fanout policy '{}'".format(fanout))
+        if fanout != FANOUT_ALL and not max_recipients:
+            raise ValueError("the {} fanout policy requires max_recipients".format(fanout))
+        self.fanout = fanout
+        self.max_recipients = max_recipients
+
+        # Store the message offset index next to the MBox by default
+        self.persist_index = persist_index
+        self._index = index
+
+        # Only cache the extracted meta data next to the MBox if specified,
+        # since the cache is built in memory from the meta data of every email
+        self.cache = cache
+
+        # Track errors (by message, so that the errors of cached, parallel and
+        # resumed extractions are the same) and the next message to process
         self.errors = FreqDist()
+        self.cursor = 0
+
+        # Interned email addresses of the links
+        self.addresses = AddressTable()
+
+        # Time spent in each stage of extraction
+        self.profiler = Profiler()
+
+    @property
+    def index(self):
+        """
+        The byte offsets of every message in the MBox, loaded from the index
+        sidecar file if it is valid, otherwise computed with a single scan.
+        """
+        if self._index is None:
+            self._index = MBoxIndex.open(self.path, persist=self.persist_index)
+        return self._index
+
+    def reindex(self):
+        """
+        Rescans the MBox for message boundaries, replacing the offset index.
+        """
+        self._index = MBoxIndex.open(
+            self.path, persist=self.persist_index, refresh=True
+        )
 
     def __iter__(self):
-        for msg in self.mbox:
-            yield msg
+        return self.iter_messages()
 
     def __len__(self):
         return self.count()
 
+    def __getitem__(self, idx):
+        return self.get_message(idx)
+
+    def iter_messages(self, start=0, stop=None, fields=None):
+        """
+        Yields the messages numbered start through stop (exclusive) from the
+        memory mapped MBox using the offset index. In headers only mode, the
+        message bodies are never read or parsed, and if fields is given, only
+        those headers (lowercase bytes) are parsed.
+        """
+        starts = self.index.starts[start:stop]
+        stops  = self.index.stops[start:stop]
+
+        # Time copying the bytes and parsing the headers of each message
+        profiler = self.profiler
+        seconds  = profiler.seconds
+
+        with MBoxScanner(self.path) as scanner:
+            for begin, end in zip(starts, stops):
+                started = clock()
+                if self.headers_only:
+                    raw = scanner.raw_headers(begin, end, fields)
+                else:
+                    raw = scanner.raw_message(begin, end)
+
+                read = clock()
+                msg  = scanner.parse(*raw)
+                seconds[READING] += read - started
+                seconds[HEADERS] += clock() - read
+
+                profiler.messages += 1
+                profiler.bytes += end - begin
+                yield msg
+
+    def get_message(self, idx):
+        """
+        Random access to the message numbered idx from the memory mapped MBox.
+        """
+        begin, end = self.index[idx]
+
+        with MBoxScanner(self.path) as scanner:
+            if self.headers_only:
+                return scanner.headers(begin, end)
+            return scanner.message(begin, end)
+
     def header_analysis(self):
         """
         Performs an analysis of the frequency of headers in the Mbox
@@ -63,49 +200,143 @@ class MBoxReader(object):
 
     def count(self):
         """
-        Returns the number of emails in the MBox
+        Returns the number of emails in the MBox from the offset index
         """
-        return sum(1 for msg in self)
+        return len(self.index)
 
-    def extract(self):
+    def extract(self, start=0, stop=None):
+        """
+        Extracts the meta data from the MBox (or from the messages numbered
+        start through stop).
+
+        If caching is enabled, the meta data of a full extraction is loaded
+        from the cache file next to the MBox if it is still valid, otherwise
+        it is written to the cache once all messages have been extracted.
+        Caching is off by default: building the cache holds the meta data of
+        every email in memory, unlike streaming (e.g. approximate) extraction.
         """
-        Extracts the meta data from the MBox
+        if not self.cache or start != 0 or stop is not None:
+            for email in self.extract_messages(start, stop):
+                yield email
+            return
+
+        cache = EmailCache.open(self.path)
+        if cache is not None:
+            self.errors.update(cache.errors)
+
+            # Loading cached meta data replaces reading and parsing messages
+            profiler = self.profiler
+            started  = clock()
+            for self.cursor, email in cache:
+                profiler.seconds[READING] += clock() - started
+                profiler.messages += 1
+                profiler.cached   += 1
+                self.cursor += 1
+                yield email
+                started = clock()
+
+            profiler.bytes += cache.size
+            self.cursor = cache.count
+            return
+
+        # Record the extracted meta data (and extraction errors) as we go
+        index    = self.index
+        store    = EmailStore()
+        messages = array(OFFSET_TYPE)
+        errors   = FreqDist()
+
+        for email in self.extract_messages(errors=errors):
+            store.append(email)
+            messages.append(self.cursor - 1)
+            yield email
+
+        EmailCache(
+            self.path, store, messages, len(index), errors,
+            index.size, index.mtime,
+        ).save()
+
+    def extract_messages(self, start=0, stop=None, errors=None):
+        """
+        Parses the meta data of the messages numbered start through stop,
+        also counting the errors that occur in errors if given.
         """
 
         def parse(msg):
             """
             Inner function that knows how to extract an EmailMeta
             """
-            source = msg.get('From', '')
-            if not source: return None
+            started = clock()
+            source  = msg.get('From', '')
+            if not source:
+                seconds[HEADERS] += clock() - started
+                return None
 
             tos = msg.get_all('To', []) + msg.get_all('Resent-To', [])
             ccs = msg.get_all('Cc', []) + msg.get_all('Resent-Cc', [])
+            subject = msg.get('Subject', '').strip() or None
+            date    = msg.get('Date', '').strip() or None
+            headers = clock()
+
+            sender     = EmailAddress(source)
+            recipients = [EmailAddress(to) for to in getaddresses(tos)]
+            copied     = [EmailAddress(cc) for cc in getaddresses(ccs)]
+            addresses  = clock()
+
+            date = parse_date(date)
+            seconds[HEADERS]   += headers - started
+            seconds[ADDRESSES] += addresses - headers
+            seconds[DATES]     += clock() - addresses
 
             # construct data output
-            return EmailMeta(
-                EmailAddress(source),
-                [EmailAddress(to) for to in getaddresses(tos)],
-                [EmailAddress(cc) for cc in getaddresses(ccs)],
-                msg.get('Subject', '').strip() or None,
-                parse_date(msg.get('Date', '').strip() or None),
-            )
+            return EmailMeta(sender, recipients, copied, subject, date)
+
+        seconds = self.profiler.seconds
+        dates   = parse_date.counts.copy()
 
         # Iterate through all messages in self, tracking errors
         # Catch any exceptions and record them, then move forward
         # NOTE: This will allow the progress bar to work
-        for msg in self:
-            try:
-                email = parse(msg)
-                if email is not None:
-                    yield email
-            except Exception as e:
-                self.errors[e] += 1
-                continue
+        # NOTE: cursor is the number of the next message to be processed
+        messages = self.iter_messages(start, stop, EXTRACT_FIELDS)
+        try:
+            for self.cursor, msg in enumerate(messages, start+1):
+                try:
+                    email = parse(msg)
+                    if email is not None:
+                        yield email
+                except Exception as e:
+                    self.errors[str(e)] += 1
+                    if errors is not None:
+                        errors[str(e)] += 1
+                    continue
+        finally:
+            # Record how the dates of these messages were parsed
+            self.profiler.dates.update(parse_date.counts - dates)
+
+    def link_counter(self):
+        """
+        Returns an empty FreqDist to count links with, or a SpaceSaving dist
+        that only counts the approximate number of links in fixed memory if
+        the reader is approximate.
+        """
+        if self.approximate:
+            return SpaceSaving(self.approximate)
+        return FreqDist()
 
-    def extract_graph(self):
+    def extract_links(self, start=0, stop=None, checkpoint=None):
         """
-        Extracts a Graph where the nodes are EmailAddress
+        Counts the number of emails each pair of email addresses appears on
+        together, returning the link counts and the number of emails. Links
+        are keyed by the ids of the pair of addresses in self.addresses
+        packed into a single integer (see tribe.emails.unpack_link).
+
+        If a Checkpoint is given, the counts are periodically committed to
+        its state and saved, so the returned counts are only those since the
+        last checkpoint.
+
+        Messages with more than max_recipients people are linked according
+        to the fanout policy before any pairs are generated, so that a single
+        broadcast never costs more than max_recipients squared increments.
         """
 
         def relationships(email):
@@ -116,59 +347,351 @@ class MBoxReader(object):
             people.extend(email.recipients)
             people.extend(email.copied)
 
-            people = filter(lambda p: p is not None, people)            # Filter out any None addresses
-            people = set(addr.email for addr in people if addr.email)   # Obtain only unique people
-            people = sorted(people)                                     # Sort lexicographically for combinations
-
-            for combo in combinations(people, 2):
-                yield combo
+            people = filter(lambda p: p is not None, people)                # Filter out any None addresses
+            people = [addr.email for addr in people if addr.email]          # Obtain only the email addresses
+            people = list(OrderedDict.fromkeys(people))                     # Obtain only unique people in order
+
+            # Apply the fanout policy to broadcast messages
+            sender = None
+            if fanout != FANOUT_ALL and len(people) > limit:
+                if fanout == FANOUT_SKIP:
+                    return
+                if fanout == FANOUT_CAP:
+                    people = people[:limit]
+                if fanout == FANOUT_STAR:
+                    if email.sender is None or not email.sender.email: return
+                    sender = email.sender.email
+
+            people = sorted(people)                                         # Sort lexicographically for combinations
+            ids    = [addresses.add(person) for person in people]           # Intern the addresses as integer ids
+
+            # Only link the sender, keeping each pair in lexicographic order
+            if sender is not None:
+                center = people.index(sender)
+                for idx, person in enumerate(ids):
+                    if idx < center:
+                        yield pack_link(person, ids[center])
+                    elif idx > center:
+                        yield pack_link(ids[center], person)
+                return
+
+            for source, target in combinations(ids, 2):
+                yield pack_link(source, target)
+
+        addresses = self.addresses
+        fanout    = self.fanout
+        limit     = self.max_recipients
 
 
         # Keep track of all the email to email links
-        links  = FreqDist()
+        links  = self.link_counter()
         emails = 0
 
         # Iterate over all the extracted emails
         # Catch exceptions, if any, and move forward
         # NOTE: This will allow the progress bar to work
         # NOTE: This will build the graph data structure in memory
-        for email in self.extract():
+        seconds = self.profiler.seconds
+        for email in self.extract(start, stop):
             emails += 1
+            started = clock()
             try:
                 for combo in relationships(email):
                     links[combo] += 1
             except Exception as e:
-                self.errors[e] += 1
-                continue
-
-        # Construct the networkx graph with details about generation.
-        G = nx.Graph(
-            name="Email Network", mbox=self.path,
-            extracted=strfnow(), n_emails=emails,
-            mbox_size=filesize(self.path),
-        )
+                self.errors[str(e)] += 1
+            seconds[PAIRS] += clock() - started
+
+            if checkpoint is not None and checkpoint.due(self.cursor):
+                checkpoint.save(links, self.errors, emails, self.cursor)
+                emails = 0
+
+        return links, emails
+
+    def extract_links_parallel(self, workers, start=0, stop=None, checkpoint=None):
+        """
+        Counts links as in extract_links, but with the MBox partitioned into
+        byte ranges on message boundaries that are processed by a pool of
+        worker processes. Partial counts are merged in MBox order so that the
+        result (including key order) is identical to the serial counts.
+
+        If a Checkpoint is given, partitions are no larger than its interval
+        and the merged counts are committed and saved between partitions.
+        """
+        links  = self.link_counter()
+        emails = 0
+        chunks = None
+
+        if checkpoint is not None and checkpoint.interval > 0:
+            total  = len(self.index.slice(start, stop))
+            chunks = max(workers * 4, -(-total // checkpoint.interval))
+
+        partitions = self.iter_partitions(workers, start, stop, chunks)
+        for part, count, errors, addresses, profiler, cursor in partitions:
+            # Map the ids of the partition's addresses to ids in self.addresses
+            ids = [self.addresses.add(address) for address in addresses]
+            for link, n in part.items():
+                source, target = unpack_link(link)
+                links[pack_link(ids[source], ids[target])] += n
 
-        # Add edges to the graph with various weight properties from counts.
-        # NOTE: memoization is used here in the FreqDist to speed things up.
-        for link in links.keys():
-            link_data = {
-                "weight": links.freq(link),
-                "count":  links[link],
-                "norm":   links.norm(link),
-            }
-            G.add_edge(*link, **link_data)
+            # Approximate partitions add their error to the merged error
+            if isinstance(part, SpaceSaving):
+                links.inherited += part.error_bound
+
+            emails += count
+            self.errors.update(errors)
+            self.profiler.update(profiler)
+
+            if checkpoint is not None and checkpoint.due(cursor):
+                checkpoint.save(links, self.errors, emails, cursor)
+                emails = 0
+
+        return links, emails
+
+    def iter_partitions(self, workers, start=0, stop=None, chunks=None):
+        """
+        Yields the (links, emails, errors, addresses, profiler) results of each
+        partition of the messages numbered start through stop, in order, as
+        they are completed by a pool of worker processes, along with the
+        number of the message after the partition. The links of each partition
+        are keyed by the ids of its own list of addresses. By default there
+        are four partitions per worker to balance the load.
+        """
+        chunks = chunks or workers * 4
+        index  = self.index.slice(start, stop)
+        opts   = {
+            'cache': False,
+            'headers_only': self.headers_only,
+            'approximate': self.approximate,
+            'fanout': self.fanout,
+            'max_recipients': self.max_recipients,
+        }
+        bounds = list(partition(index, chunks))
+        tasks  = [
+            (self.path, index.slice(begin, end), opts) for begin, end in bounds
+        ]
+
+        pool = Pool(workers)
+        try:
+            results = pool.imap(extract_partition, tasks)
+            for (_, end), result in zip(bounds, results):
+                yield result + (start + end,)
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def extract_graph(self, workers=1, state=None, checkpoint=0):
+        """
+        Extracts a Graph where the nodes are EmailAddress from the link
+        counts of count_links (see it for the arguments).
+        """
+        return self.build_graph(*self.count_links(workers, state, checkpoint))
+
+    def count_links(self, workers=1, state=None, checkpoint=0):
+        """
+        Counts the links of the email network, returning the link counts and
+        the number of emails. If workers is greater than one, the links are
+        counted by a process pool.
+
+        If an ExtractionState is given, only the messages after its offset
+        are processed (the state is reset if the MBox prefix has changed),
+        their counts are added to the state, and the accumulated counts of
+        the state are returned. If checkpoint is greater than zero, the state is
+        saved after every checkpoint messages; otherwise the caller is
+        responsible for saving the state. The state is also reset if its
+        counts are not the same kind (exact or approximate) as the reader's
+        or were counted with another fanout policy or broadcast limit.
+        """
+        start = 0
+        ckpt  = None
+        if state is not None:
+            capacity = getattr(state.links, 'capacity', None)
+            limit    = self.max_recipients if self.fanout != FANOUT_ALL else None
+            policy   = (state.fanout, state.max_recipients)
+            if not state.verify() or capacity != self.approximate or policy != (self.fanout, limit):
+                state.reset(self.link_counter(), self.fanout, limit)
+            start = state.resume(self.index)
+            ckpt  = Checkpoint(state, self.index, checkpoint)
+            self.addresses = state.addresses
+
+        if workers > 1:
+            links, emails = self.extract_links_parallel(workers, start, checkpoint=ckpt)
+        else:
+            links, emails = self.extract_links(start, checkpoint=ckpt)
+
+        if state is not None:
+            ckpt.commit(links, self.errors, emails, len(self.index))
+            links, emails = state.links, state.emails
+
+        return links, emails
+
+    def build_graph(self, links, emails):
+        """
+        Builds the email network from link counts and the number of emails.
+        """
+        with self.profiler.timer(GRAPH):
+            # Construct the networkx graph with details about generation.
+            G = nx.Graph(**self.graph_attributes(links, emails))
+
+            # Add edges to the graph with various weight properties from counts.
+            G.add_edges_from(self.iter_edges(links))
 
         # Return the generated graph
         return G
 
+    def write_graphml(self, stream, links, emails):
+        """
+        Streams the email network from link counts and the number of emails
+        to a stream (or path) as GraphML without building the graph.
+        """
+        with self.profiler.timer(GRAPH):
+            write_graphml(
+                stream, self.graph_attributes(links, emails),
+                self.iter_nodes(links), self.iter_edges(links),
+            )
+
+    def write_npz(self, stream, links, emails):
+        """
+        Writes the email network from link counts and the number of emails
+        to a stream (or path) as a compact npz edge list. Requires numpy.
+        """
+        require_numpy()
+        with self.profiler.timer(GRAPH):
+            nodes, sources, targets, weights, counts, norms = self.edge_arrays(links)
+            write_npz(
+                stream, self.graph_attributes(links, emails), nodes,
+                sources, targets, weights, counts, norms,
+            )
+
+    def write_sparse(self, stream, links, emails, weight="count"):
+        """
+        Writes the email network from link counts and the number of emails
+        to a stream (or path) as an npz sparse adjacency matrix of the given
+        edge property with its node labels. Requires scipy.
+        """
+        with self.profiler.timer(GRAPH):
+            matrix, nodes = self.adjacency_matrix(links, weight)
+            write_sparse(
+                stream, self.graph_attributes(links, emails), nodes, matrix, weight
+            )
+
+    def adjacency_matrix(self, links, weight="count"):
+        """
+        Returns the email network as a symmetric scipy.sparse CSR adjacency
+        matrix of the weight, count or norm of each link, along with the list
+        of the addresses of its rows (in the same order as iter_nodes). The
+        matrix is built directly from the link counts without a graph.
+        """
+        require_scipy()
+        nodes, sources, targets, weights, counts, norms = self.edge_arrays(links)
+
+        try:
+            values = {"weight": weights, "count": counts, "norm": norms}[weight]
+        except KeyError:
+            raise ValueError("unknown edge property '{}'".format(weight))
+
+        # Store every (undirected) link in both directions.
+        rows = np.concatenate((sources, targets))
+        cols = np.concatenate((targets, sources))
+        data = np.concatenate((values, values))
+
+        shape  = (len(nodes), len(nodes))
+        matrix = sp.csr_matrix((data, (rows, cols)), shape=shape)
+        return matrix, nodes
+
+    def edge_arrays(self, links):
+        """
+        Returns the addresses of the nodes of the email network (in the same
+        order as iter_nodes) and numpy arrays of the source and target node
+        numbers and the weight, count and norm of every edge.
+        """
+        sources, targets, weights, counts, norms = link_arrays(links)
+
+        # Order the nodes by their first appearance in the links.
+        ids = np.column_stack((sources, targets)).ravel()
+        uniques, first = np.unique(ids, return_index=True)
+        order = uniques[np.argsort(first, kind='stable')].astype(np.int64)
+
+        # Map address ids to the position of their node.
+        position = np.zeros(len(self.addresses), dtype=np.int64)
+        position[order] = np.arange(len(order), dtype=np.int64)
+
+        addresses = self.addresses
+        nodes = [addresses[node] for node in order.tolist()]
+        return (
+            nodes, position[sources.astype(np.int64)], position[targets.astype(np.int64)],
+            weights, counts, norms,
+        )
+
+    def graph_attributes(self, links, emails):
+        """
+        Returns the attributes of the email network describing its generation.
+        """
+        attributes = OrderedDict((
+            ("name", "Email Network"),
+            ("mbox", self.path),
+            ("extracted", strfnow()),
+            ("n_emails", emails),
+            ("mbox_size", filesize(self.path)),
+            ("fanout_policy", self.fanout),
+        ))
+
+        # Record the size of the messages the fanout policy was applied to.
+        if self.fanout != FANOUT_ALL:
+            attributes["fanout_limit"] = self.max_recipients
+
+        # Describe the approximation if the links were not counted exactly.
+        if isinstance(links, SpaceSaving):
+            attributes["approximate"] = "space-saving"
+            attributes["capacity"] = links.capacity
+            attributes["error_bound"] = links.error_bound
+
+        return attributes
+
+    def iter_nodes(self, links):
+        """
+        Yields the address of every node of the email network in the order
+        that the nodes are added to the graph by their links.
+        """
+        addresses = self.addresses
+        seen = bytearray(len(addresses))
+
+        for link in links:
+            for node in unpack_link(link):
+                if not seen[node]:
+                    seen[node] = 1
+                    yield addresses[node]
+
+    def iter_edges(self, links, chunk=EDGE_CHUNK):
+        """
+        Yields the (source, target, data) of every edge of the email network
+        with the weight, count and norm properties of the link counts.
+
+        NOTE: the properties of chunk edges at a time are computed in one pass.
+        NOTE: addresses are only mapped back to strings for the graph.
+        """
+        addresses = self.addresses
+        items = iter(links.items())
+
+        while True:
+            block = list(islice(items, chunk))
+            if not block: break
+
+            for source, target, weight, count, norm in zip(*link_properties(links, block)):
+                yield addresses[source], addresses[target], {
+                    "weight": weight,
+                    "count":  count,
+                    "norm":   norm,
+                }
+
 
 class ConsoleMBoxReader(MBoxReader):
     """
-    Wraps the __iter__ class with a console based progress bar for console
-    output and timing information (especially for large MBox files).
+    Wraps the iter_messages method with a console based progress bar for
+    console output and timing information (especially for large MBox files).
 
-    Note: in order for this to work, the super class must always use __iter__
-    Note: this is a bit more expensive because a count is always performed.
+    Note: in order for this to work, the super class must always iterate
+    over messages using iter_messages (__iter__ does so by default).
     """
 
     def __init__(self, *args, **kwargs):
@@ -178,7 +701,7 @@ class ConsoleMBoxReader(MBoxReader):
         # Initialize the MBoxReader
         super(ConsoleMBoxReader, self).__init__(*args, **kwargs)
 
-    def __iter__(self):
+    def iter_messages(self, start=0, stop=None, fields=None):
         if self.verbose:
             print("Initializing MBox iteration on {} ({})".format(
                 self.path, filesize(self.path)
@@ -188,27 +711,130 @@ class ConsoleMBoxReader(MBoxReader):
         pbar = Progress()
 
         # Iterate through the messages and update the progress bar
-        for msg in super(ConsoleMBoxReader, self).__iter__():
+        for msg in super(ConsoleMBoxReader, self).iter_messages(start, stop, fields):
             yield msg
             pbar.update()
 
         # Stop the progress bar and flush
         pbar.stop()
 
+    def iter_partitions(self, workers, start=0, stop=None, chunks=None):
+        if self.verbose:
+            print("Initializing parallel MBox extraction on {} ({}) with {} workers".format(
+                self.path, filesize(self.path), workers
+            ))
+
+        # Build the progress bar
+        pbar = Progress()
+
+        # Update the progress bar with the messages of each partition
+        for result in super(ConsoleMBoxReader, self).iter_partitions(workers, start, stop, chunks):
+            yield result
+            pbar.update(result[1])
+
+        # Stop the progress bar and flush
+        pbar.stop()
+
     def count(self, refresh=False):
         """
-        Memoize the count function to minimize the reads of large MBox files.
+        Counts the messages using the offset index, rescanning the MBox for
+        message boundaries if refresh is True.
         """
-        if not hasattr(self, '_count') or refresh:
-            self._count = sum(1 for _ in super(ConsoleMBoxReader, self).__iter__())
-        return self._count
+        if refresh:
+            self.reindex()
+        return super(ConsoleMBoxReader, self).count()
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+def partition(index, n):
+    """
+    Splits the messages of an MBoxIndex into at most n contiguous ranges of
+    roughly equal size in bytes, yielding (start, stop) message numbers.
+    """
+    if len(index) == 0: return
+
+    first  = index.starts[0]
+    total  = index.stops[-1] - first
+    bounds = [0]
+
+    for part in range(1, n):
+        bound = bisect_left(index.starts, first + (total * part) // n)
+        if bound > bounds[-1] and bound < len(index):
+            bounds.append(bound)
+
+    bounds.append(len(index))
+    for start, stop in zip(bounds, bounds[1:]):
+        yield start, stop
+
+
+def link_properties(links, items=None):
+    """
+    Computes the edge properties of all links (or of the (link, count) items
+    of links) in a single vectorized pass (if numpy is available), returning
+    parallel lists of the source and target address ids and the weight
+    (freq), count and norm of each link. The values are exactly those of the
+    FreqDist freq and norm methods.
+    """
+    if items is None:
+        keys, values = links.keys(), links.values()
+    else:
+        keys, values = [item[0] for item in items], [item[1] for item in items]
+
+    if np is None:
+        sources, targets = zip(*map(unpack_link, keys)) if keys else ((), ())
+        counts  = list(values)
+        weights = [links.freq(link) for link in keys]
+        norms   = [links.norm(link) for link in keys]
+        return sources, targets, weights, counts, norms
+
+    return tuple(column.tolist() for column in link_arrays(links, keys, values))
+
+
+def link_arrays(links, keys=None, values=None):
+    """
+    Computes the edge properties of all links (or of the given keys and
+    values of links) as numpy arrays of the source and target address ids
+    and the weight, count and norm of each link.
+    """
+    if keys is None:
+        keys, counts = links.to_arrays(np.uint64)
+    else:
+        keys   = np.fromiter(keys, dtype=np.uint64, count=len(keys))
+        counts = np.array(list(values), dtype=np.int64)
+
+    total, magnitude = links.N, links.M
+
+    weights = counts / float(total) if total else np.zeros(len(counts))
+    norms   = counts / float(magnitude) if magnitude else np.zeros(len(counts))
+
+    return (
+        keys >> np.uint64(LINK_BITS), keys & np.uint64(LINK_MASK),
+        weights, counts, norms,
+    )
+
+
+def extract_partition(task):
+    """
+    Worker function for parallel extraction that counts the links of the
+    messages in the (path, index, options) partition of an MBox. Returns the
+    links, the number of emails, the errors that occurred, the list of
+    addresses whose ids the links are keyed by and the stage timings.
+    """
+    path, index, opts = task
+    reader = MBoxReader(path, index=index, **opts)
+    links, emails = reader.extract_links()
+    return links, emails, reader.errors, reader.addresses.addresses, reader.profiler
 
 
 if __name__ == '__main__':
     # Dump extracted email meta data to a pickle file for testing
     import pickle
+    from tribe.store import EmailStore
 
     reader = MBoxReader("fixtures/benjamin@bengfort.com.mbox")
-    emails = list(reader.extract())
-    with open('fixtures/emails.pickle', 'w') as f:
+    emails = EmailStore.build(reader.extract())
+    with open('fixtures/emails.pickle', 'wb') as f:
         pickle.dump(emails, f, pickle.HIGHEST_PROTOCOL)
@@ -0,0 +1,215 @@
+# tribe.index
+# A persistent byte offset index of the messages in an mbox.
+#
+# Author:   Tribe Contributors
+# Created:  Sun Oct 18 09:12:44 2026 -0400
+#
+# Copyright (C) 2026 District Data Labs
+# For license information, see LICENSE.txt
+#
+# ID: index.py [] $
+
+"""
+A persistent byte offset index of the messages in an mbox. The index is built
+with a single pass over the mbox and is saved to a sidecar file next to it so
+that subsequent reads can count and seek to messages without a rescan.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import sys
+import struct
+
+from array import array
+from tribe.utils import atomic_dump
+from tribe.scanner import MBoxScanner
+
+
+##########################################################################
+## Module Constants
+##########################################################################
+
+INDEX_EXT     = ".idx"      # Extension of the sidecar file next to the mbox
+INDEX_MAGIC   = b"TRIBEIDX" # Identifies a Tribe index file on disk
+INDEX_VERSION = 1           # Bump when the on disk format changes
+OFFSET_TYPE   = 'Q'         # Unsigned 64-bit integer byte offsets
+
+# magic, version, mbox size, mbox mtime, number of messages
+INDEX_HEADER  = struct.Struct("<8sHQdQ")
+
+
+##########################################################################
+## MBox Index
+##########################################################################
+
+class MBoxIndex(object):
+    """
+    Stores the start and stop byte offset of every message in an mbox along
+    with the size and modification time of the mbox when it was scanned so
+    that the index can be invalidated if the mbox changes.
+
+    The offsets match those computed by the table of contents of the stdlib
+    mailbox.mbox, so messages can be read with a single seek and read.
+    """
+
+    @classmethod
+    def sidecar(klass, path):
+        """
+        Returns the path of the index file for the mbox at the given path.
+        """
+        return path + INDEX_EXT
+
+    @classmethod
+    def build(klass, path):
+        """
+        Scans the memory mapped mbox at the given path for "From " lines and
+        returns a new index of the message boundaries.
+        """
+        stat   = os.stat(path)
+        starts = array(OFFSET_TYPE)
+        stops  = array(OFFSET_TYPE)
+
+        with MBoxScanner(path) as scanner:
+            for start, stop in scanner.scan():
+                starts.append(start)
+                stops.append(stop)
+
+        return klass(path, starts, stops, stat.st_size, stat.st_mtime)
+
+    @classmethod
+    def load(klass, path, stream):
+        """
+        Load an index for the mbox at path from a binary stream.
+        """
+        header = stream.read(INDEX_HEADER.size)
+        if len(header) != INDEX_HEADER.size:
+            raise ValueError("truncated mbox index header")
+
+        magic, version, size, mtime, count = INDEX_HEADER.unpack(header)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise ValueError("unknown mbox index format")
+
+        starts = read_offsets(stream, count)
+        stops  = read_offsets(stream, count)
+
+        return klass(path, starts, stops, size, mtime)
+
+    @classmethod
+    def open(klass, path, persist=True, refresh=False):
+        """
+        Returns the index for the mbox at the given path, loading it from the
+        sidecar file if it exists and is still valid, otherwise scanning the
+        mbox and (if persist is True) writing the index to the sidecar. If
+        refresh is True the mbox is always rescanned.
+        """
+        sidecar = klass.sidecar(path)
+
+        if not refresh and os.path.exists(sidecar):
+            try:
+                with open(sidecar, 'rb') as f:
+                    index = klass.load(path, f)
+                if index.is_valid():
+                    return index
+            except (IOError, OSError, ValueError):
+                pass
+
+        index = klass.build(path)
+        if persist:
+            index.save()
+        return index
+
+    def __init__(self, path, starts=None, stops=None, size=0, mtime=0.0):
+        self.path   = path
+        self.starts = starts if starts is not None else array(OFFSET_TYPE)
+        self.stops  = stops if stops is not None else array(OFFSET_TYPE)
+        self.size   = size
+        self.mtime  = mtime
+
+        if len(self.starts) != len(self.stops):
+            raise ValueError("mismatched start and stop offsets in index")
+
+    def is_valid(self):
+        """
+        Checks the size and modification time of the mbox against the values
+        recorded when the index was built.
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        return stat.st_size == self.size and stat.st_mtime == self.mtime
+
+    def dump(self, stream):
+        """
+        Dump the index to a binary stream.
+        """
+        stream.write(INDEX_HEADER.pack(
+            INDEX_MAGIC, INDEX_VERSION, self.size, self.mtime, len(self)
+        ))
+        write_offsets(stream, self.starts)
+        write_offsets(stream, self.stops)
+
+    def save(self):
+        """
+        Writes the index to its sidecar file next to the mbox. The write is
+        atomic (see atomic_dump) so readers never see a partial index.
+        Failure to write (e.g. a read-only directory) is not an error.
+        """
+        try:
+            atomic_dump(self.sidecar(self.path), self.dump)
+            return True
+        except (IOError, OSError):
+            return False
+
+    def slice(self, start=0, stop=None):
+        """
+        Returns a new index of the messages numbered start through stop.
+        """
+        return self.__class__(
+            self.path, self.starts[start:stop], self.stops[start:stop],
+            self.size, self.mtime,
+        )
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, idx):
+        return self.starts[idx], self.stops[idx]
+
+    def __iter__(self):
+        return zip(self.starts, self.stops)
+
+    def __repr__(self):
+        return "<MBoxIndex of {} messages in {}>".format(len(self), self.path)
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+def read_offsets(stream, count):
+    """
+    Reads count little endian offsets from a binary stream into an array.
+    """
+    offsets = array(OFFSET_TYPE)
+    data = stream.read(count * offsets.itemsize)
+    if len(data) != count * offsets.itemsize:
+        raise ValueError("truncated mbox index offsets")
+
+    offsets.frombytes(data)
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+    return offsets
+
+
+def write_offsets(stream, offsets):
+    """
+    Writes an array of offsets to a binary stream in little endian order.
+    """
+    if sys.byteorder != 'little':
+        offsets = array(OFFSET_TYPE, offsets)
+        offsets.byteswap()
+    stream.write(offsets.tobytes())
@@ -0,0 +1,188 @@
+# tribe.instrument
+# Throughput and latency instrumentation of the extraction pipeline.
+#
+# Author:   Tribe Contributors
+# Created:  Sun Oct 18 20:12:44 2026 -0400
+#
+# Copyright (C) 2026 District Data Labs
+# For license information, see LICENSE.txt
+#
+# ID: instrument.py [] $
+
+"""
+Throughput and latency instrumentation of the extraction pipeline. The
+MBoxReader accumulates the time spent in each stage of an extraction in a
+Profiler, which reports the share of the time and the rate (in messages and
+bytes per second) of every stage as JSON.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import json
+import time
+
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from six import string_types
+
+
+##########################################################################
+## Module Constants
+##########################################################################
+
+READING   = "reading"       # Copying the bytes of messages out of the mbox
+HEADERS   = "headers"       # Parsing the headers of messages
+ADDRESSES = "addresses"     # Parsing and interning the email addresses
+DATES     = "dates"         # Parsing the dates of messages
+PAIRS     = "pairs"         # Generating and counting links between people
+GRAPH     = "graph"         # Building or writing the email network
+
+STAGES = (READING, HEADERS, ADDRESSES, DATES, PAIRS, GRAPH)
+
+# The highest resolution clock available
+clock = time.perf_counter
+
+
+##########################################################################
+## Profiler
+##########################################################################
+
+class Profiler(object):
+    """
+    Accumulates the seconds spent in each stage of the pipeline along with
+    the number of messages and bytes read. Stages are timed by adding to the
+    seconds dict directly in hot loops, or with the timer context manager.
+
+    Profilers of parallel workers are merged with update, in which case the
+    stage seconds are the total across all of the workers, while the elapsed
+    time is the wall clock time since this profiler was created. Messages
+    loaded from the meta data cache are counted as cached, since their time
+    is spent reading the cache rather than in the parsing stages.
+    """
+
+    def __init__(self):
+        self.seconds  = OrderedDict((stage, 0.0) for stage in STAGES)
+        self.messages = 0
+        self.bytes    = 0
+        self.cached   = 0
+        self.dates    = Counter()
+        self.started  = clock()
+
+    @contextmanager
+    def timer(self, stage):
+        """
+        Adds the time spent in the body of the with statement to the stage.
+        """
+        start = clock()
+        try:
+            yield
+        finally:
+            self.seconds[stage] += clock() - start
+
+    def update(self, other):
+        """
+        Adds the stage seconds and counts of another profiler to this one.
+        """
+        for stage, seconds in other.seconds.items():
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+        self.messages += other.messages
+        self.bytes    += other.bytes
+        self.cached   += other.cached
+        self.dates.update(other.dates)
+
+    @property
+    def total(self):
+        """
+        The total seconds spent in all stages.
+        """
+        return sum(self.seconds.values())
+
+    @property
+    def elapsed(self):
+        """
+        The wall clock seconds since the profiler was created.
+        """
+        return clock() - self.started
+
+    def rates(self, seconds):
+        """
+        Returns the messages and bytes per second processed in seconds.
+        """
+        if not seconds:
+            return None, None
+        return self.messages / seconds, self.bytes / seconds
+
+    def report(self):
+        """
+        Returns an ordered dict of the seconds, percent of the total time and
+        rates of each stage, and the totals of the pipeline.
+        """
+        total = self.total
+        messages_per_sec, bytes_per_sec = self.rates(total)
+
+        stages = OrderedDict()
+        for stage, seconds in self.seconds.items():
+            stage_messages, stage_bytes = self.rates(seconds)
+            stages[stage] = OrderedDict((
+                ("seconds", seconds),
+                ("percent", 100.0 * seconds / total if total else 0.0),
+                ("messages_per_sec", stage_messages),
+                ("bytes_per_sec", stage_bytes),
+            ))
+
+        return OrderedDict((
+            ("messages", self.messages),
+            ("bytes", self.bytes),
+            ("cached", self.cached),
+            ("seconds", total),
+            ("elapsed", self.elapsed),
+            ("messages_per_sec", messages_per_sec),
+            ("bytes_per_sec", bytes_per_sec),
+            ("stages", stages),
+            ("dates", OrderedDict(sorted(self.dates.items()))),
+        ))
+
+    def dump(self, stream, **kwargs):
+        """
+        Writes the report as JSON to the stream (or the file at the path).
+        """
+        if isinstance(stream, string_types):
+            with open(stream, 'w') as f:
+                return self.dump(f, **kwargs)
+
+        kwargs.setdefault('indent', 2)
+        json.dump(self.report(), stream, **kwargs)
+
+    def __str__(self):
+        lines = ["{:<10} {:>10} {:>7} {:>12} {:>12}".format(
+            "stage", "seconds", "%", "msgs/sec", "MB/sec"
+        )]
+
+        for stage, data in self.report()["stages"].items():
+            lines.append("{:<10} {:>10.3f} {:>6.1f}% {:>12} {:>12}".format(
+                stage, data["seconds"], data["percent"],
+                format_rate(data["messages_per_sec"]),
+                format_rate(data["bytes_per_sec"], 1e6),
+            ))
+
+        if self.cached:
+            lines.append("{:,} of {:,} messages were loaded from the meta data cache".format(
+                self.cached, self.messages
+            ))
+        return "\n".join(lines)
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+def format_rate(rate, scale=1.0):
+    """
+    Formats a (possibly undefined) rate for the console.
+    """
+    if rate is None:
+        return "-"
+    return "{:,.1f}".format(rate / scale)
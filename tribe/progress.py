@@ -43,11 +43,12 @@ class Progress(object):
         """
         return humanizedelta(seconds=time.time() - self.start)
 
-    def update(self, flush=True):
+    def update(self, n=1, flush=True):
         """
-        Call on each iteration of the loop you're tracking.
+        Call on each iteration of the loop you're tracking (or with the
+        number of items in a batch when tracking batches).
         """
-        self.count += 1
+        self.count += n
         if flush: self.pprint()
 
     def stop(self):
@@ -105,11 +106,11 @@ class AsyncProgress(Progress):
         self.timer = threading.Timer(self.interval, lambda: background_update(self))
         self.timer.start()
 
-    def update(self):
+    def update(self, n=1):
         """
         Update now does not flush, the background timer does that.
         """
-        super(AsyncProgress, self).update(flush=False)
+        super(AsyncProgress, self).update(n, flush=False)
 
     def stop(self):
         """
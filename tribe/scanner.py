@@ -0,0 +1,215 @@
+# tribe.scanner
+# Memory mapped scanning of message boundaries and headers in an mbox.
+#
+# Author:   Tribe Contributors
+# Created:  Sun Oct 18 11:02:37 2026 -0400
+#
+# Copyright (C) 2026 District Data Labs
+# For license information, see LICENSE.txt
+#
+# ID: scanner.py [] $
+
+"""
+Memory mapped scanning of message boundaries and headers in an mbox. The
+scanner searches the mapped file directly for "From " separators and header
+block terminators so that bytes are only copied out of the map for the parts
+of a message that are actually parsed.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import re
+import mmap
+
+from mailbox import mboxMessage, linesep
+
+
+##########################################################################
+## Module Constants
+##########################################################################
+
+FROM        = b"From "              # Separator at the start of each message
+SEPARATOR   = b"\n" + FROM          # Separator anywhere else in the mbox
+EMPTY_LINE  = b"\n" + linesep       # The end of a line followed by a blank line
+TERMINATORS = (b"\n\n", b"\n\r\n")  # Blank lines that end a header block
+
+# Matches the start of a header line as the stdlib email parser does
+HEADER_NAME = re.compile(br"([\041-\071\073-\176]*):")
+
+
+##########################################################################
+## MBox Scanner
+##########################################################################
+
+class MBoxScanner(object):
+    """
+    Maps an mbox into memory (read only) and finds messages and headers on
+    the mapped buffer. The boundaries found by scan match the table of
+    contents of the stdlib mailbox.mbox, and message and headers return the
+    same mboxMessage that mailbox.mbox.get_message would.
+
+    The scanner should be closed when done, or used as a context manager.
+    """
+
+    def __init__(self, path):
+        self.path  = path
+        self._file = open(path, 'rb')
+
+        # Empty files cannot be mapped, but have nothing to scan anyway
+        if os.fstat(self._file.fileno()).st_size > 0:
+            self.buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.buffer = b""
+
+        self.view = memoryview(self.buffer)
+
+    def close(self):
+        """
+        Releases the memory map and closes the underlying file.
+        """
+        self.view.release()
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.buffer)
+
+    def scan(self):
+        """
+        Yields the (start, stop) byte offsets of every message in the mbox.
+        """
+        buf  = self.buffer
+        size = len(buf)
+
+        start = 0 if buf[:len(FROM)] == FROM else self.find_separator(0)
+        while start >= 0:
+            after = self.find_separator(start)
+            end   = after if after >= 0 else size
+
+            # A blank line before the next separator is not part of the message
+            if end - len(EMPTY_LINE) >= start and buf[end - len(EMPTY_LINE):end] == EMPTY_LINE:
+                yield start, end - len(linesep)
+            else:
+                yield start, end
+
+            start = after
+
+    def find_separator(self, pos):
+        """
+        Returns the offset of the next "From " line after pos or -1.
+        """
+        idx = self.buffer.find(SEPARATOR, pos)
+        if idx < 0: return idx
+        return idx + 1
+
+    def find_header_end(self, pos, stop):
+        """
+        Returns the offset of the blank line that ends the header block that
+        begins at pos, or stop if the message has no body.
+        """
+        buf = self.buffer
+        if buf[pos:pos+1] == b"\n" or buf[pos:pos+2] == b"\r\n":
+            return pos
+
+        end = stop
+        for terminator in TERMINATORS:
+            idx = buf.find(terminator, pos, end)
+            if idx >= 0:
+                end = idx + 1
+        return end
+
+    def message(self, start, stop):
+        """
+        Returns the full message between the start and stop byte offsets.
+        """
+        return self.parse(*self.raw_message(start, stop))
+
+    def headers(self, start, stop, fields=None):
+        """
+        Returns a message with only the headers of the message between the
+        start and stop byte offsets; the body is never copied or parsed. If
+        fields is a set of lowercase header names (as bytes), only those
+        headers are copied out of the map and parsed.
+        """
+        return self.parse(*self.raw_headers(start, stop, fields))
+
+    def raw_message(self, start, stop):
+        """
+        Returns the envelope and the bytes of the full message between the
+        start and stop byte offsets, copied out of the map but not parsed.
+        """
+        from_line, body = self._split_from_line(start, stop)
+        return from_line, self.view[body:stop].tobytes()
+
+    def raw_headers(self, start, stop, fields=None):
+        """
+        Returns the envelope and the bytes of the header block (or of only
+        the headers in fields) of the message between the start and stop
+        byte offsets, copied out of the map but not parsed.
+        """
+        from_line, body = self._split_from_line(start, stop)
+        end = self.find_header_end(body, stop)
+
+        if fields is None:
+            return from_line, self.view[body:end].tobytes()
+        return from_line, b"".join(self.select_headers(body, end, fields))
+
+    @staticmethod
+    def parse(from_line, data):
+        """
+        Parses the raw bytes of a message (or header block) as an mboxMessage
+        with the given envelope.
+        """
+        msg = mboxMessage(data.replace(linesep, b"\n"))
+        msg.set_from(from_line)
+        return msg
+
+    def select_headers(self, pos, end, fields):
+        """
+        Yields the lines (including folded continuation lines) of the headers
+        in fields from the header block between pos and end. Like the stdlib
+        parser, a line that is not a header ends the header block.
+        """
+        buf  = self.buffer
+        keep = False
+
+        while pos < end:
+            eol = buf.find(b"\n", pos, end)
+            eol = end if eol < 0 else eol + 1
+
+            first = buf[pos:pos+1]
+            if first == b" " or first == b"\t":
+                if keep:
+                    yield buf[pos:eol]
+            else:
+                match = HEADER_NAME.match(buf, pos, eol)
+                if match is not None:
+                    keep = match.group(1).lower() in fields
+                    if keep:
+                        yield buf[pos:eol]
+                elif buf[pos:pos+len(FROM)] == FROM:
+                    keep = False
+                else:
+                    break
+
+            pos = eol
+
+    def _split_from_line(self, start, stop):
+        """
+        Returns the decoded "From " line envelope and the offset after it.
+        """
+        eol = self.buffer.find(b"\n", start, stop)
+        eol = stop if eol < 0 else eol + 1
+
+        from_line = self.view[start:eol].tobytes().replace(linesep, b"")
+        return from_line[len(FROM):].decode('ascii'), eol
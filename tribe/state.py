@@ -0,0 +1,339 @@
+# tribe.state
+# Persistent state of a graph extraction over a prefix of an mbox.
+#
+# Author:   Tribe Contributors
+# Created:  Sun Oct 18 12:21:55 2026 -0400
+#
+# Copyright (C) 2026 District Data Labs
+# For license information, see LICENSE.txt
+#
+# ID: state.py [] $
+
+"""
+Persistent state of a graph extraction over a prefix of an mbox. Saving the
+link counts along with the byte offset they were counted up to allows later
+extractions of an append-only mbox to only process newly appended messages.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import struct
+import hashlib
+import warnings
+
+from bisect import bisect_left
+from tribe.utils import atomic_dump
+from tribe.stats import FreqDist, SpaceSaving, pack_keys, unpack_keys
+from tribe.emails import AddressTable
+
+
+##########################################################################
+## Module Constants
+##########################################################################
+
+STATE_EXT      = ".state"   # Extension of the sidecar file next to the mbox
+CHECKPOINT_EXT = ".ckpt"    # Extension of the checkpoint of a full extraction
+STATE_MAGIC    = b"TRIBESTA" # Identifies an extraction state file on disk
+STATE_VERSION  = 4          # Bump when the state format changes
+DIGEST_BLOCK   = 65536      # Bytes sampled at each end of the mbox prefix
+
+APPROXIMATE    = 0x01       # Flag of states with SpaceSaving link counts
+LIMITED        = 0x02       # Flag of states with a broadcast limit
+
+# magic, version, flags, emails, offset, capacity, inherited error bound
+# and the broadcast limit
+STATE_HEADER   = struct.Struct("<8sHBQQQdQ")
+
+# kind, number of values and bytes of a section of values (see pack_keys)
+SECTION_HEADER = struct.Struct("<cQQ")
+
+
+##########################################################################
+## Extraction State
+##########################################################################
+
+class ExtractionState(object):
+    """
+    The link counts, error counts and number of emails extracted from the
+    first offset bytes of an mbox, along with a digest of that prefix to
+    verify that it has not changed before extraction is continued. The links
+    are keyed by the packed ids of the interned addresses. The fanout
+    policy and broadcast limit the links were counted with are recorded so
+    that counts made under another policy are never added to.
+    """
+
+    @classmethod
+    def sidecar(klass, path, ext=STATE_EXT):
+        """
+        Returns the path of the state file for the mbox at the given path.
+        """
+        return path + ext
+
+    @classmethod
+    def load(klass, stream):
+        """
+        Load an extraction state from a binary stream (see dump), raising a
+        ValueError if it is not a complete state.
+        """
+        header = read_exact(stream, STATE_HEADER.size)
+        magic, version, flags, emails, offset, capacity, inherited, limit = STATE_HEADER.unpack(header)
+        if magic != STATE_MAGIC or version != STATE_VERSION:
+            raise ValueError("not a version {} extraction state".format(STATE_VERSION))
+
+        path, digest, fanout = read_section(stream)
+        addresses = AddressTable(read_section(stream))
+
+        links  = FreqDist.load_binary(stream)
+        errors = FreqDist.load_binary(stream)
+        if flags & APPROXIMATE:
+            links = SpaceSaving.from_counts(
+                links, capacity, FreqDist.load_binary(stream), inherited
+            )
+
+        return klass(
+            path, links, errors, emails, offset, digest, addresses=addresses,
+            fanout=fanout, max_recipients=limit if flags & LIMITED else None,
+        )
+
+    @classmethod
+    def open(klass, path, state_path=None):
+        """
+        Returns the saved state for the mbox at path (or a new, empty state
+        if there is no saved state or it cannot be read). The state will be
+        saved back to the file it was opened from.
+        """
+        state_path = state_path or klass.sidecar(path)
+
+        if os.path.exists(state_path):
+            try:
+                with open(state_path, 'rb') as f:
+                    state = klass.load(f)
+                state.path = path
+                state.filename = state_path
+                return state
+            except (IOError, OSError, ValueError):
+                pass
+
+        return klass(path, filename=state_path)
+
+    def __init__(self, path, links=None, errors=None, emails=0, offset=0,
+                 digest=None, filename=None, addresses=None, fanout=None,
+                 max_recipients=None):
+        self.path      = path
+        self.filename  = filename or self.sidecar(path)
+        self.addresses = addresses if addresses is not None else AddressTable()
+        self.links     = links if links is not None else FreqDist()
+        self.errors    = errors if errors is not None else FreqDist()
+        self.emails    = emails
+        self.offset    = offset
+        self.digest    = digest
+        self.fanout    = fanout
+        self.max_recipients = max_recipients
+
+    def verify(self):
+        """
+        Checks that the mbox is at least offset bytes long and that the
+        sampled digest of the first offset bytes is unchanged.
+        """
+        if self.offset == 0: return True
+
+        try:
+            if os.path.getsize(self.path) < self.offset:
+                return False
+            return prefix_digest(self.path, self.offset) == self.digest
+        except (IOError, OSError):
+            return False
+
+    def reset(self, links=None, fanout=None, max_recipients=None):
+        """
+        Discards all counts so that extraction starts from the beginning,
+        optionally counting links with the given (empty) dist and fanout
+        policy from now on.
+        """
+        self.addresses = AddressTable()
+        self.links     = links if links is not None else FreqDist()
+        self.errors    = FreqDist()
+        self.emails    = 0
+        self.offset    = 0
+        self.digest    = None
+        self.fanout    = fanout
+        self.max_recipients = max_recipients
+
+    def resume(self, index):
+        """
+        Returns the number of the first message in the MBoxIndex that has not
+        yet been processed.
+        """
+        return bisect_left(index.starts, self.offset)
+
+    def update(self, links, emails, errors, offset):
+        """
+        Adds the counts extracted from the messages between the current
+        offset and the new offset to the state.
+        """
+        self.links.update(links)
+        self.errors.update(errors)
+        self.emails += emails
+        self.offset  = offset
+        self.digest  = prefix_digest(self.path, offset)
+
+    def dump(self, stream):
+        """
+        Dump the extraction state to a binary stream without pickle: a header
+        of the numeric fields, sections of the path, digest and fanout policy
+        and of the interned (email string) addresses, then the binary dumps
+        of the links and errors (and of the errors of approximate links).
+        """
+        links = self.links
+        flags = 0
+        if isinstance(links, SpaceSaving):
+            flags |= APPROXIMATE
+        if self.max_recipients is not None:
+            flags |= LIMITED
+
+        stream.write(STATE_HEADER.pack(
+            STATE_MAGIC, STATE_VERSION, flags, self.emails, self.offset,
+            getattr(links, 'capacity', 0), getattr(links, 'inherited', 0.0),
+            self.max_recipients or 0,
+        ))
+
+        write_section(stream, [self.path, self.digest, self.fanout])
+        write_section(stream, list(self.addresses))
+
+        links.dump_binary(stream)
+        self.errors.dump_binary(stream)
+        if flags & APPROXIMATE:
+            FreqDist(links.errors).dump_binary(stream)
+
+    def save(self, state_path=None):
+        """
+        Writes the state (by default to the file it was opened from)
+        atomically (see atomic_dump), so that an interrupted write leaves
+        the previously saved state in place.
+        """
+        atomic_dump(state_path or self.filename, self.dump)
+
+    def remove(self):
+        """
+        Deletes the saved state file (e.g. a checkpoint that is finished).
+        """
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+    def __repr__(self):
+        return "<ExtractionState of {} emails up to byte {} of {}>".format(
+            self.emails, self.offset, self.path
+        )
+
+
+##########################################################################
+## Checkpoints
+##########################################################################
+
+class Checkpoint(object):
+    """
+    Periodically saves an ExtractionState during a long running extraction
+    so that it can be resumed if the process is killed. Counts are moved
+    from the extraction into the state (and the partial counts are cleared)
+    each time the state is committed, so that nothing is counted twice.
+    """
+
+    def __init__(self, state, index, interval=0):
+        self.state    = state
+        self.index    = index
+        self.interval = interval
+        self.errors   = FreqDist()  # Errors that have been committed
+        self.last     = state.resume(index)
+
+    def offset(self, cursor):
+        """
+        Returns the byte offset of the message numbered cursor.
+        """
+        if cursor < len(self.index):
+            return self.index.starts[cursor]
+        return self.index.size
+
+    def due(self, cursor):
+        """
+        Returns True if interval messages have been processed since the last
+        checkpoint and cursor is the next message to be processed.
+        """
+        return self.interval > 0 and cursor - self.last >= self.interval
+
+    def commit(self, links, errors, emails, cursor):
+        """
+        Adds the counts of all messages before cursor to the state and clears
+        the links so that counting can continue. Errors are never cleared, so
+        only those not yet committed are added to the state.
+        """
+        delta = errors - self.errors
+        self.errors.update(delta)
+        self.state.update(links, emails, delta, self.offset(cursor))
+        links.clear()
+        self.last = cursor
+
+    def save(self, links, errors, emails, cursor):
+        """
+        Commits the counts and writes the state to disk. Failure to write
+        (e.g. a read-only directory) is not an error: a warning is issued and
+        no further checkpoints are made, so the extraction runs to completion.
+        """
+        self.commit(links, errors, emails, cursor)
+        try:
+            self.state.save()
+        except (IOError, OSError) as e:
+            warnings.warn("could not save checkpoint, checkpointing disabled: {}".format(e))
+            self.interval = 0
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+def prefix_digest(path, offset, block=DIGEST_BLOCK):
+    """
+    Computes a SHA1 digest of the first and last block bytes of the first
+    offset bytes of the file at path. Sampling the ends of the prefix rather
+    than hashing all of it keeps verification constant time, while detecting
+    a rewritten or truncated mbox (whose size and boundaries would change).
+    """
+    digest = hashlib.sha1(str(offset).encode('ascii'))
+
+    with open(path, 'rb') as f:
+        digest.update(f.read(min(block, offset)))
+
+        f.seek(max(0, offset - block))
+        digest.update(f.read(min(block, offset)))
+
+    return digest.hexdigest()
+
+
+def write_section(stream, values):
+    """
+    Writes a list of values (strings, numbers, None or tuples of them) to a
+    binary stream, see FreqDist.dump_binary.
+    """
+    kind, data = pack_keys(values)
+    stream.write(SECTION_HEADER.pack(kind, len(values), len(data)))
+    stream.write(data)
+
+
+def read_section(stream):
+    """
+    Reads a list of values written by write_section from a binary stream.
+    """
+    kind, length, nbytes = SECTION_HEADER.unpack(read_exact(stream, SECTION_HEADER.size))
+    return unpack_keys(kind, read_exact(stream, nbytes), length)
+
+
+def read_exact(stream, nbytes):
+    """
+    Reads nbytes from a binary stream, raising a ValueError if it is short.
+    """
+    data = stream.read(nbytes)
+    if len(data) != nbytes:
+        raise ValueError("truncated extraction state")
+    return data
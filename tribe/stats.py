@@ -17,11 +17,48 @@ Objects for computing Statistics and probabilities
 ## Imports
 ##########################################################################
 
+import sys
 import json
+import math
+import zlib
+import heapq
+import struct
 
+from array import array
+from bisect import bisect_left
+from operator import itemgetter
 from itertools import islice
 from collections import Counter
-from tribe.utils import memoized
+from collections.abc import Mapping
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+##########################################################################
+## Module Constants
+##########################################################################
+
+BINARY_MAGIC   = b"TRIBEFQD"    # Identifies a binary FreqDist dump
+BINARY_VERSION = 2              # Bump when the binary format changes
+COMPRESSED     = 0x01           # Flag of dumps with zlib compressed sections
+
+# Magic, version, flags, key kind, count typecode, samples, key and count bytes
+BINARY_HEADER = struct.Struct("<8sHBccQQQ")
+
+# Kinds of key sections: packed int64s, a string table or tagged values
+INT_KEYS    = b"q"
+STR_KEYS    = b"s"
+TAGGED_KEYS = b"t"
+
+# Tags of the samples in a tagged key section (see encode_sample)
+TAG_STR, TAG_BYTES, TAG_INT, TAG_FLOAT = b"s", b"b", b"i", b"f"
+TAG_TUPLE, TAG_NONE, TAG_TRUE, TAG_FALSE = b"(", b"N", b"T", b"F"
+
+LENGTH  = struct.Struct("<Q")   # Length of a tagged sample
+FLOAT   = struct.Struct("<d")   # A tagged float sample
+INT64   = (-(1 << 63), (1 << 63) - 1)
 
 ##########################################################################
 ## Frequency Distribution
@@ -31,8 +68,19 @@ class FreqDist(Counter):
     """
     Based off of NLTK's FreqDist - this records the number of times each
     outcome of an experiment has occured. Useful for tracking metrics.
+
+    The aggregate statistics are maintained as counts change so that they
+    are always correct without a scan of the distribution: the total (N) is
+    a running sum and the magnitude (M) is raised by any larger count. Only
+    when the maximum count itself is decreased or removed is the magnitude
+    invalidated, to be found with a single scan the next time it is read.
     """
 
+    def __init__(self, iterable=None, **kwds):
+        self._total = 0             # The sum of all counts
+        self._max   = None          # The maximum count (None if unknown)
+        super(FreqDist, self).__init__(iterable, **kwds)
+
     @classmethod
     def load(klass, stream):
         """
@@ -44,40 +92,162 @@ class FreqDist(Counter):
             dist[sample] = count
         return dist
 
-    @memoized
+    @property
     def N(self):
         """
         The total number of samples that have been recorded. For unique
         samples with counts greater than zero, use B.
-
-        Note: N is memoized meaning if you change the frequency distribution
-        after accessing this property, you then need to del the property to
-        force a recomputation of the value.
         """
-        return sum(self.values())
+        return self._total
 
-    @memoized
+    @N.deleter
+    def N(self):
+        # Deleting the aggregates (once required to recompute them after the
+        # counts changed) forces a recount, e.g. after direct dict updates.
+        self._recount()
+
+    @property
     def B(self):
         """
         Return the number of sample values or bins that have counts > 0.
-
-        Note: B is memoized meaning if you change the frequency distribution
-        after accessing this property, you then need to del the property to
-        force a recomputation of the value.
         """
         return len(self)
 
-    @memoized
+    @B.deleter
+    def B(self):
+        pass
+
+    @property
     def M(self):
         """
         Returns the magnitude or the maximum count of all samples.
-
-        Note: M is memoized meaning if you change the frequency distribution
-        after accessing this property, you then need to del the property to
-        force a recomputation of the value.
         """
         if len(self) == 0: return 0
-        return max(self.values())
+        if self._max is None:
+            self._max = max(self.values())
+        return self._max
+
+    @M.deleter
+    def M(self):
+        self._max = None
+
+    def __setitem__(self, key, value):
+        old = self.get(key, 0)
+        self._total += value - old
+
+        # Raise the magnitude, or invalidate it if the maximum was lowered
+        magnitude = self._max
+        if magnitude is not None:
+            if value > magnitude:
+                self._max = value
+            elif value < old == magnitude:
+                self._max = None
+
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        # Like Counter, deleting a missing sample is not an error
+        if key in self:
+            self._discard(self[key])
+            dict.__delitem__(self, key)
+
+    def _discard(self, count):
+        """
+        Removes the count of a sample from the aggregates.
+        """
+        self._total -= count
+        if count == self._max:
+            self._max = None
+
+    def _recount(self):
+        """
+        Rebuilds the aggregates from the counts (e.g. after counts have been
+        set directly on the underlying dict).
+        """
+        self._total = sum(self.values())
+        self._max   = None
+
+    def update(self, iterable=None, **kwds):
+        """
+        Adds counts from an iterable of samples or a mapping of counts, as in
+        Counter.update, maintaining the aggregates.
+        """
+        # NOTE: Counter copies a mapping into an empty dist with dict.update
+        if isinstance(iterable, Mapping):
+            self.merge(iterable)
+            iterable = None
+        super(FreqDist, self).update(iterable, **kwds)
+
+    def merge(self, *dists):
+        """
+        Adds the counts of any number of dists (or mappings of counts) to this
+        one in a single pass and returns it, e.g. to combine the partial
+        counts of shards or worker processes. The counts of the first dist
+        are copied directly if this one is empty.
+        """
+        get, setitem = dict.get, dict.__setitem__
+        total, magnitude = self._total, self._max
+
+        for dist in dists:
+            if not self:
+                dict.update(self, dist)
+                total = dist.N if isinstance(dist, FreqDist) else sum(dist.values())
+                magnitude = None
+                continue
+
+            for key, count in dist.items():
+                old = get(self, key, 0)
+                value = old + count
+                setitem(self, key, value)
+
+                total += count
+                if magnitude is not None:
+                    if value > magnitude:
+                        magnitude = value
+                    elif value < old == magnitude:
+                        magnitude = None
+
+        self._total, self._max = total, magnitude
+        return self
+
+    def shard(self, n, key=None):
+        """
+        Partitions the samples into n dists by key(sample) modulo n, so that
+        shards counted separately (e.g. by different processes) can later be
+        merged without overlapping keys. The default key is stable_hash, as
+        the builtin hash of strings differs between interpreters.
+        """
+        key = key or stable_hash
+        shards = [FreqDist() for _ in range(n)]
+        for sample, count in self.items():
+            dict.__setitem__(shards[key(sample) % n], sample, count)
+
+        for dist in shards:
+            dist._recount()
+        return shards
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def popitem(self):
+        key, value = super(FreqDist, self).popitem()
+        self._discard(value)
+        return key, value
+
+    def setdefault(self, key, default=0):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def clear(self):
+        super(FreqDist, self).clear()
+        self._recount()
 
     def freq(self, key):
         """
@@ -97,6 +267,57 @@ class FreqDist(Counter):
         if self.M == 0: return 0
         return float(self[key]) / self.M
 
+    def freqs(self, keys=None):
+        """
+        Returns a numpy array of the frequency of each of the keys (or of
+        every sample, in order), computed with a single division rather than
+        a call to freq per key. The values are exactly those of freq.
+        """
+        counts = self._counts(keys)
+        if self.N == 0: return np.zeros(len(counts))
+        return counts / float(self.N)
+
+    def norms(self, keys=None):
+        """
+        Returns a numpy array of the norm of each of the keys (or of every
+        sample, in order), as with freqs. The values are exactly those of norm.
+        """
+        counts = self._counts(keys)
+        if self.M == 0: return np.zeros(len(counts))
+        return counts / float(self.M)
+
+    def _counts(self, keys=None):
+        """
+        Returns a float numpy array of the counts of the keys (zero for the
+        keys that are not in the distribution) or of every sample.
+        """
+        if np is None:
+            raise ImportError("numpy is required for vectorized frequencies")
+
+        if keys is None:
+            return np.fromiter(self.values(), dtype=np.float64, count=len(self))
+
+        if isinstance(keys, np.ndarray):
+            keys = keys.tolist()
+        get = self.get
+        return np.fromiter((get(key, 0) for key in keys), dtype=np.float64)
+
+    def to_arrays(self, dtype=None):
+        """
+        Returns parallel numpy arrays of the samples (of the given dtype, or
+        as inferred by numpy if None) and their int64 counts, in order.
+        """
+        if np is None:
+            raise ImportError("numpy is required to export a FreqDist to arrays")
+
+        if dtype is None:
+            keys = np.array(list(self.keys()))
+        else:
+            keys = np.fromiter(self.keys(), dtype=dtype, count=len(self))
+
+        counts = np.fromiter(self.values(), dtype=np.int64, count=len(self))
+        return keys, counts
+
     def ratio(self, a, b):
         """
         Returns the ratio of two sample counts as a float.
@@ -106,10 +327,86 @@ class FreqDist(Counter):
 
     def max(self):
         """
-        Return the sample with the greatest number of outcomes.
+        Return the sample with the greatest number of outcomes (the first
+        one counted if there is a tie, as with most_common).
         """
         if len(self) == 0: return None
-        return self.most_common(1)[0][0]
+
+        # Stop at the first sample with the (maintained) magnitude
+        magnitude = self.M
+        for sample, count in self.items():
+            if count == magnitude:
+                return sample
+
+    def top(self, k):
+        """
+        Returns the k (sample, count) pairs with the greatest counts, most
+        common first, using a bounded heap rather than sorting every sample.
+        """
+        return heapq.nlargest(k, self.items(), key=itemgetter(1))
+
+    def bottom(self, k):
+        """
+        Returns the k (sample, count) pairs with the smallest counts, least
+        common first, using a bounded heap rather than sorting every sample.
+        """
+        return heapq.nsmallest(k, self.items(), key=itemgetter(1))
+
+    def threshold(self, minimum=None, maximum=None):
+        """
+        Returns a FreqDist of the samples whose counts are at least minimum
+        and at most maximum (either bound may be None), e.g. to prune the
+        weakest links.
+        """
+        if maximum is None:
+            if minimum is None:
+                return FreqDist().merge(self)
+            samples = {key: count for key, count in self.items() if count >= minimum}
+        elif minimum is None:
+            samples = {key: count for key, count in self.items() if count <= maximum}
+        else:
+            samples = {key: count for key, count in self.items() if minimum <= count <= maximum}
+
+        return FreqDist().merge(samples)
+
+    def histogram(self):
+        """
+        Returns a FreqDist of the number of samples that have each count.
+        """
+        # NOTE: Counter counts the values in C, then they are copied at once
+        return FreqDist(Counter(self.values()))
+
+    def quantiles(self, *qs):
+        """
+        Returns the count at each quantile q (in [0, 1]) of the samples: the
+        smallest count such that at least a q fraction of the samples have
+        that count or less (q=0.5 is the median and q=1 the magnitude). The
+        quantiles are found from the histogram of counts, so only the
+        distinct counts are sorted. Returns None for each q if empty.
+        """
+        for q in qs:
+            if not 0 <= q <= 1:
+                raise ValueError("quantiles must be between 0 and 1")
+
+        if len(self) == 0:
+            return [None for q in qs]
+
+        histogram = self.histogram()
+        counts = sorted(histogram)
+        cumulative, seen = [], 0
+        for count in counts:
+            seen += histogram[count]
+            cumulative.append(seen)
+
+        # NOTE: the rank is rounded first so that e.g. 0.3 * 10 is rank 3
+        ranks = [max(1, int(math.ceil(round(q * len(self), 9)))) for q in qs]
+        return [counts[bisect_left(cumulative, rank)] for rank in ranks]
+
+    def quantile(self, q):
+        """
+        Returns the count at the quantile q of the samples (see quantiles).
+        """
+        return self.quantiles(q)[0]
 
     def plot(self, *args, **kwargs):
         """
@@ -149,14 +446,699 @@ class FreqDist(Counter):
         """
         json.dump(self, stream)
 
+    def dump_binary(self, stream, compress=False):
+        """
+        Dump the collection to a binary stream in a compact format that
+        does not depend on the version of Python: int keys are written as a
+        packed array, string keys as a table of UTF-8 strings and any other
+        keys (bytes, floats, None, bools or tuples of them) as tagged values,
+        and the counts as a packed array of integers (or of floats if any
+        count is not an int). The sections are compressed with zlib if
+        compress is True.
+        """
+        values = list(self.values())
+        try:
+            counts = array('q', values)
+        except TypeError:
+            counts = array('d', values)
+
+        if sys.byteorder == 'big':
+            counts.byteswap()
+
+        typecode = counts.typecode.encode('ascii')
+        kind, keys = pack_keys(list(self.keys()))
+        counts = counts.tobytes()
+
+        flags = 0
+        if compress:
+            keys, counts = zlib.compress(keys), zlib.compress(counts)
+            flags |= COMPRESSED
+
+        stream.write(BINARY_HEADER.pack(
+            BINARY_MAGIC, BINARY_VERSION, flags, kind, typecode,
+            len(values), len(keys), len(counts),
+        ))
+        stream.write(keys)
+        stream.write(counts)
+
+    @classmethod
+    def load_binary(klass, stream):
+        """
+        Load a FreqDist from a binary dump (see dump_binary).
+        """
+        header = stream.read(BINARY_HEADER.size)
+        if len(header) != BINARY_HEADER.size:
+            raise ValueError("truncated binary FreqDist")
+
+        magic, version, flags, kind, typecode, length, nkeys, ncounts = BINARY_HEADER.unpack(header)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            raise ValueError("not a version {} binary FreqDist".format(BINARY_VERSION))
+
+        keys, data = stream.read(nkeys), stream.read(ncounts)
+        if len(keys) != nkeys or len(data) != ncounts:
+            raise ValueError("truncated binary FreqDist")
+
+        if flags & COMPRESSED:
+            try:
+                keys, data = zlib.decompress(keys), zlib.decompress(data)
+            except zlib.error as e:
+                raise ValueError("corrupt binary FreqDist: {}".format(e))
+
+        if typecode not in (b'q', b'd') or len(data) % 8:
+            raise ValueError("corrupt binary FreqDist")
+
+        counts = array(typecode.decode('ascii'))
+        counts.frombytes(data)
+        if sys.byteorder == 'big':
+            counts.byteswap()
+
+        keys = unpack_keys(kind, keys, length)
+        if len(keys) != length or len(counts) != length:
+            raise ValueError("corrupt binary FreqDist")
+
+        dist = klass()
+        dict.update(dist, zip(keys, counts.tolist()))
+        dist._recount()
+        return dist
+
     def __repr__(self):
         return self.pprint()
 
     def pprint(self, maxlen=10):
-        items = ['{0!r}: {1!r}'.format(*item) for item in self.most_common(maxlen)]
+        items = ['{0!r}: {1!r}'.format(*item) for item in self.top(maxlen)]
         if len(self) > maxlen:
             items.append('...')
         return 'FreqDist({{{0}}})'.format(', '.join(items))
 
     def __str__(self):
         return "<FreqDist with {} samples and {} outcomes>".format(self.B, self.N)
+
+
+##########################################################################
+## Approximate Frequency Distribution
+##########################################################################
+
+class SpaceSaving(FreqDist):
+    """
+    A FreqDist that uses a fixed amount of memory by keeping counts for at
+    most capacity samples using the Space-Saving heavy hitters algorithm
+    (Metwally et al., 2005). When a new sample is counted and the dist is
+    full, the sample with the smallest count m is evicted and the new sample
+    takes over its counter, starting at m.
+
+    Counts of retained samples are therefore overestimates, by at most the
+    value in errors (and at most error_bound = N / capacity), and any sample
+    with a true count greater than error_bound is guaranteed to be retained.
+    The sum of the counts (N) is always the total of all counted outcomes.
+
+    Only increments are supported; decrementing counts voids the guarantees.
+    """
+
+    def __init__(self, capacity, iterable=None, **kwds):
+        if capacity < 1:
+            raise ValueError("capacity must be a positive number of samples")
+
+        self.capacity  = capacity
+        self.errors    = {}     # The maximum overestimate of each count
+        self.inherited = 0      # Error bounds of merged approximate dists
+        self._heap     = []     # Lower bounds of each count for eviction
+        super(SpaceSaving, self).__init__(iterable, **kwds)
+
+    @property
+    def error_bound(self):
+        """
+        The maximum amount that any count may be overestimated by.
+        """
+        return float(self.N) / self.capacity + self.inherited
+
+    def merge(self, *dists):
+        """
+        Adds the counts of the dists one sample at a time (so that samples
+        are evicted as needed), adding the error bound of any approximate
+        dists to the error bound of this one.
+        """
+        get = self.get
+        for dist in dists:
+            if isinstance(dist, SpaceSaving):
+                self.inherited += dist.error_bound
+            for key, count in dist.items():
+                self[key] = get(key, 0) + count
+        return self
+
+    def __setitem__(self, key, value):
+        if key in self:
+            super(SpaceSaving, self).__setitem__(key, value)
+            return
+
+        # Take over the counter of the smallest sample if full
+        error = 0
+        if len(self) >= self.capacity:
+            error = self._evict()
+            value += error
+
+        super(SpaceSaving, self).__setitem__(key, value)
+        self.errors[key] = error
+        heapq.heappush(self._heap, (value, key))
+
+    def __delitem__(self, key):
+        super(SpaceSaving, self).__delitem__(key)
+        self.errors.pop(key, None)
+
+    def popitem(self):
+        key, value = super(SpaceSaving, self).popitem()
+        self.errors.pop(key, None)
+        return key, value
+
+    def clear(self):
+        """
+        Removes all counts along with their errors and eviction entries, so
+        that a cleared dist (e.g. at each checkpoint) stays in fixed memory.
+        """
+        super(SpaceSaving, self).clear()
+        self.errors    = {}
+        self.inherited = 0
+        self._heap     = []
+
+    def _evict(self):
+        """
+        Removes the sample with the smallest count and returns its count.
+        The heap has one entry per sample whose value is at most the count,
+        entries that are out of date are pushed back with the current count.
+        """
+        while self._heap:
+            count, key = heapq.heappop(self._heap)
+            if key not in self:
+                continue
+
+            current = self[key]
+            if current != count:
+                heapq.heappush(self._heap, (current, key))
+                continue
+
+            del self[key]
+            return count
+
+        return 0
+
+    @classmethod
+    def load(klass, stream, capacity=None):
+        """
+        Load a SpaceSaving dist from a JSON dump, see load_binary.
+        """
+        return klass.from_counts(FreqDist.load(stream), capacity)
+
+    @classmethod
+    def load_binary(klass, stream, capacity=None):
+        """
+        Load a SpaceSaving dist from a binary dump. Dumps store the counts
+        but not the capacity or errors, so the counts are loaded as exact
+        into a dist of the given capacity (by default the number of samples).
+        """
+        return klass.from_counts(FreqDist.load_binary(stream), capacity)
+
+    @classmethod
+    def from_counts(klass, counts, capacity=None, errors=None, inherited=0):
+        """
+        Returns a SpaceSaving dist of the counts of a FreqDist, which are
+        exact unless the errors of each count (and the inherited error bound)
+        of a dist that was saved are given.
+        """
+        dist = klass(capacity or max(1, len(counts)))
+        if errors is None:
+            return dist.merge(counts)
+
+        if len(counts) > dist.capacity or set(errors) != set(counts):
+            raise ValueError("the counts and errors do not match the capacity")
+
+        dict.update(dist, counts)
+        dist._recount()
+        dist.errors    = dict(errors)
+        dist.inherited = inherited
+        dist._heap     = [(count, key) for key, count in counts.items()]
+        heapq.heapify(dist._heap)
+        return dist
+
+    def copy(self):
+        dist = self.__class__(self.capacity)
+        for key, value in self.items():
+            dict.__setitem__(dist, key, value)
+        dist._recount()
+        dist.errors    = dict(self.errors)
+        dist.inherited = self.inherited
+        dist._heap     = list(self._heap)
+        return dist
+
+    def __reduce__(self):
+        state = {
+            'errors': self.errors,
+            'inherited': self.inherited,
+        }
+        return self.__class__, (self.capacity,), state, None, iter(self.items())
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    def __str__(self):
+        return "<SpaceSaving with {} of {} samples and {} outcomes>".format(
+            self.B, self.capacity, self.N
+        )
+
+
+##########################################################################
+## Dense Frequency Distribution
+##########################################################################
+
+class DenseFreqDist(object):
+    """
+    A frequency distribution of small non-negative integer samples (e.g.
+    address ids, hours of the day or days since the epoch) that stores the
+    count of every sample in a NumPy array indexed by the sample, which grows
+    as larger samples are counted. Arrays of samples are counted at once
+    with bincount, and the aggregates and queries of FreqDist are computed
+    over the whole array. Requires numpy.
+
+    Samples with a count of zero are not in the distribution. Ties in max
+    and top are broken by the smaller sample rather than the first counted.
+    """
+
+    def __init__(self, samples=None, size=0, dtype='int64'):
+        if np is None:
+            raise ImportError("numpy is required for a DenseFreqDist")
+
+        self.counts = np.zeros(size, dtype=dtype)
+        self._total = 0         # The sum of all counts
+        self._max   = None      # The maximum count (None if unknown)
+
+        if samples is not None:
+            self.update(samples)
+
+    @property
+    def N(self):
+        """
+        The total number of samples that have been recorded.
+        """
+        return self._total
+
+    @property
+    def B(self):
+        """
+        Return the number of sample values or bins that have counts > 0.
+        """
+        return int(np.count_nonzero(self.counts))
+
+    @property
+    def M(self):
+        """
+        Returns the magnitude or the maximum count of all samples.
+        """
+        if self._max is None:
+            self._max = self.counts.max().item() if len(self.counts) else 0
+        return self._max
+
+    def update(self, samples, weights=None):
+        """
+        Counts an array (or iterable) of samples, each weights times if given,
+        or adds the counts of a mapping of samples to counts.
+        """
+        if isinstance(samples, Mapping):
+            samples, weights = list(samples.keys()), list(samples.values())
+
+        samples = self._samples(samples)
+        if len(samples) == 0: return
+        self._grow(samples.max() + 1)
+
+        counts = np.bincount(samples, weights, minlength=len(self.counts))
+        counts = counts.astype(self.counts.dtype, copy=False)
+        self.counts += counts
+
+        self._total += counts.sum().item() if weights is not None else len(samples)
+        self._max = None
+
+    def subtract(self, samples, weights=None):
+        """
+        Subtracts the counts of an array of samples (see update).
+        """
+        if isinstance(samples, Mapping):
+            samples, weights = list(samples.keys()), list(samples.values())
+
+        samples = self._samples(samples)
+        weights = -np.ones(len(samples)) if weights is None else -np.asarray(weights)
+        self.update(samples, weights)
+
+    def _samples(self, samples):
+        """
+        Returns the samples as an array of non-negative integers.
+        """
+        samples = np.asarray(
+            samples if hasattr(samples, '__len__') else list(samples)
+        )
+        if len(samples) == 0:
+            return samples.astype(np.intp)
+
+        if samples.dtype.kind not in 'iu':
+            raise TypeError("DenseFreqDist samples must be integers")
+        if samples.min() < 0:
+            raise ValueError("DenseFreqDist samples must not be negative")
+        return samples.astype(np.intp, copy=False)
+
+    def _grow(self, size):
+        """
+        Grows the counts array (at least doubling it) to hold size samples.
+        """
+        if size <= len(self.counts): return
+        counts = np.zeros(max(size, 2 * len(self.counts)), dtype=self.counts.dtype)
+        counts[:len(self.counts)] = self.counts
+        self.counts = counts
+
+    def __getitem__(self, sample):
+        if 0 <= sample < len(self.counts):
+            return self.counts[sample].item()
+        return 0
+
+    def __setitem__(self, sample, value):
+        if sample < 0:
+            raise ValueError("DenseFreqDist samples must not be negative")
+
+        self._grow(sample + 1)
+        old = self.counts[sample].item()
+        self.counts[sample] = value
+        self._total += value - old
+
+        # Raise the magnitude, or invalidate it if the maximum was lowered
+        if self._max is not None:
+            if value > self._max:
+                self._max = value
+            elif value < old == self._max:
+                self._max = None
+
+    def __delitem__(self, sample):
+        if sample in self:
+            self[sample] = 0
+
+    def __contains__(self, sample):
+        return self[sample] != 0
+
+    def __len__(self):
+        return self.B
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self):
+        return np.flatnonzero(self.counts).tolist()
+
+    def values(self):
+        return self.counts[self.counts != 0].tolist()
+
+    def items(self):
+        samples = np.flatnonzero(self.counts)
+        return list(zip(samples.tolist(), self.counts[samples].tolist()))
+
+    def freq(self, sample):
+        """
+        Returns the frequency of a sample defined as the count of the
+        sample divided by the total number of outcomes.
+        """
+        if self.N == 0: return 0
+        return float(self[sample]) / self.N
+
+    def norm(self, sample):
+        """
+        Returns the norm of a sample defined as the count of the sample
+        divided by the count of the most frequent sample.
+        """
+        if self.M == 0: return 0
+        return float(self[sample]) / self.M
+
+    def freqs(self, samples=None):
+        """
+        Returns a numpy array of the frequency of each of the samples (or of
+        every sample with a count, in order).
+        """
+        counts = self._counts(samples)
+        if self.N == 0: return np.zeros(len(counts))
+        return counts / float(self.N)
+
+    def norms(self, samples=None):
+        """
+        Returns a numpy array of the norm of each of the samples (or of every
+        sample with a count, in order).
+        """
+        counts = self._counts(samples)
+        if self.M == 0: return np.zeros(len(counts))
+        return counts / float(self.M)
+
+    def _counts(self, samples=None):
+        """
+        Returns a float numpy array of the counts of the samples (zero for
+        the samples beyond the counts) or of every sample with a count.
+        """
+        if samples is None:
+            return self.counts[self.counts != 0].astype(np.float64)
+
+        samples = self._samples(samples)
+        inside  = samples < len(self.counts)
+        counts  = np.zeros(len(samples))
+        counts[inside] = self.counts[samples[inside]]
+        return counts
+
+    def to_arrays(self, dtype='int64'):
+        """
+        Returns parallel numpy arrays of the samples with a count (of the
+        given dtype) and their counts, in order.
+        """
+        samples = np.flatnonzero(self.counts)
+        return samples.astype(dtype), self.counts[samples]
+
+    def ratio(self, a, b):
+        """
+        Returns the ratio of two sample counts as a float.
+        """
+        if b not in self: return 0
+        return float(self[a]) / float(self[b])
+
+    def max(self):
+        """
+        Return the sample with the greatest number of outcomes.
+        """
+        if self.B == 0: return None
+        return int(self.counts.argmax())
+
+    def top(self, k):
+        """
+        Returns the k (sample, count) pairs with the greatest counts, most
+        common first, selecting them with a partition rather than a sort.
+        """
+        if k <= 0: return []
+        samples = np.flatnonzero(self.counts)
+        counts  = self.counts[samples]
+
+        # Keep every sample that ties with the kth greatest count
+        if k < len(samples):
+            least = counts[np.argpartition(-counts, k - 1)[:k]].min()
+            keep  = counts >= least
+            samples, counts = samples[keep], counts[keep]
+
+        order = np.lexsort((samples, -counts))[:k]
+        return list(zip(samples[order].tolist(), counts[order].tolist()))
+
+    def most_common(self, n=None):
+        return self.top(self.B if n is None else n)
+
+    def to_freqdist(self):
+        """
+        Returns the counts as a FreqDist (in the order of the samples).
+        """
+        return FreqDist().merge(dict(self.items()))
+
+    def copy(self):
+        dist = self.__class__(dtype=self.counts.dtype)
+        dist.counts = self.counts.copy()
+        dist._total, dist._max = self._total, self._max
+        return dist
+
+    def __eq__(self, other):
+        if isinstance(other, DenseFreqDist):
+            return self.items() == other.items()
+        if isinstance(other, Mapping):
+            return dict(self.items()) == dict((k, v) for k, v in other.items() if v != 0)
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        items = ['{0!r}: {1!r}'.format(*item) for item in self.top(10)]
+        if self.B > 10:
+            items.append('...')
+        return 'DenseFreqDist({{{0}}})'.format(', '.join(items))
+
+    def __str__(self):
+        return "<DenseFreqDist with {} samples and {} outcomes>".format(self.B, self.N)
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+def stable_hash(sample):
+    """
+    Returns a CRC32 of the sample that (unlike hash) is the same in every
+    process: strings are hashed by their UTF-8 bytes, bytes as they are and
+    any other sample (e.g. ints or tuples) by its repr.
+    """
+    if isinstance(sample, bytes):
+        data = sample
+    elif isinstance(sample, str):
+        data = sample.encode('utf-8', 'surrogateescape')
+    else:
+        data = repr(sample).encode('utf-8', 'surrogateescape')
+    return zlib.crc32(data) & 0xffffffff
+
+
+def pack_keys(keys):
+    """
+    Serializes the samples of a binary dump, returning the kind of the key
+    section and its bytes: a packed array if all keys are int64s, a table of
+    offsets and UTF-8 strings if all are strings, otherwise tagged values.
+    """
+    if all(type(key) is int and INT64[0] <= key <= INT64[1] for key in keys):
+        data = array('q', keys)
+        if sys.byteorder == 'big':
+            data.byteswap()
+        return INT_KEYS, data.tobytes()
+
+    if all(type(key) is str for key in keys):
+        strings = [key.encode('utf-8', 'surrogateescape') for key in keys]
+        offsets = array('Q', [0] * (len(strings) + 1))
+        for idx, string in enumerate(strings):
+            offsets[idx+1] = offsets[idx] + len(string)
+        if sys.byteorder == 'big':
+            offsets.byteswap()
+        return STR_KEYS, offsets.tobytes() + b"".join(strings)
+
+    data = bytearray()
+    for key in keys:
+        encode_sample(key, data)
+    return TAGGED_KEYS, bytes(data)
+
+
+def unpack_keys(kind, data, length):
+    """
+    Deserializes the length samples of a key section (see pack_keys),
+    raising a ValueError if the section is corrupt.
+    """
+    if kind == INT_KEYS:
+        if len(data) != 8 * length:
+            raise ValueError("corrupt binary FreqDist keys")
+        keys = array('q')
+        keys.frombytes(data)
+        if sys.byteorder == 'big':
+            keys.byteswap()
+        return keys.tolist()
+
+    if kind == STR_KEYS:
+        size = 8 * (length + 1)
+        if len(data) < size:
+            raise ValueError("corrupt binary FreqDist keys")
+        offsets = array('Q')
+        offsets.frombytes(data[:size])
+        if sys.byteorder == 'big':
+            offsets.byteswap()
+        if offsets[-1] != len(data) - size:
+            raise ValueError("corrupt binary FreqDist keys")
+
+        strings = data[size:]
+        return [
+            strings[start:stop].decode('utf-8', 'surrogateescape')
+            for start, stop in zip(offsets, islice(offsets, 1, None))
+        ]
+
+    if kind == TAGGED_KEYS:
+        keys, pos = [], 0
+        for _ in range(length):
+            key, pos = decode_sample(data, pos)
+            keys.append(key)
+        if pos != len(data):
+            raise ValueError("corrupt binary FreqDist keys")
+        return keys
+
+    raise ValueError("unknown binary FreqDist key kind {!r}".format(kind))
+
+
+def encode_sample(sample, data):
+    """
+    Appends a tagged sample to the bytearray data: strings, bytes and ints
+    by their length and bytes, floats as doubles, tuples by their length and
+    tagged items, and None, True and False by their tag alone.
+    """
+    if sample is None:
+        data += TAG_NONE
+    elif sample is True:
+        data += TAG_TRUE
+    elif sample is False:
+        data += TAG_FALSE
+    elif isinstance(sample, str):
+        sample = sample.encode('utf-8', 'surrogateescape')
+        data += TAG_STR + LENGTH.pack(len(sample)) + sample
+    elif isinstance(sample, bytes):
+        data += TAG_BYTES + LENGTH.pack(len(sample)) + sample
+    elif isinstance(sample, int):
+        sample = sample.to_bytes(sample.bit_length() // 8 + 1, 'little', signed=True)
+        data += TAG_INT + LENGTH.pack(len(sample)) + sample
+    elif isinstance(sample, float):
+        data += TAG_FLOAT + FLOAT.pack(sample)
+    elif isinstance(sample, tuple):
+        data += TAG_TUPLE + LENGTH.pack(len(sample))
+        for item in sample:
+            encode_sample(item, data)
+    else:
+        raise TypeError("cannot dump samples of type {}".format(type(sample).__name__))
+
+
+def decode_sample(data, pos):
+    """
+    Returns the tagged sample at pos in data and the position after it.
+    """
+    tag = data[pos:pos+1]
+    pos += 1
+
+    if tag == TAG_NONE: return None, pos
+    if tag == TAG_TRUE: return True, pos
+    if tag == TAG_FALSE: return False, pos
+
+    if tag == TAG_FLOAT:
+        if pos + FLOAT.size > len(data):
+            raise ValueError("truncated binary FreqDist sample")
+        return FLOAT.unpack_from(data, pos)[0], pos + FLOAT.size
+
+    if tag not in (TAG_STR, TAG_BYTES, TAG_INT, TAG_TUPLE):
+        raise ValueError("unknown binary FreqDist sample tag {!r}".format(tag))
+
+    if pos + LENGTH.size > len(data):
+        raise ValueError("truncated binary FreqDist sample")
+    length = LENGTH.unpack_from(data, pos)[0]
+    pos += LENGTH.size
+
+    if tag == TAG_TUPLE:
+        items = []
+        for _ in range(length):
+            item, pos = decode_sample(data, pos)
+            items.append(item)
+        return tuple(items), pos
+
+    if pos + length > len(data):
+        raise ValueError("truncated binary FreqDist sample")
+    value = data[pos:pos+length]
+    pos += length
+
+    if tag == TAG_STR:
+        return value.decode('utf-8', 'surrogateescape'), pos
+    if tag == TAG_INT:
+        return int.from_bytes(value, 'little', signed=True), pos
+    return value, pos
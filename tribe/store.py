@@ -0,0 +1,495 @@
+# tribe.store
+# Columnar storage of the meta data extracted from the emails of an mbox.
+#
+# Author:   Tribe Contributors
+# Created:  Sun Oct 18 16:48:27 2026 -0400
+#
+# Copyright (C) 2026 District Data Labs
+# For license information, see LICENSE.txt
+#
+# ID: store.py [] $
+
+"""
+Columnar storage of the meta data extracted from the emails of an mbox. Rather
+than one EmailMeta with lists of EmailAddress and a datetime per email, the
+store keeps a column of integers per field (and compressed sparse row offsets
+for the lists of recipients) that refer to tables of the distinct addresses
+and subjects, and builds EmailMeta back on demand.
+
+The columns can be saved to a binary cache file next to the mbox that is
+memory mapped when loaded, so that the meta data of an unchanged mbox never
+has to be extracted again.
+"""
+
+##########################################################################
+## Imports
+##########################################################################
+
+import os
+import sys
+import mmap
+import json
+import struct
+
+from array import array
+from datetime import timedelta
+from dateutil.tz import tzoffset
+from tribe.utils import EPOCH, UTC, atomic_dump
+from tribe.emails import EmailMeta, EmailAddress, AddressTable
+
+
+##########################################################################
+## Module Constants
+##########################################################################
+
+ID_TYPE     = 'i'           # Signed 32-bit ids into the address and subject tables
+OFFSET_TYPE = 'Q'           # Unsigned 64-bit offsets into the id columns
+DATE_TYPE   = 'q'           # Signed 64-bit microseconds since the epoch
+FLAG_TYPE   = 'B'           # Unsigned 8-bit flags, e.g. of naive dates
+ZONE_TYPE   = 'i'           # Signed 32-bit UTC offsets in seconds
+
+NO_SUBJECT  = -1            # Subject id of an email without a subject
+NO_DATE     = -(1 << 63)    # Timestamp of an email without a (parsed) date
+
+CACHE_EXT     = ".meta"     # Extension of the cache file next to the mbox
+CACHE_MAGIC   = b"TRIBEMTA" # Identifies a Tribe meta data cache file on disk
+CACHE_VERSION = 3           # Bump when the on disk format changes
+ALIGNMENT     = 8           # Columns start on multiples of this many bytes
+
+# magic, version, mbox size, mbox mtime, number of messages, emails,
+# recipients, copied addresses, addresses, subjects and bytes of errors
+CACHE_HEADER  = struct.Struct("<8sHQdQQQQQQQ")
+
+
+##########################################################################
+## Email Store
+##########################################################################
+
+class EmailStore(object):
+    """
+    Stores the EmailMeta of many emails in columns of integers:
+
+        senders:     the address id of the sender of each email
+        recipients:  the address ids of the recipients of all emails, where
+                     those of email i are recipients[rcpt_offsets[i]:rcpt_offsets[i+1]]
+        copied:      the address ids of all copied addresses (with cc_offsets)
+        subjects:    the subject id of each email (or NO_SUBJECT)
+        dates:       microseconds since the epoch (UTC) of each email (or NO_DATE)
+        naive:       1 if the date of each email had no time zone, otherwise 0
+        zones:       the UTC offset in seconds of the date of each email (or 0)
+
+    The ids refer to the addresses and subject_table tables. Dates are stored
+    in UTC, naive dates are assumed to be UTC already and are flagged so that
+    they are returned naive as they were extracted, and aware dates are
+    returned in the time zone offset they were extracted with.
+    """
+
+    @classmethod
+    def build(klass, emails):
+        """
+        Builds a store from an iterable of EmailMeta, e.g. MBoxReader.extract.
+        """
+        store = klass()
+        for email in emails:
+            store.append(email)
+        return store
+
+    def __init__(self):
+        self.addresses     = AddressTable()
+        self.subject_table = AddressTable()
+
+        self.senders       = array(ID_TYPE)
+        self.recipients    = array(ID_TYPE)
+        self.rcpt_offsets  = array(OFFSET_TYPE, [0])
+        self.copied        = array(ID_TYPE)
+        self.cc_offsets    = array(OFFSET_TYPE, [0])
+        self.subjects      = array(ID_TYPE)
+        self.dates         = array(DATE_TYPE)
+        self.naive         = array(FLAG_TYPE)
+        self.zones         = array(ZONE_TYPE)
+
+    def append(self, email):
+        """
+        Adds the columns of an EmailMeta to the store.
+        """
+        add = self.addresses.add
+
+        self.senders.append(add(email.sender))
+        self.recipients.extend(add(address) for address in email.recipients)
+        self.rcpt_offsets.append(len(self.recipients))
+        self.copied.extend(add(address) for address in email.copied)
+        self.cc_offsets.append(len(self.copied))
+
+        if email.subject is None:
+            self.subjects.append(NO_SUBJECT)
+        else:
+            self.subjects.append(self.subject_table.add(email.subject))
+
+        self.dates.append(to_timestamp(email.date))
+        self.naive.append(email.date is not None and email.date.tzinfo is None)
+        self.zones.append(utc_offset(email.date))
+
+    def __len__(self):
+        return len(self.senders)
+
+    def __getitem__(self, idx):
+        """
+        Returns the EmailMeta of the email numbered idx.
+        """
+        if idx < 0:
+            idx += len(self)
+        if idx < 0 or idx >= len(self):
+            raise IndexError("email index out of range")
+
+        addresses = self.addresses
+        subject   = self.subjects[idx]
+
+        return EmailMeta(
+            addresses[self.senders[idx]],
+            [addresses[id] for id in self.recipients[self.rcpt_offsets[idx]:self.rcpt_offsets[idx+1]]],
+            [addresses[id] for id in self.copied[self.cc_offsets[idx]:self.cc_offsets[idx+1]]],
+            self.subject_table[subject] if subject != NO_SUBJECT else None,
+            from_timestamp(self.dates[idx], self.naive[idx], self.zones[idx]),
+        )
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+    @property
+    def nbytes(self):
+        """
+        The number of bytes used by the columns (not including the tables).
+        """
+        columns = (
+            self.senders, self.recipients, self.rcpt_offsets, self.copied,
+            self.cc_offsets, self.subjects, self.dates, self.naive, self.zones,
+        )
+        return sum(len(column) * column.itemsize for column in columns)
+
+    def __repr__(self):
+        return "<EmailStore of {} emails from {} addresses>".format(
+            len(self), len(self.addresses)
+        )
+
+
+##########################################################################
+## Email Cache
+##########################################################################
+
+class EmailCache(object):
+    """
+    The EmailStore of the emails extracted from an mbox, along with the
+    number of the message each email was extracted from, the errors that
+    occurred, and the size and modification time of the mbox so that the
+    cache can be invalidated if the mbox changes.
+
+    On disk, the columns are stored little endian and aligned so that they
+    are used directly from the memory mapped file when loaded (the address
+    and subject tables are decoded from the map on access). Errors are kept
+    as the string representation of the exceptions.
+    """
+
+    @classmethod
+    def sidecar(klass, path):
+        """
+        Returns the path of the cache file for the mbox at the given path.
+        """
+        return path + CACHE_EXT
+
+    @classmethod
+    def load(klass, path, filename=None):
+        """
+        Memory maps the cache file of the mbox at path and returns the cache.
+        """
+        filename = filename or klass.sidecar(path)
+
+        with open(filename, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < CACHE_HEADER.size:
+                raise ValueError("truncated meta data cache header")
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header = CACHE_HEADER.unpack_from(buffer)
+        magic, version, size, mtime, count = header[:5]
+        emails, recipients, copied, addresses, subjects, nerrors = header[5:]
+        if magic != CACHE_MAGIC or version != CACHE_VERSION:
+            raise ValueError("unknown meta data cache format")
+
+        columns = ColumnReader(buffer, CACHE_HEADER.size)
+        messages = columns.read(OFFSET_TYPE, emails)
+
+        store = EmailStore()
+        store.senders      = columns.read(ID_TYPE, emails)
+        store.rcpt_offsets = columns.read(OFFSET_TYPE, emails + 1)
+        store.recipients   = columns.read(ID_TYPE, recipients)
+        store.cc_offsets   = columns.read(OFFSET_TYPE, emails + 1)
+        store.copied       = columns.read(ID_TYPE, copied)
+        store.subjects     = columns.read(ID_TYPE, emails)
+        store.dates        = columns.read(DATE_TYPE, emails)
+        store.naive        = columns.read(FLAG_TYPE, emails)
+        store.zones        = columns.read(ZONE_TYPE, emails)
+
+        store.addresses = MappedAddresses(
+            columns.read_strings(addresses), columns.read_strings(addresses)
+        )
+        store.subject_table = columns.read_strings(subjects)
+
+        errors = json.loads(columns.read_bytes(nerrors).tobytes().decode('utf-8'))
+        return klass(path, store, messages, count, errors, size, mtime)
+
+    @classmethod
+    def open(klass, path):
+        """
+        Returns the cache for the mbox at path if it exists and is still
+        valid, otherwise None.
+        """
+        try:
+            cache = klass.load(path)
+        except (IOError, OSError, ValueError):
+            return None
+
+        if cache.is_valid():
+            return cache
+        return None
+
+    def __init__(self, path, store, messages, count, errors=None, size=0, mtime=0.0):
+        self.path     = path
+        self.store    = store
+        self.messages = messages    # The message number of each email
+        self.count    = count       # The number of messages in the mbox
+        self.errors   = errors or {}
+        self.size     = size
+        self.mtime    = mtime
+
+    def is_valid(self):
+        """
+        Checks the size and modification time of the mbox against the values
+        recorded when the meta data was extracted.
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        return stat.st_size == self.size and stat.st_mtime == self.mtime
+
+    def dump(self, stream):
+        """
+        Dump the cache to a binary stream.
+        """
+        store  = self.store
+        errors = {}
+        for error, count in self.errors.items():
+            errors[str(error)] = errors.get(str(error), 0) + count
+        errors = json.dumps(errors).encode('utf-8')
+
+        stream.write(CACHE_HEADER.pack(
+            CACHE_MAGIC, CACHE_VERSION, self.size, self.mtime, self.count,
+            len(store), len(store.recipients), len(store.copied),
+            len(store.addresses), len(store.subject_table), len(errors),
+        ))
+
+        columns = ColumnWriter(stream, CACHE_HEADER.size)
+        columns.write(self.messages, OFFSET_TYPE)
+        columns.write(store.senders, ID_TYPE)
+        columns.write(store.rcpt_offsets, OFFSET_TYPE)
+        columns.write(store.recipients, ID_TYPE)
+        columns.write(store.cc_offsets, OFFSET_TYPE)
+        columns.write(store.copied, ID_TYPE)
+        columns.write(store.subjects, ID_TYPE)
+        columns.write(store.dates, DATE_TYPE)
+        columns.write(store.naive, FLAG_TYPE)
+        columns.write(store.zones, ZONE_TYPE)
+        columns.write_strings(address.name for address in store.addresses)
+        columns.write_strings(address.email for address in store.addresses)
+        columns.write_strings(store.subject_table)
+        columns.write_bytes(errors)
+
+    def save(self):
+        """
+        Writes the cache to its sidecar file next to the mbox atomically (see
+        atomic_dump). Failure to write (e.g. a read-only directory) is not an
+        error.
+        """
+        try:
+            atomic_dump(self.sidecar(self.path), self.dump)
+            return True
+        except (IOError, OSError):
+            return False
+
+    def __iter__(self):
+        """
+        Yields the (message number, EmailMeta) of every cached email.
+        """
+        for idx, email in enumerate(self.store):
+            yield self.messages[idx], email
+
+    def __len__(self):
+        return len(self.store)
+
+    def __repr__(self):
+        return "<EmailCache of {} emails from {} messages in {}>".format(
+            len(self), self.count, self.path
+        )
+
+
+class StringTable(object):
+    """
+    A read only table of strings that are decoded on access from the bytes
+    between consecutive offsets of a (memory mapped) buffer.
+    """
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data    = data
+
+    def __getitem__(self, idx):
+        if idx < 0 or idx >= len(self):
+            raise IndexError("string table index out of range")
+        return decode(self.data[self.offsets[idx]:self.offsets[idx+1]])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+
+class MappedAddresses(object):
+    """
+    A read only address table of the names and emails in two StringTables.
+    """
+
+    def __init__(self, names, emails):
+        self.names  = names
+        self.emails = emails
+
+    def __getitem__(self, idx):
+        return EmailAddress((self.names[idx], self.emails[idx]))
+
+    def __len__(self):
+        return len(self.emails)
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+
+class ColumnWriter(object):
+    """
+    Writes aligned little endian columns to a binary stream at position pos.
+    """
+
+    def __init__(self, stream, pos=0):
+        self.stream = stream
+        self.pos    = pos + (-pos % ALIGNMENT)
+        self.stream.write(b"\0" * (self.pos - pos))
+
+    def write_bytes(self, data):
+        pad = -(self.pos + len(data)) % ALIGNMENT
+        self.stream.write(data)
+        self.stream.write(b"\0" * pad)
+        self.pos += len(data) + pad
+
+    def write(self, column, typecode):
+        column = array(typecode, column)
+        if sys.byteorder != 'little':
+            column.byteswap()
+        self.write_bytes(column.tobytes())
+
+    def write_strings(self, strings):
+        offsets = array(OFFSET_TYPE, [0])
+        data = bytearray()
+        for string in strings:
+            data.extend(encode(string))
+            offsets.append(len(data))
+
+        self.write(offsets, OFFSET_TYPE)
+        self.write_bytes(bytes(data))
+
+
+class ColumnReader(object):
+    """
+    Reads the columns written by a ColumnWriter from a buffer at position
+    pos, without copying them if the byte order of the platform is little.
+    """
+
+    def __init__(self, buffer, pos=0):
+        self.view = memoryview(buffer)
+        self.pos  = pos + (-pos % ALIGNMENT)
+
+    def read_bytes(self, nbytes):
+        if self.pos + nbytes > len(self.view):
+            raise ValueError("truncated meta data cache")
+        data = self.view[self.pos:self.pos+nbytes]
+        self.pos += nbytes + (-(self.pos + nbytes) % ALIGNMENT)
+        return data
+
+    def read(self, typecode, count):
+        data = self.read_bytes(count * array(typecode).itemsize)
+        if sys.byteorder == 'little':
+            return data.cast(typecode)
+
+        column = array(typecode)
+        column.frombytes(data.tobytes())
+        column.byteswap()
+        return column
+
+    def read_strings(self, count):
+        offsets = self.read(OFFSET_TYPE, count + 1)
+        return StringTable(offsets, self.read_bytes(offsets[-1]))
+
+
+##########################################################################
+## Helper Functions
+##########################################################################
+
+def encode(string):
+    """
+    Encodes a string for the cache, including any undecodable header bytes.
+    """
+    return string.encode('utf-8', 'surrogateescape')
+
+
+def decode(data):
+    """
+    Decodes a string encoded for the cache.
+    """
+    return data.tobytes().decode('utf-8', 'surrogateescape')
+
+
+def to_timestamp(dt):
+    """
+    Converts a datetime to microseconds since the epoch (UTC), or NO_DATE.
+    """
+    if dt is None: return NO_DATE
+
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+
+    delta = dt - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def from_timestamp(ts, naive=False, zone=0):
+    """
+    Converts microseconds since the epoch to a UTC datetime (or None), which
+    is naive (without a time zone) if naive is True, or in the time zone of
+    the zone offset (in seconds) from UTC if it is not zero.
+    """
+    if ts == NO_DATE: return None
+    dt = EPOCH + timedelta(microseconds=ts)
+    if naive:
+        return dt.replace(tzinfo=None)
+    if zone:
+        return dt.astimezone(tzoffset(None, zone))
+    return dt
+
+
+def utc_offset(dt):
+    """
+    Returns the UTC offset of an aware datetime in whole seconds (or 0).
+    """
+    if dt is None or dt.tzinfo is None: return 0
+    offset = dt.utcoffset()
+    return offset.days * 86400 + offset.seconds
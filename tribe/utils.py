@@ -18,14 +18,15 @@ Utility functions and decorators for Tribe
 ##########################################################################
 
 import os
+import re
 import time
 
 from functools import wraps
+from collections import Counter, OrderedDict
 from dateutil import parser
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from dateutil.tz import tzlocal, tzutc
 from dateutil.relativedelta import relativedelta
-from email.utils import unquote as email_unquote
 from email.utils import parsedate_tz, mktime_tz
 
 
@@ -44,28 +45,144 @@ ISO8601_DATE     = "%Y-%m-%d"
 ISO8601_TIME     = "%H:%M:%S"
 COMMON_DATETIME  = "%d/%b/%Y:%H:%M:%S %z"
 
+# The common shape of RFC 2822 dates with a numeric timezone (and optional
+# day name and zone comment). The -0000 zone is excluded since it means the
+# local time to email.utils, as are two digit years and named zones.
+RFC2822_DATETIME = re.compile(
+    r"^\s*(?:[A-Za-z]+,\s+)?(\d{1,2})\s+([A-Za-z]{3})\s+([1-9]\d{3})\s+"
+    r"(\d{1,2}):(\d{2})(?::(\d{2}))?\s+(?!-0000)([+-])(\d{2})(\d{2})"
+    r"(?:\s+\([^)]*\))?\s*$"
+)
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+
+UTC   = tzutc()
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+DATE_CACHE_SIZE = 4096  # Distinct date strings to keep parsed results for
+
+# Escape sequences that email.utils.unquote replaces in quoted strings
+ESCAPED_SLASH = '\\\\'
+ESCAPED_QUOTE = '\\"'
+
 
 ##########################################################################
-## Date Parser Utility
+## Caching
 ##########################################################################
 
-def parse_date(dtstr):
+class LRUCache(object):
     """
-    Attempts to parse a date with given formats first, then default formats
+    A mapping that holds at most maxsize items, discarding the least
+    recently used item when it is full. Lookups raise KeyError when missing.
     """
-    # Handle empty string or None
-    if not dtstr: return None
 
-    try:
-        # Attempt to use the email utils parser first
-        dt = parsedate_tz(dtstr)
-        if dt is not None:
-            return datetime.utcfromtimestamp(mktime_tz(dt)).replace(tzinfo=tzutc())
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+
+    def __getitem__(self, key):
+        value = self.data.pop(key)
+        self.data[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self.data.pop(key, None)
+        self.data[key] = value
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def __len__(self):
+        return len(self.data)
+
+    def clear(self):
+        self.data.clear()
+
+
+##########################################################################
+## Date Parser Utility
+##########################################################################
+
+class DateParser(object):
+    """
+    Parses dates from email headers, first with a compiled regular expression
+    for the common RFC 2822 shape, then with the email utils parser, and
+    finally with the (slow) dateutil parser. The results for the most recent
+    distinct strings are cached since bulk mail repeats identical headers.
+
+    The counts track how many dates were parsed by each path (fast, email,
+    dateutil or failed) and how many were found in the cache (cached).
+    """
 
-        # Otherwise use the dateutil parser
-        return parser.parse(dtstr)
-    except Exception:
-        return None
+    def __init__(self, maxsize=DATE_CACHE_SIZE):
+        self.cache  = LRUCache(maxsize)
+        self.counts = Counter()
+
+    def __call__(self, dtstr):
+        """
+        Attempts to parse a date with given formats first, then default formats
+        """
+        # Handle empty string or None
+        if not dtstr: return None
+
+        try:
+            dt = self.cache[dtstr]
+            self.counts['cached'] += 1
+            return dt
+        except KeyError:
+            dt = self.parse(dtstr)
+            self.cache[dtstr] = dt
+            return dt
+
+    def parse(self, dtstr):
+        """
+        Parses the date string without the cache.
+        """
+        try:
+            # Attempt the fast path for the common RFC 2822 shape
+            match = RFC2822_DATETIME.match(dtstr)
+            if match is not None:
+                month = MONTHS.get(match.group(2).lower())
+                if month is not None:
+                    self.counts['fast'] += 1
+                    return self.fast_parse(match, month)
+
+            # Attempt to use the email utils parser next
+            dt = parsedate_tz(dtstr)
+            if dt is not None:
+                self.counts['email'] += 1
+                return datetime.utcfromtimestamp(mktime_tz(dt)).replace(tzinfo=tzutc())
+
+            # Otherwise use the dateutil parser
+            self.counts['dateutil'] += 1
+            return parser.parse(dtstr)
+        except Exception:
+            self.counts['failed'] += 1
+            return None
+
+    def fast_parse(self, match, month):
+        """
+        Computes the UTC datetime of a matched RFC 2822 date exactly as the
+        email utils parsedate_tz and mktime_tz functions would.
+        """
+        day, _, year, hour, minute, second, sign, tzh, tzm = match.groups()
+        offset = int(tzh) * 3600 + int(tzm) * 60
+        if sign == '-':
+            offset = -offset
+
+        # Out of range fields (e.g. Feb 30) carry over as they do in timegm
+        days = date(int(year), month, 1).toordinal() - EPOCH.toordinal() + int(day) - 1
+        seconds = int(hour) * 3600 + int(minute) * 60 + int(second or 0) - offset
+        return EPOCH + timedelta(days, seconds)
+
+
+## Parse dates with a shared cache of recently parsed dates
+parse_date = DateParser()
 
 
 def strfnow(fmt=HUMAN_DATETIME):
@@ -100,12 +217,28 @@ def unquote(s):
     and begins with double quotes, they are stripped off. Likewise if str
     ends and begins with angle brackets, they are stripped off.
 
-    This method continues to unquote until the string is unchanged.
+    This method continues to unquote until the string is unchanged, exactly
+    as repeatedly calling email.utils.unquote would, but in a single scan of
+    the layers from both ends. A new string is only allocated for a quoted
+    layer that contains escapes (which email.utils.unquote replaces).
     """
-    new = email_unquote(s)
-    if new != s:
-        return unquote(new)
-    return new
+    i, j = 0, len(s)
+    escaped = ESCAPED_SLASH in s or ESCAPED_QUOTE in s
+
+    while j - i > 1:
+        first, last = s[i], s[j-1]
+        if first == '"' and last == '"':
+            i, j = i + 1, j - 1
+            if escaped:
+                s = s[i:j].replace(ESCAPED_SLASH, '\\').replace(ESCAPED_QUOTE, '"')
+                i, j = 0, len(s)
+                escaped = ESCAPED_SLASH in s or ESCAPED_QUOTE in s
+        elif first == '<' and last == '>':
+            i, j = i + 1, j - 1
+        else:
+            break
+
+    return s[i:j]
 
 
 def timeit(func):
@@ -133,6 +266,24 @@ def filesize(path, suffix='B'):
 
     return "%.1f%s%s" % (num, 'Yi', suffix)
 
+
+def atomic_dump(path, dump):
+    """
+    Writes the file at path by calling dump with a binary stream of a
+    temporary file next to it, which then atomically replaces the file. A
+    reader (or a process killed mid-write) sees the old or the new file but
+    never a partial or missing one. Errors are raised to the caller.
+    """
+    tmpfile = path + ".tmp"
+    try:
+        with open(tmpfile, 'wb') as f:
+            dump(f)
+        os.replace(tmpfile, path)
+    except BaseException:
+        if os.path.exists(tmpfile):
+            os.remove(tmpfile)
+        raise
+
 ##########################################################################
 ## Memoization
 ##########################################################################